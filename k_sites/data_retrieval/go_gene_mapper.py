@@ -18,6 +18,8 @@ from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
 import hashlib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -27,6 +29,14 @@ CACHE_DIR = Path.home() / ".k_sites_cache"
 CACHE_DIR.mkdir(exist_ok=True)
 GO_GENE_CACHE_FILE = CACHE_DIR / "go_gene_cache.json"
 
+# QuickGO annotation paging: 200 results per page, at most 50 pages per gene product
+QUICKGO_PAGE_SIZE = 200
+QUICKGO_MAX_PAGES_PER_PRODUCT = 50
+
+# Detailed pleiotropy scoring constants
+BP_DECAY_LAMBDA = 0.3         # Exponential decay rate for BP term count
+PATHWAY_SCORE_SCALE = 0.1     # Weight of each pathway neighbor in the total score
+
 # In-memory cache for GO gene lookups
 _go_gene_cache: Dict[str, any] = {}
 _cache_loaded = False
@@ -75,6 +85,28 @@ def _save_cache():
         logger.warning(f"Could not save cache: {e}")
 
 
+def _build_session() -> requests.Session:
+    """Create a keep-alive session for UniProt/QuickGO lookups, retrying throttled requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.34,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared across calls so batched lookups reuse keep-alive connections
+_session = _build_session()
+
+
 class GoTermNotFoundError(Exception):
     """Raised when a GO term is not found."""
     pass
@@ -102,7 +134,7 @@ def _fetch_quickgo_page(go_term: str, taxid: str, page: int, page_size: int, hea
     }
     
     try:
-        response = requests.get(base_url, params=params, headers=headers, timeout=30)
+        response = _session.get(base_url, params=params, headers=headers, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -378,16 +410,13 @@ def get_pleiotropy_score_detailed(gene_symbol: str, taxid: str, go_term: str = N
     try:
         # Get all GO terms for this gene
         all_go_terms = _get_all_go_terms_for_gene(gene_symbol, taxid)
-        
-        # Count Biological Process terms specifically
-        bp_terms = [term for term in all_go_terms if term.get("category") == "P"]  # P = Biological Process
-        molecular_function_terms = [term for term in all_go_terms if term.get("category") == "F"]  # F = Molecular Function
-        cellular_component_terms = [term for term in all_go_terms if term.get("category") == "C"]  # C = Cellular Component
+        summary = summarize_go_terms(all_go_terms)
+        bp_terms = summary["biological_process_terms"]
         
         # Calculate exponential decay scoring for BP terms
-        # Formula: 1 - exp(-lambda * n) where lambda adjusts the decay rate and n is the number of BP terms
-        lambda_val = 0.3  # Decay rate - adjust as needed
-        bp_score = 1 - math.exp(-lambda_val * (len(bp_terms) - 1)) if len(bp_terms) > 0 else 0
+        # Formula: 1 - exp(-lambda * (n - 1)) where n is the number of BP terms (0 when n == 0).
+        # -expm1(-x) == 1 - exp(-x) without cancellation for small x
+        bp_score = -math.expm1(-BP_DECAY_LAMBDA * (len(bp_terms) - 1)) if bp_terms else 0.0
         
         # Get pathway degree from Neo4j if available
         try:
@@ -401,28 +430,17 @@ def get_pleiotropy_score_detailed(gene_symbol: str, taxid: str, go_term: str = N
             logger.warning(f"Could not get pathway neighbors: {e}")
             pathway_score = 0
         
-        # Calculate evidence-based score
-        experimental_evidence_count = sum(1 for term in all_go_terms if term.get("evidence_type") == "experimental")
-        computational_evidence_count = sum(1 for term in all_go_terms if term.get("evidence_type") == "computational")
-        iea_evidence_count = sum(1 for term in all_go_terms if term.get("evidence_type") == "IEA")
-        
         # Combine scores
-        total_score = bp_score + (pathway_score * 0.1)  # Scale pathway score appropriately
+        total_score = bp_score + (pathway_score * PATHWAY_SCORE_SCALE)
         
         result = {
             "gene_symbol": gene_symbol,
             "taxid": taxid,
             "total_pleiotropy_score": total_score,
-            "bp_term_count": len(bp_terms),
             "bp_score": bp_score,
             "pathway_score": pathway_score,
-            "experimental_evidence_count": experimental_evidence_count,
-            "computational_evidence_count": computational_evidence_count,
-            "iea_evidence_count": iea_evidence_count,
             "all_go_terms": all_go_terms,
-            "biological_process_terms": bp_terms,
-            "molecular_function_terms": molecular_function_terms,
-            "cellular_component_terms": cellular_component_terms
+            **summary
         }
         
         logger.info(f"Pleiotropy score for {gene_symbol}: {total_score}")
@@ -433,6 +451,29 @@ def get_pleiotropy_score_detailed(gene_symbol: str, taxid: str, go_term: str = N
         raise
 
 
+def summarize_go_terms(all_go_terms: List[Dict]) -> Dict:
+    """
+    Split GO terms by category and count evidence types.
+    
+    Args:
+        all_go_terms: GO terms as returned by _get_all_go_terms_for_gene
+        
+    Returns:
+        Dictionary with BP/MF/CC term lists, BP term count and evidence counts
+    """
+    bp_terms = [term for term in all_go_terms if term.get("category") == "P"]  # P = Biological Process
+    
+    return {
+        "bp_term_count": len(bp_terms),
+        "experimental_evidence_count": sum(1 for term in all_go_terms if term.get("evidence_type") == "experimental"),
+        "computational_evidence_count": sum(1 for term in all_go_terms if term.get("evidence_type") == "computational"),
+        "iea_evidence_count": sum(1 for term in all_go_terms if term.get("evidence_type") == "IEA"),
+        "biological_process_terms": bp_terms,
+        "molecular_function_terms": [term for term in all_go_terms if term.get("category") == "F"],  # F = Molecular Function
+        "cellular_component_terms": [term for term in all_go_terms if term.get("category") == "C"]  # C = Cellular Component
+    }
+
+
 def _get_all_go_terms_for_gene(gene_symbol: str, taxid: str) -> List[Dict]:
     """
     Get all GO terms associated with a gene.
@@ -445,176 +486,303 @@ def _get_all_go_terms_for_gene(gene_symbol: str, taxid: str) -> List[Dict]:
         List of GO terms with details including proper 'category' field
     """
     try:
-        # Use QuickGO to get all annotations for this gene
-        base_url = "https://www.ebi.ac.uk/QuickGO/services/annotation/search"
+        # Copy the records so callers cannot mutate the memoized ones
+        return [dict(term) for term in _fetch_go_terms_for_gene(gene_symbol, taxid)]
+    except Exception as e:
+        logger.error(f"Error getting GO terms for {gene_symbol}: {str(e)}")
+        return []
+
+
+@lru_cache(maxsize=4096)
+def _fetch_go_terms_for_gene(gene_symbol: str, taxid: str) -> Tuple[Dict, ...]:
+    """
+    Fetch all GO terms for a gene, memoized per (gene_symbol, taxid).
+    
+    UniProt and QuickGO failures raise GeneRetrievalError, which lru_cache
+    does not memoize; only genuine "no accession"/"no annotations" answers
+    are cached as empty.
+    """
+    # First, we need to get the gene's UniProt ID
+    gene_id = _resolve_gene_to_uniprot(gene_symbol, taxid)
+    if not gene_id:
+        logger.warning(f"Could not resolve {gene_symbol} to UniProt ID")
+        return ()
+    
+    all_results = _fetch_quickgo_annotations([gene_id])
+    if not all_results:
+        return ()
+    
+    go_terms = _build_go_terms(all_results)
+    
+    logger.info(f"Found {len(go_terms)} GO terms for {gene_symbol}")
+    return tuple(go_terms)
+
+
+def get_go_terms_for_gene_across_species(gene_symbol: str, taxids: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Get all GO terms for a gene in several species with batched requests.
+    
+    Issues one UniProt search covering every taxid and one (paginated) QuickGO
+    annotation search over all resolved accessions, instead of a UniProt +
+    QuickGO round trip per species.
+    
+    Args:
+        gene_symbol: Gene symbol
+        taxids: List of NCBI Taxonomy IDs
+        
+    Returns:
+        Dictionary mapping taxid to its GO terms. Taxids whose gene could not
+        be resolved to a UniProt accession, or whose annotations could not be
+        fetched, are omitted.
+    """
+    accessions = _batch_resolve_gene_to_uniprot(gene_symbol, taxids)
+    if not accessions:
+        return {}
+    
+    try:
+        all_results = _fetch_quickgo_annotations(list(accessions.values()))
+    except GeneRetrievalError as e:
+        # One bad accession fails the combined query; fall back to one query per species
+        logger.warning(f"Batched QuickGO query failed for {gene_symbol}, querying species individually: {e}")
+        all_results = []
+        for taxid, accession in list(accessions.items()):
+            try:
+                all_results.extend(_fetch_quickgo_annotations([accession]))
+            except GeneRetrievalError as species_error:
+                logger.warning(f"QuickGO lookup failed for {gene_symbol} in taxid {taxid}: {species_error}")
+                del accessions[taxid]
+    
+    # Group annotations by accession ("UniProtKB:P38398-2" -> "P38398")
+    results_by_accession = defaultdict(list)
+    for result in all_results:
+        accession = result.get("geneProductId", "").split(":", 1)[-1].split("-", 1)[0]
+        results_by_accession[accession].append(result)
+    
+    go_terms_by_taxid = {
+        taxid: _build_go_terms(results_by_accession.get(accession, []))
+        for taxid, accession in accessions.items()
+    }
+    
+    logger.info(f"Fetched GO terms for {gene_symbol} in {len(go_terms_by_taxid)}/{len(taxids)} species (batched)")
+    return go_terms_by_taxid
+
+
+def _fetch_quickgo_annotations(gene_product_ids: List[str]) -> List[Dict]:
+    """
+    Fetch all QuickGO annotations for one or more gene products.
+    
+    QuickGO accepts a comma-separated geneProductId list, so several
+    accessions are served by the same paginated query. The page limit
+    scales with the number of accessions.
+    
+    Args:
+        gene_product_ids: UniProt accessions
         
-        # First, we need to get the gene's UniProt ID
-        gene_id = _resolve_gene_to_uniprot(gene_symbol, taxid)
-        if not gene_id:
-            logger.warning(f"Could not resolve {gene_symbol} to UniProt ID")
-            return []
+    Returns:
+        Raw QuickGO annotation results
         
-        headers = {
-            "Accept": "application/json"
+    Raises:
+        GeneRetrievalError: If QuickGO rejects the query or the request fails
+    """
+    base_url = "https://www.ebi.ac.uk/QuickGO/services/annotation/search"
+    
+    headers = {
+        "Accept": "application/json"
+    }
+    
+    max_pages = QUICKGO_MAX_PAGES_PER_PRODUCT * len(gene_product_ids)
+    all_results = []
+    page = 1
+    
+    while True:
+        params = {
+            "geneProductId": ",".join(gene_product_ids),
+            "limit": QUICKGO_PAGE_SIZE,
+            "page": page
         }
         
-        # Paginate through results (QuickGO limits to 200 per page)
-        PAGE_SIZE = 200
-        all_results = []
-        page = 1
-        
-        while True:
-            params = {
-                "geneProductId": gene_id,
-                "limit": PAGE_SIZE,
-                "page": page
-            }
-            
-            time.sleep(0.34)  # Rate limiting
-            response = requests.get(base_url, params=params, headers=headers, timeout=30)
-            
-            if response.status_code == 400:
-                logger.warning(f"QuickGO returned 400 for {gene_symbol}")
-                return []
-            
+        # Throttled responses are retried by the session adapter
+        try:
+            response = _session.get(base_url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
-            
-            data = response.json()
-            results = data.get("results", [])
-            
-            if not results:
-                break
-                
-            all_results.extend(results)
-            
-            # Check if we've got all results
-            total_hits = data.get("numberOfHits", 0)
-            if len(all_results) >= total_hits or len(results) < PAGE_SIZE:
-                break
-                
-            page += 1
-            if page > 50:  # Safety limit
-                break
-        
-        if not all_results:
-            return []
+        except requests.RequestException as e:
+            raise GeneRetrievalError(f"QuickGO request failed for {','.join(gene_product_ids)}: {e}") from e
         
-        go_terms = []
-        seen_go_ids = set()  # Deduplicate
+        data = response.json()
+        results = data.get("results", [])
         
-        for result in all_results:
-            go_id = result.get("goId", "")
-            
-            # Skip duplicates
-            if go_id in seen_go_ids:
-                continue
-            seen_go_ids.add(go_id)
-            
-            evidence_codes = result.get("evidenceCode", [])
-            aspect = result.get("goAspect", "")
-            qualifiers = result.get("qualifier", [])
-            go_name = result.get("goName", "")
-            
-            # Normalize aspect to single letter (P, F, C)
-            # QuickGO returns full names like "biological_process"
-            category = "U"  # Unknown
-            if aspect in ["biological_process", "P"]:
-                category = "P"
-            elif aspect in ["molecular_function", "F"]:
-                category = "F"
-            elif aspect in ["cellular_component", "C"]:
-                category = "C"
+        if not results:
+            break
             
-            # Determine evidence type - EXPLICIT classification
-            # IDA, IMP, IGI = EXPERIMENTAL (as per requirements)
-            # IEA = computational PREDICTION (NOT experimental)
-            evidence_type = "other"
-            if any(code in {"IDA", "IPI", "IMP", "IGI", "IEP", "HTP", "HDA", "HMP", "HGI", "HEP"} for code in evidence_codes):
-                evidence_type = "experimental"
-            elif any(code in {"ISS", "ISO", "ISA", "ISM", "IGC", "IBA", "IBD", "IKR", "IRD", "RCA"} for code in evidence_codes):
-                evidence_type = "computational"
-            elif any(code == "IEA" for code in evidence_codes):
-                evidence_type = "IEA"  # Computational prediction - DISTINCT from experimental
+        all_results.extend(results)
+        
+        # Check if we've got all results
+        total_hits = data.get("numberOfHits", 0)
+        if len(all_results) >= total_hits or len(results) < QUICKGO_PAGE_SIZE:
+            break
             
-            go_terms.append({
-                "go_id": go_id,
-                "go_name": go_name,
-                "aspect": aspect,
-                "category": category,  # CRITICAL: P, F, or C for filtering
-                "evidence_codes": evidence_codes,
-                "evidence_type": evidence_type,
-                "qualifiers": qualifiers
-            })
-        
-        logger.info(f"Found {len(go_terms)} GO terms for {gene_symbol}")
-        return go_terms
+        page += 1
+        if page > max_pages:  # Safety limit
+            logger.warning(f"QuickGO page limit reached for {','.join(gene_product_ids)}")
+            break
+    
+    return all_results
+
+
+def _build_go_terms(all_results: List[Dict]) -> List[Dict]:
+    """
+    Convert raw QuickGO annotations into deduplicated GO term records.
+    
+    Args:
+        all_results: Raw QuickGO annotation results
         
-    except Exception as e:
-        logger.error(f"Error getting GO terms for {gene_symbol}: {str(e)}")
-        return []
+    Returns:
+        List of GO terms with details including proper 'category' field
+    """
+    go_terms = []
+    seen_go_ids = set()  # Deduplicate
+    
+    for result in all_results:
+        go_id = result.get("goId", "")
+        
+        # Skip duplicates
+        if go_id in seen_go_ids:
+            continue
+        seen_go_ids.add(go_id)
+        
+        evidence_codes = result.get("evidenceCode", [])
+        aspect = result.get("goAspect", "")
+        qualifiers = result.get("qualifier", [])
+        go_name = result.get("goName", "")
+        
+        # Normalize aspect to single letter (P, F, C)
+        # QuickGO returns full names like "biological_process"
+        category = "U"  # Unknown
+        if aspect in ["biological_process", "P"]:
+            category = "P"
+        elif aspect in ["molecular_function", "F"]:
+            category = "F"
+        elif aspect in ["cellular_component", "C"]:
+            category = "C"
+        
+        # Determine evidence type - EXPLICIT classification
+        # IDA, IMP, IGI = EXPERIMENTAL (as per requirements)
+        # IEA = computational PREDICTION (NOT experimental)
+        evidence_type = "other"
+        if any(code in {"IDA", "IPI", "IMP", "IGI", "IEP", "HTP", "HDA", "HMP", "HGI", "HEP"} for code in evidence_codes):
+            evidence_type = "experimental"
+        elif any(code in {"ISS", "ISO", "ISA", "ISM", "IGC", "IBA", "IBD", "IKR", "IRD", "RCA"} for code in evidence_codes):
+            evidence_type = "computational"
+        elif any(code == "IEA" for code in evidence_codes):
+            evidence_type = "IEA"  # Computational prediction - DISTINCT from experimental
+        
+        go_terms.append({
+            "go_id": go_id,
+            "go_name": go_name,
+            "aspect": aspect,
+            "category": category,  # CRITICAL: P, F, or C for filtering
+            "evidence_codes": evidence_codes,
+            "evidence_type": evidence_type,
+            "qualifiers": qualifiers
+        })
+    
+    return go_terms
 
 
-def _resolve_gene_to_uniprot(gene_symbol: str, taxid: str) -> Optional[str]:
+def _batch_resolve_gene_to_uniprot(gene_symbol: str, taxids: List[str]) -> Dict[str, str]:
     """
-    Resolve a gene symbol to UniProt ID using the NEW UniProt REST API.
+    Resolve a gene symbol to UniProt IDs in several organisms with one query.
     
     Args:
         gene_symbol: Gene symbol
-        taxid: NCBI Taxonomy ID
+        taxids: List of NCBI Taxonomy IDs
         
     Returns:
-        UniProt ID or None if not found
+        Dictionary mapping taxid to UniProt ID (reviewed entries only)
     """
     try:
-        # Use the NEW UniProt REST API (not the deprecated one)
         base_url = "https://rest.uniprot.org/uniprotkb/search"
         
-        # Build query using organism_id (taxid) and gene name
-        query = f"gene:{gene_symbol} AND organism_id:{taxid} AND reviewed:true"
+        organisms = " OR ".join(f"organism_id:{taxid}" for taxid in taxids)
+        query = f"gene:{gene_symbol} AND ({organisms}) AND reviewed:true"
         
         params = {
             "query": query,
             "format": "json",
-            "fields": "accession",
-            "size": 1
+            "fields": "accession,organism_id",
+            "size": 100
         }
         
         headers = {
             "Accept": "application/json"
         }
         
-        time.sleep(0.34)  # Rate limiting
-        response = requests.get(base_url, params=params, headers=headers, timeout=15)
+        response = _session.get(base_url, params=params, headers=headers, timeout=15)
+        response.raise_for_status()
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            if results:
-                uniprot_id = results[0].get("primaryAccession")
-                logger.debug(f"Resolved {gene_symbol} to UniProt ID: {uniprot_id}")
-                return uniprot_id
+        accessions = {}
+        wanted = set(taxids)
+        for entry in response.json().get("results", []):
+            taxid = str(entry.get("organism", {}).get("taxonId", ""))
+            # Keep the best-ranked entry per organism, as _resolve_gene_to_uniprot does
+            if taxid in wanted and taxid not in accessions:
+                accessions[taxid] = entry.get("primaryAccession")
         
-        # Fallback: try without reviewed filter
-        query = f"gene:{gene_symbol} AND organism_id:{taxid}"
-        params["query"] = query
+        return accessions
         
-        time.sleep(0.34)
-        response = requests.get(base_url, params=params, headers=headers, timeout=15)
+    except Exception as e:
+        logger.warning(f"Could not batch-resolve {gene_symbol} to UniProt IDs: {e}")
+        return {}
+
+
+def _resolve_gene_to_uniprot(gene_symbol: str, taxid: str) -> Optional[str]:
+    """
+    Resolve a gene symbol to UniProt ID using the NEW UniProt REST API.
+    
+    Args:
+        gene_symbol: Gene symbol
+        taxid: NCBI Taxonomy ID
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
-            if results:
-                uniprot_id = results[0].get("primaryAccession")
-                logger.debug(f"Resolved {gene_symbol} to UniProt ID (unreviewed): {uniprot_id}")
-                return uniprot_id
+    Returns:
+        UniProt ID or None if not found
         
-        logger.warning(f"Could not resolve {gene_symbol} to UniProt ID in taxid {taxid}")
-        return None
+    Raises:
+        GeneRetrievalError: If a UniProt request fails, so a transient error
+            is not mistaken for (and cached as) an unknown gene
+    """
+    # Use the NEW UniProt REST API (not the deprecated one)
+    base_url = "https://rest.uniprot.org/uniprotkb/search"
+    
+    headers = {
+        "Accept": "application/json"
+    }
+    
+    # Reviewed entries first, then fall back to unreviewed ones
+    for query, label in (
+        (f"gene:{gene_symbol} AND organism_id:{taxid} AND reviewed:true", ""),
+        (f"gene:{gene_symbol} AND organism_id:{taxid}", " (unreviewed)"),
+    ):
+        params = {
+            "query": query,
+            "format": "json",
+            "fields": "accession",
+            "size": 1
+        }
         
-    except Exception as e:
-        logger.warning(f"Could not resolve {gene_symbol} to UniProt ID: {e}")
-        return None
+        try:
+            response = _session.get(base_url, params=params, headers=headers, timeout=15)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+        except (requests.RequestException, ValueError) as e:
+            raise GeneRetrievalError(f"Could not resolve {gene_symbol} to UniProt ID: {e}") from e
+        
+        if results:
+            uniprot_id = results[0].get("primaryAccession")
+            logger.debug(f"Resolved {gene_symbol} to UniProt ID{label}: {uniprot_id}")
+            return uniprot_id
+    
+    logger.warning(f"Could not resolve {gene_symbol} to UniProt ID in taxid {taxid}")
+    return None
 
 
 def _validate_go_term(go_term: str) -> bool:
@@ -6,15 +6,59 @@ to standardized organism information using NCBI E-Utils.
 """
 
 import os
+import io
 import json
 import logging
+import threading
+import unicodedata
+from contextlib import contextmanager
+import xml.etree.ElementTree as ET
 from typing import Dict, Optional
 from pathlib import Path
-import time
+from urllib.parse import quote_plus
+
+# Prebuilt E-utils taxonomy URLs; the API key (if any) is appended once at import
+_EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+_NCBI_API_KEY_PARAM = f"&api_key={quote_plus(os.environ['NCBI_API_KEY'])}" if os.environ.get("NCBI_API_KEY") else ""
+_EFETCH_TAXONOMY_URL = _EUTILS_BASE_URL + "/efetch.fcgi?db=taxonomy&retmode=xml&id={taxid}" + _NCBI_API_KEY_PARAM
+_ESEARCH_TAXONOMY_URL = _EUTILS_BASE_URL + "/esearch.fcgi?db=taxonomy&retmode=json&term={term}" + _NCBI_API_KEY_PARAM
+
+# Optional fast JSON (de)serialization for the cache file
+try:
+    import orjson
+    
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+    
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+# Optional fuzzy matching for the offline fallback
+try:
+    from rapidfuzz import process as fuzzy_process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Cache configuration
+ORGANISM_CACHE_FILE = Path.home() / ".openclaw" / "workspace" / "k-sites" / ".cache" / "organism_cache.json"
+ORGANISM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+# In-memory organism cache, loaded from disk on first use
+_organism_cache: Dict[str, Dict[str, str]] = {}
+_organism_cache_by_taxid: Dict[str, Dict[str, str]] = {}  # Secondary index: taxid -> entry
+_cache_loaded = False
+_cache_lock = threading.RLock()
+
 # Common organism mapping as fallback
 COMMON_ORGANISMS = {
     "9606": {"taxid": "9606", "scientific_name": "Homo sapiens", "common_name": "human"},
@@ -85,17 +129,45 @@ COMMON_ORGANISMS = {
 }
 
 
+def _normalize_name(name: str) -> str:
+    """Normalize an organism name: fold accents, lowercase, collapse whitespace."""
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(folded.lower().split())
+
+
+# COMMON_ORGANISMS keyed by normalized name (case/whitespace/accent-insensitive)
+_COMMON_NORM = {_normalize_name(key): value for key, value in COMMON_ORGANISMS.items()}
+
+# Precomputed search rows: (normalized key, lowercased scientific name, lowercased common name, taxid, org)
+_COMMON_SEARCH_INDEX = [
+    (key, org["scientific_name"].lower(), org.get("common_name", "").lower(), org["taxid"], org)
+    for key, org in _COMMON_NORM.items()
+]
+
+# Lowercased COMMON_ORGANISMS keys for fuzzy matching
+_LOWER_KEYS = {key.lower(): key for key in COMMON_ORGANISMS}
+
+# Fields read from EFetch taxonomy XML records
+_TAXONOMY_FIELDS = frozenset({"TaxId", "ScientificName", "GenbankCommonName"})
+
+# Minimum rapidfuzz score for a fuzzy organism match (ratio when resolving, WRatio for search suggestions)
+FUZZY_MATCH_CUTOFF = 85
+
+
 class OrganismNotFoundError(Exception):
     """Raised when an organism cannot be resolved."""
     pass
 
 
-def resolve_organism(input_str: str) -> Dict[str, str]:
+def resolve_organism(input_str: str, revalidate: bool = False) -> Dict[str, str]:
     """
     Resolve an organism identifier to standardized organism information.
     
     Args:
         input_str: Either NCBI TaxID (e.g., "9606") or scientific name (e.g., "Homo sapiens")
+        revalidate: Re-check cached NCBI results with a conditional GET (If-None-Match);
+            an unchanged record costs a 304 with no body
         
     Returns:
         Dictionary with taxid, scientific_name, and common_name
@@ -105,21 +177,23 @@ def resolve_organism(input_str: str) -> Dict[str, str]:
     """
     input_clean = input_str.strip()
     
-    # First check cache
-    cached_result = _get_cached_result(input_clean)
+    # Determine once whether input is a taxid or a name
+    is_numeric = input_clean.isdigit()
+    
+    # First check cache (taxids also match entries cached under a name)
+    cached_result = _get_cached_result(input_clean, is_numeric)
     if cached_result:
         logger.debug(f"Found cached result for {input_clean}")
-        return cached_result
+        if revalidate and cached_result.get("_etag"):
+            return _copy_result(_revalidate_cached_result(input_clean, cached_result))
+        return _copy_result(cached_result)
     
-    # Check common organisms mapping first
-    if input_clean in COMMON_ORGANISMS:
-        result = COMMON_ORGANISMS[input_clean]
+    # Check common organisms mapping first (ignores case, spacing and accents)
+    result = _COMMON_NORM.get(_normalize_name(input_clean))
+    if result:
         _cache_result(input_clean, result)
         logger.debug(f"Resolved {input_clean} using common organisms mapping")
-        return result
-    
-    # Try to determine if input is a taxid or scientific name
-    is_numeric = input_clean.isdigit()
+        return _copy_result(result)
     
     try:
         # Use NCBI E-Utils via requests
@@ -128,40 +202,21 @@ def resolve_organism(input_str: str) -> Dict[str, str]:
         if is_numeric:
             # Input is likely a TaxID, fetch organism info
             taxid = input_clean
-            url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-            params = {
-                "db": "taxonomy",
-                "id": taxid,
-                "retmode": "json"
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            response = requests.get(_EFETCH_TAXONOMY_URL.format(taxid=taxid), timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            tax_data = _parse_taxonomy_xml(response.content)
             
-            if "taxonomy" in data and len(data["taxonomy"]) > 0:
-                tax_data = data["taxonomy"][0]
-                
-                result = {
-                    "taxid": tax_data.get("TaxId", taxid),
-                    "scientific_name": tax_data.get("ScientificName", ""),
-                    "common_name": tax_data.get("OtherNames", {}).get("GenbankCommonName", "")
-                }
+            if tax_data:
+                result = _build_taxonomy_result(tax_data, taxid, "", response)
                 
                 _cache_result(input_clean, result)
                 logger.info(f"Resolved taxid {taxid} to {result['scientific_name']}")
-                return result
+                return _copy_result(result)
         else:
             # Input is likely a scientific name, search for TaxID
-            url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-            params = {
-                "db": "taxonomy",
-                "term": f"{input_clean}[Organism]",
-                "retmode": "json"
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            term = quote_plus(f"{input_clean}[Organism]")
+            response = requests.get(_ESEARCH_TAXONOMY_URL.format(term=term), timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -173,106 +228,211 @@ def resolve_organism(input_str: str) -> Dict[str, str]:
                     taxid = id_list[0]
                     
                     # Now fetch the detailed info
-                    url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-                    params = {
-                        "db": "taxonomy",
-                        "id": taxid,
-                        "retmode": "json"
-                    }
-                    
-                    response = requests.get(url, params=params, timeout=10)
+                    response = requests.get(_EFETCH_TAXONOMY_URL.format(taxid=taxid), timeout=10)
                     response.raise_for_status()
                     
-                    detail_data = response.json()
+                    tax_data = _parse_taxonomy_xml(response.content)
                     
-                    if "taxonomy" in detail_data and len(detail_data["taxonomy"]) > 0:
-                        tax_data = detail_data["taxonomy"][0]
+                    if tax_data:
+                        result = _build_taxonomy_result(tax_data, taxid, input_clean, response)
                         
-                        result = {
-                            "taxid": tax_data.get("TaxId", taxid),
-                            "scientific_name": tax_data.get("ScientificName", input_clean),
-                            "common_name": tax_data.get("OtherNames", {}).get("GenbankCommonName", "")
-                        }
-                        
-                        # Cache with both the original input and the taxid
-                        _cache_result(input_clean, result)
-                        _cache_result(taxid, result)
+                        # Cache with both the original input and the taxid (single write)
+                        with _cache_ctx() as cache:
+                            cache[input_clean] = result
+                            cache[taxid] = result
                         
                         logger.info(f"Resolved {input_clean} to taxid {taxid}")
-                        return result
+                        return _copy_result(result)
     
     except Exception as e:
         logger.warning(f"NCBI lookup failed for {input_clean}: {str(e)}. Using fallback mapping.")
         # If NCBI fails, try the common organisms mapping again with variations
-        for key, value in COMMON_ORGANISMS.items():
-            if input_clean.lower() in key.lower() or key.lower() in input_clean.lower():
-                result = value
-                _cache_result(input_clean, result)
-                logger.debug(f"Resolved {input_clean} using fuzzy match to {key}")
-                return result
+        key = _fuzzy_match_common_organism(input_clean)
+        if key:
+            result = COMMON_ORGANISMS[key]
+            _cache_result(input_clean, result)
+            logger.debug(f"Resolved {input_clean} using fuzzy match to {key}")
+            return _copy_result(result)
     
     # If we get here, the organism couldn't be resolved
     raise OrganismNotFoundError(f"Could not resolve organism: {input_clean}")
 
 
-def _get_cached_result(input_str: str) -> Optional[Dict[str, str]]:
-    """Retrieve cached organism resolution result."""
-    cache_file = _get_cache_file_path()
+def _copy_result(entry: Dict[str, str]) -> Dict[str, str]:
+    """
+    Copy a cached or COMMON_ORGANISMS entry so callers cannot mutate the shared one.
+    
+    Cache-internal fields (HTTP validators such as "_etag") are left out.
+    """
+    return {key: value for key, value in entry.items() if not key.startswith("_")}
+
+
+def _revalidate_cached_result(input_str: str, cached: Dict[str, str]) -> Dict[str, str]:
+    """
+    Revalidate a cached NCBI result with a conditional EFetch.
     
-    if not cache_file.exists():
-        return None
+    Returns the cached entry on 304 Not Modified (or if NCBI is unreachable),
+    otherwise the refreshed record, which replaces the cached one.
+    """
+    import requests
     
+    taxid = cached["taxid"]
     try:
-        with open(cache_file, 'r') as f:
-            cache_data = json.load(f)
+        response = requests.get(
+            _EFETCH_TAXONOMY_URL.format(taxid=taxid),
+            headers={"If-None-Match": cached["_etag"]},
+            timeout=10
+        )
+        
+        if response.status_code == 304:
+            logger.debug(f"Cached taxonomy record for {taxid} is current")
+            return cached
         
-        # Check if input_str exists in cache
-        if input_str in cache_data:
-            return cache_data[input_str]
+        response.raise_for_status()
+        tax_data = _parse_taxonomy_xml(response.content)
+        if not tax_data:
+            return cached
         
-        # Also check if input_str is a taxid that matches any cached taxid
-        if input_str.isdigit():
-            for cached_key, cached_value in cache_data.items():
-                if cached_value.get("taxid") == input_str:
-                    return cached_value
+        result = _build_taxonomy_result(tax_data, taxid, cached.get("scientific_name", ""), response)
+        with _cache_ctx() as cache:
+            cache[input_str] = result
+            cache[taxid] = result
+        
+        logger.info(f"Refreshed cached taxonomy record for {taxid}")
+        return result
     
     except Exception as e:
-        logger.warning(f"Could not read cache file: {str(e)}")
+        logger.warning(f"Could not revalidate cached result for {input_str}: {str(e)}")
+        return cached
+
+
+def _build_taxonomy_result(tax_data: Dict[str, str], taxid: str, default_name: str, response) -> Dict[str, str]:
+    """
+    Build a cache entry from parsed EFetch fields.
     
-    return None
+    The response ETag is kept in the cache-only "_etag" field, which
+    _copy_result() strips before the entry reaches callers.
+    """
+    result = {
+        "taxid": tax_data.get("TaxId") or taxid,
+        "scientific_name": tax_data.get("ScientificName") or default_name,
+        "common_name": tax_data.get("GenbankCommonName", "")
+    }
+    
+    etag = response.headers.get("ETag")
+    if etag:
+        result["_etag"] = etag
+    
+    return result
 
 
-def _cache_result(input_str: str, result: Dict[str, str]):
-    """Cache organism resolution result."""
-    cache_file = _get_cache_file_path()
+def _parse_taxonomy_xml(content: bytes) -> Dict[str, str]:
+    """
+    Extract TaxId, ScientificName and GenbankCommonName from an EFetch taxonomy record.
+    
+    Streams the XML and stops as soon as the three fields of the first Taxon
+    are seen (they precede the much larger LineageEx block).
+    """
+    fields = {}
+    for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+        if elem.tag in _TAXONOMY_FIELDS and elem.tag not in fields:
+            fields[elem.tag] = (elem.text or "").strip()
+            if len(fields) == len(_TAXONOMY_FIELDS):
+                break
+        elem.clear()
+    return fields
+
+
+def _fuzzy_match_common_organism(input_str: str) -> Optional[str]:
+    """
+    Find the COMMON_ORGANISMS key closest to input_str.
     
-    # Create cache directory if it doesn't exist
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    Uses rapidfuzz when installed, otherwise falls back to substring matching.
+    The whole name is compared with a plain edit-distance ratio, so small typos
+    match ("Drosphila melanogaster") but another species of a known genus does
+    not ("Homo neanderthalensis" is not "Homo sapiens").
+    """
+    input_lower = input_str.lower()
     
-    # Load existing cache
-    cache_data = {}
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
-        except Exception as e:
-            logger.warning(f"Could not load existing cache: {str(e)}")
+    if RAPIDFUZZ_AVAILABLE:
+        match = fuzzy_process.extractOne(
+            input_lower, list(_LOWER_KEYS), scorer=fuzz.ratio, score_cutoff=FUZZY_MATCH_CUTOFF
+        )
+        return _LOWER_KEYS[match[0]] if match else None
     
-    # Add new result
-    cache_data[input_str] = result
+    for key_lower, key in _LOWER_KEYS.items():
+        if input_lower in key_lower or key_lower in input_lower:
+            return key
     
-    # Write back to cache
+    return None
+
+
+def _load_cache():
+    """Load the organism cache from disk into memory (once per process)."""
+    global _organism_cache, _cache_loaded
+    with _cache_lock:
+        if _cache_loaded:
+            return
+        
+        try:
+            if ORGANISM_CACHE_FILE.exists():
+                with open(ORGANISM_CACHE_FILE, 'rb') as f:
+                    _organism_cache = _json_loads(f.read())
+        except Exception as e:
+            logger.warning(f"Could not read cache file: {str(e)}")
+            _organism_cache = {}
+        finally:
+            _reindex_cache()
+            _cache_loaded = True
+
+
+def _reindex_cache():
+    """Rebuild the taxid -> entry index (first cached entry per taxid wins)."""
+    _organism_cache_by_taxid.clear()
+    for cached_value in _organism_cache.values():
+        taxid = cached_value.get("taxid")
+        if taxid:
+            _organism_cache_by_taxid.setdefault(taxid, cached_value)
+
+
+def _save_cache():
+    """Write the in-memory organism cache to disk."""
     try:
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+        with open(ORGANISM_CACHE_FILE, 'wb') as f:
+            f.write(_json_dumps(_organism_cache))
     except Exception as e:
         logger.warning(f"Could not write to cache file: {str(e)}")
 
 
-def _get_cache_file_path() -> Path:
-    """Get the path to the organism cache file."""
-    cache_dir = Path.home() / ".openclaw" / "workspace" / "k-sites" / ".cache"
-    return cache_dir / "organism_cache.json"
+@contextmanager
+def _cache_ctx():
+    """Yield the in-memory organism cache for updates and persist it on exit."""
+    with _cache_lock:
+        _load_cache()
+        yield _organism_cache
+        _reindex_cache()
+        _save_cache()
+
+
+def _get_cached_result(input_str: str, is_numeric: bool = False) -> Optional[Dict[str, str]]:
+    """Retrieve cached organism resolution result (is_numeric enables taxid lookup)."""
+    _load_cache()
+    
+    # Check if input_str exists in cache
+    if input_str in _organism_cache:
+        return _organism_cache[input_str]
+    
+    # Also check if input_str is a taxid that matches any cached taxid
+    if is_numeric:
+        return _organism_cache_by_taxid.get(input_str)
+    
+    return None
+
+
+def _cache_result(input_str: str, result: Dict[str, str]):
+    """Cache organism resolution result."""
+    with _cache_ctx() as cache:
+        cache[input_str] = result
 
 
 def search_organisms(query: str, limit: int = 20) -> list:
@@ -286,20 +446,19 @@ def search_organisms(query: str, limit: int = 20) -> list:
     Returns:
         List of organism dictionaries matching the query
     """
-    query_lower = query.lower().strip()
+    query_lower = _normalize_name(query)
     results = []
     
-    # Search in common organisms
+    # Search in common organisms (keys are already normalized)
     seen_taxids = set()
-    for key, org in COMMON_ORGANISMS.items():
-        taxid = org['taxid']
+    for key, sci_lower, common_lower, taxid, org in _COMMON_SEARCH_INDEX:
         if taxid in seen_taxids:
             continue
             
         # Check if query matches any field
-        if (query_lower in key.lower() or 
-            query_lower in org['scientific_name'].lower() or
-            query_lower in org.get('common_name', '').lower() or
+        if (query_lower in key or 
+            query_lower in sci_lower or
+            query_lower in common_lower or
             query_lower == taxid):
             
             results.append({
@@ -312,6 +471,25 @@ def search_organisms(query: str, limit: int = 20) -> list:
         if len(results) >= limit:
             break
     
+    # No substring hits: suggest close spellings (find-as-you-type)
+    if not results and RAPIDFUZZ_AVAILABLE and query_lower:
+        matches = fuzzy_process.extract(
+            query_lower, list(_LOWER_KEYS), scorer=fuzz.WRatio,
+            score_cutoff=FUZZY_MATCH_CUTOFF, limit=None
+        )
+        for key_lower, _, _ in matches:
+            org = COMMON_ORGANISMS[_LOWER_KEYS[key_lower]]
+            if org['taxid'] in seen_taxids:
+                continue
+            results.append({
+                'name': org['scientific_name'],
+                'taxid': org['taxid'],
+                'common_name': org.get('common_name', '')
+            })
+            seen_taxids.add(org['taxid'])
+            if len(results) >= limit:
+                break
+    
     # If query is numeric, try exact taxid match via NCBI
     if query.isdigit() and len(results) == 0:
         try:
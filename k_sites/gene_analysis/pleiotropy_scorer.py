@@ -13,12 +13,43 @@ CRITICAL: Pleiotropy score is 0-10 based on number of OTHER BP GO terms.
 CRITICAL: Specificity score is 0-1 scale (inverse of pleiotropy).
 """
 
+import asyncio
+import atexit
+import copy
+import heapq
 import logging
 import math
+import os
+import threading
+import numpy as np
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from functools import lru_cache, partial
+from operator import attrgetter
+
+from k_sites.data_retrieval.go_gene_mapper import (
+    get_go_terms_for_gene_across_species,
+    get_pleiotropy_score_detailed,
+    summarize_go_terms,
+)
+from k_sites.data_retrieval.multi_database_client import query_gene_from_all_databases
+
+# Optional fast JSON parsing for E-utils responses
+try:
+    import orjson
+    
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    import json
+    
+    def _json_loads(data: bytes):
+        return json.loads(data)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -32,15 +63,75 @@ MODEL_ORGANISMS = {
 }
 
 # Evidence code classifications - EXPLICIT
-EXPERIMENTAL_CODES = {"IDA", "IMP", "IGI", "IPI", "IEP", "HTP", "HDA", "HMP", "HGI", "HEP"}
-COMPUTATIONAL_CODES = {"ISS", "ISO", "ISA", "ISM", "IGC", "IBA", "IBD", "IKR", "IRD", "RCA"}
-IEA_CODE = {"IEA"}  # Computational PREDICTION - NOT experimental
+EXPERIMENTAL_CODES = frozenset({"IDA", "IMP", "IGI", "IPI", "IEP", "HTP", "HDA", "HMP", "HGI", "HEP"})
+COMPUTATIONAL_CODES = frozenset({"ISS", "ISO", "ISA", "ISM", "IGC", "IBA", "IBD", "IKR", "IRD", "RCA"})
+IEA_CODE = frozenset({"IEA"})  # Computational PREDICTION - NOT experimental
+
+# Exponential decay scoring constants
+PLEIOTROPY_LAMBDA = 0.3        # Decay rate
+PLEIOTROPY_MAX_SCORE = 10.0    # Pleiotropy scale is 0-10
+PLEIOTROPY_MAX_OTHER_TERMS = 10  # Other BP terms at which the score saturates
+
+# Parallel gene ranking - 10 workers matches the NCBI E-utils rate cap with an API key
+MAX_RANKING_WORKERS = 10
+RANKING_TIMEOUT = 120  # Seconds to wait for one gene's ranking
+
+# Shared pool for leaf-level HTTP lookups (per-species validation, PubMed counts).
+# Only tasks that never wait on other pool tasks may be submitted, so nested use cannot deadlock.
+_IO_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("KSITES_IO_THREADS", "32")),
+    thread_name_prefix="ksites-io"
+)
+atexit.register(_IO_POOL.shutdown, wait=False)
+
+# Composite ranking weights: specificity, evidence quality, literature, conservation
+COMPOSITE_SCORE_FIELDS = ("specificity_score", "evidence_quality", "literature_score", "conservation_score")
+COMPOSITE_SCORE_WEIGHTS = np.array([0.40, 0.25, 0.20, 0.15])
+
+
+def _build_session() -> requests.Session:
+    """Create a keep-alive session sized for the ranking thread pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=4 * MAX_RANKING_WORKERS,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",)
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Memoized score_gene_pleiotropy results: (gene, taxid, evidence_filter, multi_db) -> result
+SCORING_CACHE_SIZE = 4096
+_scoring_cache: Dict[tuple, Dict] = {}
+_scoring_cache_lock = threading.Lock()
+
+# Memoized validate_across_species results:
+# (gene, target_go_term, species tuple, primary species result) -> (timestamp, result)
+CROSS_SPECIES_CACHE_SIZE = 4096
+CROSS_SPECIES_CACHE_TTL = 3600  # seconds
+_cross_species_cache: Dict[tuple, tuple] = {}
+_cross_species_cache_lock = threading.Lock()
+
+# Shared HTTP session (connection pooling for NCBI E-utilities)
+_session = _build_session()
+
+
+def configure_session(session: requests.Session):
+    """Use a caller-provided requests.Session for all PubMed queries."""
+    global _session
+    _session = session
 
 
 def calculate_pleiotropy_score(
     bp_term_count: int,
-    max_terms: int = 10,
-    lambda_decay: float = 0.3
+    max_terms: int = PLEIOTROPY_MAX_OTHER_TERMS,
+    lambda_decay: float = PLEIOTROPY_LAMBDA
 ) -> float:
     """
     Calculate pleiotropy score using exponential decay formula.
@@ -60,23 +151,30 @@ def calculate_pleiotropy_score(
     Returns:
         Pleiotropy score on 0-10 scale
     """
-    if bp_term_count <= 0:
-        return 0.0
-    
-    if bp_term_count == 1:
-        return 0.0  # Only one BP term = highly specific
-    
-    # Number of OTHER BP terms (excluding the target)
-    other_bp_terms = bp_term_count - 1
+    # Number of OTHER BP terms (excluding the target); 0 or 1 BP term = highly specific
+    other_bp_terms = max(bp_term_count - 1, 0)
     
     if other_bp_terms >= max_terms:
-        return 10.0  # Maximum pleiotropy
+        return PLEIOTROPY_MAX_SCORE  # Maximum pleiotropy
+    
+    # Integer counts with the default parameters come from the precomputed table
+    if lambda_decay == PLEIOTROPY_LAMBDA and isinstance(other_bp_terms, int) and other_bp_terms < PLEIOTROPY_LUT_SIZE:
+        return _PLEIOTROPY_SCORE_LUT[other_bp_terms]
     
     # Exponential decay scoring: score = 10 * (1 - exp(-λ * n))
-    # This gives 0 at n=0 and approaches 10 as n increases
-    score = 10.0 * (1 - math.exp(-lambda_decay * other_bp_terms))
+    # This gives 0 at n=0 and approaches 10 as n increases.
+    # -expm1(-x) == 1 - exp(-x) without cancellation for small x
+    score = -PLEIOTROPY_MAX_SCORE * math.expm1(-lambda_decay * other_bp_terms)
     
-    return min(10.0, score)
+    return min(PLEIOTROPY_MAX_SCORE, score)
+
+
+# calculate_pleiotropy_score() for 0..PLEIOTROPY_LUT_SIZE-1 other BP terms at the default decay rate
+PLEIOTROPY_LUT_SIZE = 64
+_PLEIOTROPY_SCORE_LUT = tuple(
+    min(PLEIOTROPY_MAX_SCORE, -PLEIOTROPY_MAX_SCORE * math.expm1(-PLEIOTROPY_LAMBDA * n))
+    for n in range(PLEIOTROPY_LUT_SIZE)
+)
 
 
 def calculate_specificity_score(pleiotropy_score: float) -> float:
@@ -102,13 +200,16 @@ def score_gene_pleiotropy(
     taxid: str,
     target_go_term: str = None,
     evidence_filter: str = "experimental",
-    use_multi_database: bool = True
+    use_multi_database: bool = True,
+    go_terms: Optional[List[Dict]] = None
 ) -> Dict:
     """
     Calculate comprehensive pleiotropy score for a gene using multi-database integration.
     
     This function queries GO.org, UniProt, and KEGG simultaneously to get
-    comprehensive BP term counts and evidence quality.
+    comprehensive BP term counts and evidence quality. Successful results are
+    memoized per (gene_symbol, taxid, evidence_filter, use_multi_database);
+    callers receive a copy.
     
     Args:
         gene_symbol: Gene symbol (e.g., "BRCA1")
@@ -116,11 +217,54 @@ def score_gene_pleiotropy(
         target_go_term: Optional target GO term (excluded from count)
         evidence_filter: "experimental", "computational", or "all"
         use_multi_database: Whether to query all databases simultaneously
+        go_terms: Prefetched QuickGO terms for the single-database path
+            (skips the per-gene UniProt/QuickGO lookup and the cache)
         
     Returns:
         Comprehensive scoring dictionary
     """
-    logger.info(f"Scoring pleiotropy for {gene_symbol} in {taxid}")
+    if go_terms is not None:
+        return _score_gene_pleiotropy_uncached(
+            gene_symbol, taxid, target_go_term, evidence_filter, use_multi_database, go_terms
+        )
+    
+    cache_key = (gene_symbol, taxid, evidence_filter, use_multi_database)
+    with _scoring_cache_lock:
+        cached = _scoring_cache.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
+    result = _score_gene_pleiotropy_uncached(
+        gene_symbol, taxid, target_go_term, evidence_filter, use_multi_database
+    )
+    
+    # Only cache successful lookups so transient failures are retried
+    if "error" not in result:
+        with _scoring_cache_lock:
+            if len(_scoring_cache) >= SCORING_CACHE_SIZE:
+                _scoring_cache.pop(next(iter(_scoring_cache)))  # Evict oldest entry
+            _scoring_cache[cache_key] = copy.deepcopy(result)
+    
+    return result
+
+
+def clear_scoring_cache():
+    """Clear memoized pleiotropy scores and PubMed counts."""
+    with _scoring_cache_lock:
+        _scoring_cache.clear()
+    _query_pubmed_count.cache_clear()
+
+
+def _score_gene_pleiotropy_uncached(
+    gene_symbol: str,
+    taxid: str,
+    target_go_term: str = None,
+    evidence_filter: str = "experimental",
+    use_multi_database: bool = True,
+    go_terms: Optional[List[Dict]] = None
+) -> Dict:
+    """Compute score_gene_pleiotropy() without the memoization layer."""
+    logger.info("Scoring pleiotropy for %s in %s", gene_symbol, taxid)
     
     result = {
         "gene_symbol": gene_symbol,
@@ -141,7 +285,6 @@ def score_gene_pleiotropy(
     try:
         if use_multi_database:
             # Query all databases simultaneously
-            from k_sites.data_retrieval.multi_database_client import query_gene_from_all_databases
             db_results = query_gene_from_all_databases(gene_symbol, taxid)
             
             # Extract combined BP terms
@@ -165,9 +308,19 @@ def score_gene_pleiotropy(
             kegg_data = db_results.get("kegg_data", {})
             result["kegg_pathway_count"] = kegg_data.get("pathway_count", 0)
             
+        elif go_terms is not None:
+            # Single database scoring from GO terms fetched in a batch
+            detailed = summarize_go_terms(go_terms)
+            
+            result["bp_term_count"] = detailed.get("bp_term_count", 0)
+            result["bp_terms"] = detailed.get("biological_process_terms", [])
+            result["experimental_evidence_count"] = detailed.get("experimental_evidence_count", 0)
+            result["computational_evidence_count"] = detailed.get("computational_evidence_count", 0)
+            result["iea_evidence_count"] = detailed.get("iea_evidence_count", 0)
+            result["database_sources"] = ["QuickGO"]
+            
         else:
             # Fallback to single database query
-            from k_sites.data_retrieval.go_gene_mapper import get_pleiotropy_score_detailed
             detailed = get_pleiotropy_score_detailed(gene_symbol, taxid)
             
             result["bp_term_count"] = detailed.get("bp_term_count", 0)
@@ -193,23 +346,29 @@ def score_gene_pleiotropy(
         other_bp_count = effective_bp_count - 1 if effective_bp_count > 0 else 0
         result["other_bp_term_count"] = other_bp_count
         
-        # Calculate pleiotropy score (0-10 scale based on OTHER BP terms)
-        result["pleiotropy_score"] = calculate_pleiotropy_score(effective_bp_count)
-        
-        # Calculate specificity score (0-1 scale)
-        result["specificity_score"] = calculate_specificity_score(result["pleiotropy_score"])
+        if other_bp_count >= PLEIOTROPY_MAX_OTHER_TERMS:
+            # Saturated: maximally pleiotropic, no decay evaluation needed
+            result["pleiotropy_score"] = PLEIOTROPY_MAX_SCORE
+            result["specificity_score"] = 0.0
+        else:
+            # Calculate pleiotropy score (0-10 scale based on OTHER BP terms)
+            result["pleiotropy_score"] = calculate_pleiotropy_score(effective_bp_count)
+            
+            # Calculate specificity score (0-1 scale)
+            result["specificity_score"] = calculate_specificity_score(result["pleiotropy_score"])
         
         # Calculate evidence quality (0-1 scale)
         result["evidence_quality"] = _calculate_evidence_quality(result)
         
-        logger.info(f"Pleiotropy for {gene_symbol}: {result['pleiotropy_score']:.2f}, "
-                   f"Specificity: {result['specificity_score']:.2f}, "
-                   f"BP terms: {result['bp_term_count']}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Pleiotropy for %s: %.2f, Specificity: %.2f, BP terms: %d",
+                        gene_symbol, result["pleiotropy_score"],
+                        result["specificity_score"], result["bp_term_count"])
         
         return result
         
     except Exception as e:
-        logger.error(f"Error scoring pleiotropy for {gene_symbol}: {e}")
+        logger.error("Error scoring pleiotropy for %s: %s", gene_symbol, e)
         result["error"] = str(e)
         return result
 
@@ -246,6 +405,7 @@ def get_literature_support(gene_symbol: str, taxid: str = "9606") -> Dict:
     Get REAL literature support by querying PubMed.
     
     NOT A STUB - This queries NCBI PubMed for actual publication counts.
+    Successful counts are memoized per (gene_symbol, taxid).
     
     Args:
         gene_symbol: Gene symbol
@@ -254,7 +414,39 @@ def get_literature_support(gene_symbol: str, taxid: str = "9606") -> Dict:
     Returns:
         Literature support data including publication count and score
     """
-    logger.info(f"Querying PubMed for literature support: {gene_symbol}")
+    result = _fetch_literature_support(gene_symbol, taxid)
+    
+    if result["query_status"] == "success":
+        # Calculate literature score (0-1 scale)
+        # Log scale: 1000+ papers = 1.0, 100 papers = 0.67, 10 papers = 0.33, 1 paper = 0.0
+        count = result["pubmed_count"]
+        if count >= 1000:
+            result["literature_score"] = 1.0
+        elif count > 0:
+            result["literature_score"] = min(1.0, math.log10(count) / 3.0)
+        else:
+            result["literature_score"] = 0.0
+    
+    return result
+
+
+def literature_scores_vec(counts) -> np.ndarray:
+    """
+    Vectorized literature score for many PubMed counts at once.
+    
+    Same log scale as get_literature_support(): 1000+ papers = 1.0, 0 or 1 paper = 0.0.
+    """
+    counts = np.asarray(counts, dtype=float)
+    return np.clip(np.log10(np.maximum(counts, 1)) / 3.0, 0.0, 1.0)
+
+
+def _fetch_literature_support(gene_symbol: str, taxid: str) -> Dict:
+    """
+    Query the PubMed count for a gene, leaving literature_score to the caller on success.
+    
+    Failed queries get the default medium score (0.5).
+    """
+    logger.info("Querying PubMed for literature support: %s", gene_symbol)
     
     result = {
         "gene_symbol": gene_symbol,
@@ -264,78 +456,187 @@ def get_literature_support(gene_symbol: str, taxid: str = "9606") -> Dict:
     }
     
     try:
-        # Query NCBI E-utilities for PubMed count
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-        
-        # Build search query
-        organism_name = "human" if taxid == "9606" else "mouse" if taxid == "10090" else ""
-        query = f"{gene_symbol}[Gene Name] AND {organism_name}[Organism]" if organism_name else f"{gene_symbol}[Gene Name]"
-        
-        params = {
-            "db": "pubmed",
-            "term": query,
-            "rettype": "count",
-            "retmode": "json"
-        }
-        
-        # Add API key if available
-        import os
-        api_key = os.environ.get("NCBI_API_KEY")
-        if api_key:
-            params["api_key"] = api_key
+        result["pubmed_count"] = _query_pubmed_count(gene_symbol, taxid)
+        result["query_status"] = "success"
         
-        time.sleep(0.34)  # Rate limiting
-        response = requests.get(base_url, params=params, timeout=15)
+    except requests.HTTPError as e:
+        status_code = e.response.status_code if e.response is not None else "unknown"
+        logger.warning("PubMed query returned status %s", status_code)
+        result["query_status"] = f"failed: HTTP {status_code}"
+        result["literature_score"] = 0.5  # Default medium
         
-        if response.status_code == 200:
-            data = response.json()
-            count = int(data.get("esearchresult", {}).get("count", 0))
-            result["pubmed_count"] = count
-            
-            # Calculate literature score (0-1 scale)
-            # Log scale: 1000+ papers = 1.0, 100 papers = 0.67, 10 papers = 0.33, 1 paper = 0.0
-            if count >= 1000:
-                result["literature_score"] = 1.0
-            elif count > 0:
-                result["literature_score"] = min(1.0, math.log10(count) / 3.0)
-            else:
-                result["literature_score"] = 0.0
-            
-            result["query_status"] = "success"
-            
-        else:
-            logger.warning(f"PubMed query returned status {response.status_code}")
-            result["query_status"] = f"failed: HTTP {response.status_code}"
-            result["literature_score"] = 0.5  # Default medium
-            
     except Exception as e:
-        logger.error(f"PubMed query failed: {e}")
+        logger.error("PubMed query failed: %s", e)
         result["query_status"] = f"failed: {str(e)}"
         result["literature_score"] = 0.5  # Default medium
     
     return result
 
 
+class _RateLimiter:
+    """
+    Thread-safe rate limiter shared by all workers.
+    
+    Spaces calls at least 1/rate_per_sec apart and only sleeps for the
+    remaining gap, so sporadic calls are not delayed at all.
+    """
+    
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until the caller may issue its request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# NCBI E-utils allow 3 requests/second, or 10 with an API key
+_PUBMED_LIMITER = _RateLimiter(10.0 if os.environ.get("NCBI_API_KEY") else 3.0)
+
+
+@lru_cache(maxsize=8192)
+def _query_pubmed_count(gene_symbol: str, taxid: str) -> int:
+    """
+    Query NCBI E-utilities for the PubMed publication count of a gene.
+    
+    Memoized; failures raise and are therefore not cached.
+    """
+    base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    
+    # Build search query
+    organism_name = "human" if taxid == "9606" else "mouse" if taxid == "10090" else ""
+    query = f"{gene_symbol}[Gene Name] AND {organism_name}[Organism]" if organism_name else f"{gene_symbol}[Gene Name]"
+    
+    params = {
+        "db": "pubmed",
+        "term": query,
+        "rettype": "count",
+        "retmode": "json"
+    }
+    
+    # Add API key if available
+    api_key = os.environ.get("NCBI_API_KEY")
+    if api_key:
+        params["api_key"] = api_key
+    
+    _PUBMED_LIMITER.acquire()
+    response = _session.get(base_url, params=params, timeout=15)
+    
+    if response.status_code != 200:
+        raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+    
+    data = _json_loads(response.content)
+    return int(data.get("esearchresult", {}).get("count", 0))
+
+
+def get_literature_support_batch(gene_symbols: List[str], taxid: str = "9606") -> Dict[str, Dict]:
+    """
+    Get literature support for many genes at once.
+    
+    ESearch only reports a combined count for OR'd terms, so per-gene counts
+    still need one query each; this deduplicates the symbols and runs the
+    (memoized) queries concurrently over the shared session.
+    
+    Args:
+        gene_symbols: Gene symbols
+        taxid: NCBI Taxonomy ID
+        
+    Returns:
+        Dictionary mapping gene symbol to get_literature_support() data
+    """
+    unique_symbols = list(dict.fromkeys(symbol for symbol in gene_symbols if symbol))
+    if not unique_symbols:
+        return {}
+    
+    supports = list(_IO_POOL.map(lambda symbol: _fetch_literature_support(symbol, taxid), unique_symbols))
+    
+    # Score every successful count in one vector pass
+    succeeded = [support for support in supports if support["query_status"] == "success"]
+    if succeeded:
+        scores = literature_scores_vec([support["pubmed_count"] for support in succeeded])
+        for support, score in zip(succeeded, scores.tolist()):
+            support["literature_score"] = score
+    
+    return dict(zip(unique_symbols, supports))
+
+
 def validate_across_species(
     gene_symbol: str,
     target_go_term: str,
-    species_list: List[str] = None
+    species_list: List[str] = None,
+    primary_scoring: Optional[Dict] = None,
+    primary_taxid: Optional[str] = None
 ) -> Dict:
     """
     Validate gene specificity across model organisms (human, mouse, fly, worm).
     
+    Complete results are memoized for CROSS_SPECIES_CACHE_TTL seconds; see
+    invalidate_cross_species_cache().
+    
     Args:
         gene_symbol: Gene symbol to validate
         target_go_term: Target GO term
         species_list: List of species taxids (default: human, mouse, fly, worm)
+        primary_scoring: score_gene_pleiotropy() result already computed for primary_taxid,
+            reused instead of scoring that species again
+        primary_taxid: Taxid the primary_scoring result belongs to
         
     Returns:
         Cross-species validation results
     """
     if species_list is None:
         species_list = list(MODEL_ORGANISMS.keys())  # human, mouse, fly, worm
+    species_tuple = tuple(species_list)
+    
+    # The primary species was already scored by the caller; only query the others
+    primary_result = None
+    if primary_scoring is not None and primary_taxid in species_tuple:
+        primary_result = _species_result_from_scoring(primary_taxid, primary_scoring)
+    
+    cache_key = (
+        gene_symbol,
+        target_go_term,
+        species_tuple,
+        tuple(sorted(primary_result.items())) if primary_result else None
+    )
+    with _cross_species_cache_lock:
+        cached = _cross_species_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < CROSS_SPECIES_CACHE_TTL:
+        return copy.deepcopy(cached[1])
     
-    logger.info(f"Validating {gene_symbol} across {len(species_list)} species")
+    results = _validate_across_species_uncached(gene_symbol, target_go_term, species_tuple, primary_result)
+    
+    # Only cache complete validations so transient failures are retried
+    if not any("error" in species_result for species_result in results["species_results"].values()):
+        with _cross_species_cache_lock:
+            _cross_species_cache.pop(cache_key, None)
+            if len(_cross_species_cache) >= CROSS_SPECIES_CACHE_SIZE:
+                _cross_species_cache.pop(next(iter(_cross_species_cache)))  # Evict oldest entry
+            _cross_species_cache[cache_key] = (time.monotonic(), copy.deepcopy(results))
+    
+    return results
+
+
+def invalidate_cross_species_cache():
+    """Clear memoized cross-species validation results."""
+    with _cross_species_cache_lock:
+        _cross_species_cache.clear()
+
+
+def _validate_across_species_uncached(
+    gene_symbol: str,
+    target_go_term: str,
+    species_list: tuple,
+    primary_result: Optional[Dict] = None
+) -> Dict:
+    """Run validate_across_species() without the cache; primary_result is reused as-is."""
+    logger.info("Validating %s across %d species", gene_symbol, len(species_list))
     
     results = {
         "gene_symbol": gene_symbol,
@@ -348,42 +649,74 @@ def validate_across_species(
     
     specificity_scores = []
     
-    # Query each species in parallel
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {
-            executor.submit(_validate_in_species, gene_symbol, target_go_term, taxid): taxid
-            for taxid in species_list
-        }
-        
-        for future in as_completed(futures):
-            taxid = futures[future]
-            try:
-                species_result = future.result(timeout=30)
-                results["species_results"][taxid] = species_result
+    pending_species = list(species_list)
+    if primary_result is not None:
+        primary_taxid = primary_result["taxid"]
+        results["species_results"][primary_taxid] = primary_result
+        if primary_result["found"]:
+            results["found_in_species"] += 1
+            specificity_scores.append(primary_result.get("specificity_score", 0.5))
+        pending_species.remove(primary_taxid)
+    
+    # Fetch GO terms for all species in one batched UniProt + QuickGO round trip
+    batched_go_terms = {}
+    if pending_species:
+        try:
+            batched_go_terms = get_go_terms_for_gene_across_species(gene_symbol, pending_species)
+        except Exception as e:
+            logger.warning("Batched GO lookup failed for %s, querying species individually: %s", gene_symbol, e)
+    
+    # Score each species in parallel (species missing from the batch query individually)
+    futures = {
+        _IO_POOL.submit(
+            _validate_in_species, gene_symbol, target_go_term, taxid, batched_go_terms.get(taxid)
+        ): taxid
+        for taxid in pending_species
+    }
+    
+    for future in as_completed(futures):
+        taxid = futures[future]
+        try:
+            species_result = future.result(timeout=30)
+            results["species_results"][taxid] = species_result
+            
+            if species_result.get("found"):
+                results["found_in_species"] += 1
+                specificity_scores.append(species_result.get("specificity_score", 0.5))
                 
-                if species_result.get("found"):
-                    results["found_in_species"] += 1
-                    specificity_scores.append(species_result.get("specificity_score", 0.5))
-                    
-            except Exception as e:
-                logger.warning(f"Validation failed for {taxid}: {e}")
-                results["species_results"][taxid] = {"found": False, "error": str(e)}
+        except Exception as e:
+            logger.warning("Validation failed for %s: %s", taxid, e)
+            results["species_results"][taxid] = {"found": False, "error": str(e)}
     
     # Calculate conservation score
     results["conservation_score"] = results["found_in_species"] / len(species_list)
     
     # Calculate specificity consistency (how consistent is specificity across species)
     if specificity_scores:
-        mean_spec = sum(specificity_scores) / len(specificity_scores)
-        variance = sum((s - mean_spec) ** 2 for s in specificity_scores) / len(specificity_scores)
-        # Low variance = high consistency
-        results["specificity_consistency"] = max(0, 1 - math.sqrt(variance))
+        # Low standard deviation = high consistency
+        spread = float(np.std(np.asarray(specificity_scores, dtype=np.float64)))
+        results["specificity_consistency"] = max(0.0, 1.0 - spread)
     
     return results
 
 
-def _validate_in_species(gene_symbol: str, target_go_term: str, taxid: str) -> Dict:
-    """Validate a gene in a specific species."""
+def _validate_in_species(
+    gene_symbol: str,
+    target_go_term: str,
+    taxid: str,
+    go_terms: Optional[List[Dict]] = None
+) -> Dict:
+    """Validate a gene in a specific species, optionally from prefetched GO terms."""
+    # Get pleiotropy score for this species (scoring errors are reported, not raised;
+    # anything unexpected propagates to validate_across_species)
+    scoring = score_gene_pleiotropy(
+        gene_symbol, taxid, target_go_term, use_multi_database=False, go_terms=go_terms
+    )
+    return _species_result_from_scoring(taxid, scoring)
+
+
+def _species_result_from_scoring(taxid: str, scoring: Dict) -> Dict:
+    """Build a per-species validation result from a score_gene_pleiotropy() result."""
     result = {
         "taxid": taxid,
         "organism": MODEL_ORGANISMS.get(taxid, "Unknown"),
@@ -393,23 +726,67 @@ def _validate_in_species(gene_symbol: str, target_go_term: str, taxid: str) -> D
         "bp_term_count": 0
     }
     
-    try:
-        # Get pleiotropy score for this species
-        scoring = score_gene_pleiotropy(gene_symbol, taxid, target_go_term, use_multi_database=False)
-        
-        if scoring.get("bp_term_count", 0) > 0:
-            result["found"] = True
-            result["pleiotropy_score"] = scoring.get("pleiotropy_score", 5.0)
-            result["specificity_score"] = scoring.get("specificity_score", 0.5)
-            result["bp_term_count"] = scoring.get("bp_term_count", 0)
-        
-    except Exception as e:
-        logger.warning(f"Validation in {taxid} failed: {e}")
-        result["error"] = str(e)
+    if "error" in scoring:
+        logger.warning("Validation in %s failed: %s", taxid, scoring["error"])
+        result["error"] = scoring["error"]
+    elif scoring.get("bp_term_count", 0) > 0:
+        result["found"] = True
+        result["pleiotropy_score"] = scoring.get("pleiotropy_score", 5.0)
+        result["specificity_score"] = scoring.get("specificity_score", 0.5)
+        result["bp_term_count"] = scoring.get("bp_term_count", 0)
     
     return result
 
 
+@dataclass
+class GeneRankResult:
+    """
+    Per-gene ranking result.
+    
+    Slotted to keep large rankings compact; rank_genes_by_specificity()
+    converts results to dicts with to_dict() at the API boundary.
+    """
+    __slots__ = (
+        "symbol", "description", "entrez_id", "pleiotropy_score", "specificity_score",
+        "evidence_quality", "literature_score", "conservation_score", "composite_score",
+        "bp_term_count", "other_bp_term_count", "experimental_evidence_count",
+        "computational_evidence_count", "iea_evidence_count", "kegg_pathway_count",
+        "pubmed_count", "specificity_consistency", "database_sources", "passes_threshold", "error"
+    )
+    
+    symbol: str
+    description: str
+    entrez_id: str
+    pleiotropy_score: float
+    specificity_score: float
+    evidence_quality: float
+    literature_score: float
+    conservation_score: float
+    composite_score: float
+    bp_term_count: int
+    other_bp_term_count: int
+    experimental_evidence_count: int
+    computational_evidence_count: int
+    iea_evidence_count: int
+    kegg_pathway_count: int
+    pubmed_count: int
+    specificity_consistency: float
+    database_sources: List[str]
+    passes_threshold: bool
+    error: Optional[str]
+    
+    def to_dict(self) -> Dict:
+        """Convert to the ranking dict format ("error" only present for failed genes)."""
+        result = {name: getattr(self, name) for name in _GENE_RANK_RESULT_FIELDS}
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+# Fields emitted by GeneRankResult.to_dict(), in declaration order ("error" is added only when set)
+_GENE_RANK_RESULT_FIELDS = tuple(field.name for field in fields(GeneRankResult) if field.name != "error")
+
+
 def _rank_single_gene(
     gene_info: Dict,
     taxid: str,
@@ -417,8 +794,9 @@ def _rank_single_gene(
     evidence_filter: str,
     include_literature: bool,
     include_cross_species: bool,
-    max_pleiotropy_threshold: int
-) -> Dict:
+    max_pleiotropy_threshold: int,
+    literature_map: Optional[Dict[str, Dict]] = None
+) -> Optional[GeneRankResult]:
     """Rank a single gene - helper for parallel processing."""
     gene_symbol = gene_info.get("symbol", "")
     if not gene_symbol:
@@ -436,7 +814,10 @@ def _rank_single_gene(
         
         # Get literature support (REAL PubMed query)
         if include_literature:
-            lit_data = get_literature_support(gene_symbol, taxid)
+            if literature_map and gene_symbol in literature_map:
+                lit_data = literature_map[gene_symbol]
+            else:
+                lit_data = get_literature_support(gene_symbol, taxid)
             literature_score = lit_data.get("literature_score", 0.5)
             pubmed_count = lit_data.get("pubmed_count", 0)
         else:
@@ -445,7 +826,9 @@ def _rank_single_gene(
         
         # Get cross-species validation
         if include_cross_species:
-            cross_species = validate_across_species(gene_symbol, target_go_term)
+            cross_species = validate_across_species(
+                gene_symbol, target_go_term, primary_scoring=scoring, primary_taxid=taxid
+            )
             conservation_score = cross_species.get("conservation_score", 0.0)
             specificity_consistency = cross_species.get("specificity_consistency", 0.0)
         else:
@@ -458,60 +841,54 @@ def _rank_single_gene(
         pleiotropy_score = scoring.get("pleiotropy_score", 5.0)
         bp_term_count = scoring.get("bp_term_count", 0)
         
-        # Calculate COMPOSITE WEIGHTED SCORE
-        composite_score = (
-            specificity_score * 0.40 +
-            evidence_quality * 0.25 +
-            literature_score * 0.20 +
-            conservation_score * 0.15
+        # COMPOSITE WEIGHTED SCORE is computed for all genes at once in rank_genes_by_specificity
+        return GeneRankResult(
+            symbol=gene_symbol,
+            description=gene_info.get("description", ""),
+            entrez_id=gene_info.get("entrez_id", ""),
+            pleiotropy_score=pleiotropy_score,
+            specificity_score=specificity_score,
+            evidence_quality=evidence_quality,
+            literature_score=literature_score,
+            conservation_score=conservation_score,
+            composite_score=0.0,
+            bp_term_count=bp_term_count,
+            other_bp_term_count=scoring.get("other_bp_term_count", 0),
+            experimental_evidence_count=scoring.get("experimental_evidence_count", 0),
+            computational_evidence_count=scoring.get("computational_evidence_count", 0),
+            iea_evidence_count=scoring.get("iea_evidence_count", 0),
+            kegg_pathway_count=scoring.get("kegg_pathway_count", 0),
+            pubmed_count=pubmed_count,
+            specificity_consistency=specificity_consistency,
+            database_sources=scoring.get("database_sources", []),
+            passes_threshold=bp_term_count <= max_pleiotropy_threshold,
+            error=None
         )
         
-        return {
-            "symbol": gene_symbol,
-            "description": gene_info.get("description", ""),
-            "entrez_id": gene_info.get("entrez_id", ""),
-            "pleiotropy_score": pleiotropy_score,
-            "specificity_score": specificity_score,
-            "evidence_quality": evidence_quality,
-            "literature_score": literature_score,
-            "conservation_score": conservation_score,
-            "composite_score": composite_score,
-            "bp_term_count": bp_term_count,
-            "other_bp_term_count": scoring.get("other_bp_term_count", 0),
-            "experimental_evidence_count": scoring.get("experimental_evidence_count", 0),
-            "computational_evidence_count": scoring.get("computational_evidence_count", 0),
-            "iea_evidence_count": scoring.get("iea_evidence_count", 0),
-            "kegg_pathway_count": scoring.get("kegg_pathway_count", 0),
-            "pubmed_count": pubmed_count,
-            "specificity_consistency": specificity_consistency,
-            "database_sources": scoring.get("database_sources", []),
-            "passes_threshold": bp_term_count <= max_pleiotropy_threshold
-        }
-        
     except Exception as e:
-        logger.warning(f"Error ranking gene {gene_symbol}: {e}")
-        return {
-            "symbol": gene_symbol,
-            "description": gene_info.get("description", ""),
-            "entrez_id": gene_info.get("entrez_id", ""),
-            "pleiotropy_score": 5.0,
-            "specificity_score": 0.5,
-            "evidence_quality": 0.5,
-            "literature_score": 0.5,
-            "conservation_score": 0.0,
-            "composite_score": 0.375,
-            "bp_term_count": 0,
-            "other_bp_term_count": 0,
-            "experimental_evidence_count": 0,
-            "computational_evidence_count": 0,
-            "iea_evidence_count": 0,
-            "kegg_pathway_count": 0,
-            "pubmed_count": 0,
-            "specificity_consistency": 0.0,
-            "database_sources": [],
-            "passes_threshold": True,
-            "error": str(e)
-        }
+        logger.warning("Error ranking gene %s: %s", gene_symbol, e)
+        return GeneRankResult(
+            symbol=gene_symbol,
+            description=gene_info.get("description", ""),
+            entrez_id=gene_info.get("entrez_id", ""),
+            pleiotropy_score=5.0,
+            specificity_score=0.5,
+            evidence_quality=0.5,
+            literature_score=0.5,
+            conservation_score=0.0,
+            composite_score=0.375,
+            bp_term_count=0,
+            other_bp_term_count=0,
+            experimental_evidence_count=0,
+            computational_evidence_count=0,
+            iea_evidence_count=0,
+            kegg_pathway_count=0,
+            pubmed_count=0,
+            specificity_consistency=0.0,
+            database_sources=[],
+            passes_threshold=True,
+            error=str(e)
+        )
 
 
 def rank_genes_by_specificity(
@@ -521,7 +898,8 @@ def rank_genes_by_specificity(
     evidence_filter: str = "experimental",
     include_literature: bool = True,
     include_cross_species: bool = True,
-    max_pleiotropy_threshold: int = 10
+    max_pleiotropy_threshold: int = 10,
+    top_k: Optional[int] = None
 ) -> List[Dict]:
     """
     Rank genes by specificity using weighted scoring combining:
@@ -540,19 +918,28 @@ def rank_genes_by_specificity(
         include_literature: Whether to query PubMed (slower but more accurate)
         include_cross_species: Whether to validate across species
         max_pleiotropy_threshold: Maximum BP term threshold (0-10)
+        top_k: Only return the top_k highest-scoring genes (default: all)
         
     Returns:
         Ranked list of genes with comprehensive scoring
     """
-    logger.info(f"Ranking {len(gene_list)} genes by specificity (parallel processing)")
+    logger.info("Ranking %d genes by specificity (parallel processing)", len(gene_list))
+    
+    # Fetch literature support for all genes up front (one query per unique symbol)
+    literature_map = None
+    if include_literature:
+        literature_map = get_literature_support_batch(
+            [gene_info.get("symbol", "") for gene_info in gene_list], taxid
+        )
     
-    ranked_genes = []
+    # Results are slotted by input position so ties keep the input order
+    ranked_slots: List[Optional[GeneRankResult]] = [None] * len(gene_list)
     
-    # Use parallel processing for multiple genes
-    max_workers = min(8, len(gene_list)) if len(gene_list) > 1 else 1
+    # Use parallel processing for multiple genes (IO-bound, so threads are enough)
+    max_workers = max(1, min(MAX_RANKING_WORKERS, len(gene_list)))
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_gene = {
+        future_to_index = {
             executor.submit(
                 _rank_single_gene,
                 gene_info,
@@ -561,25 +948,116 @@ def rank_genes_by_specificity(
                 evidence_filter,
                 include_literature,
                 include_cross_species,
-                max_pleiotropy_threshold
-            ): gene_info
-            for gene_info in gene_list
+                max_pleiotropy_threshold,
+                literature_map
+            ): index
+            for index, gene_info in enumerate(gene_list)
         }
         
-        for future in as_completed(future_to_gene):
+        for future in as_completed(future_to_index):
+            index = future_to_index[future]
             try:
-                result = future.result(timeout=120)  # 2 minute timeout per gene
-                if result:
-                    ranked_genes.append(result)
+                ranked_slots[index] = future.result(timeout=RANKING_TIMEOUT)
             except Exception as e:
-                gene_info = future_to_gene[future]
-                logger.warning(f"Failed to rank gene {gene_info.get('symbol', 'unknown')}: {e}")
+                logger.warning("Failed to rank gene %s: %s", gene_list[index].get("symbol", "unknown"), e)
     
-    # Sort by composite score (DESCENDING - highest specificity first)
-    ranked_genes.sort(key=lambda x: x["composite_score"], reverse=True)
+    return _finalize_ranking(ranked_slots, top_k)
+
+
+async def rank_genes_by_specificity_async(
+    gene_list: List[Dict],
+    taxid: str,
+    target_go_term: str = None,
+    evidence_filter: str = "experimental",
+    include_literature: bool = True,
+    include_cross_species: bool = True,
+    max_pleiotropy_threshold: int = 10,
+    top_k: Optional[int] = None
+) -> List[Dict]:
+    """
+    Asynchronous variant of rank_genes_by_specificity() for callers already running an event loop.
+    
+    Genes run on a dedicated pool of MAX_RANKING_WORKERS threads. An
+    asyncio.Semaphore admits a gene only when a worker is free, and a slot is
+    released when the worker finishes rather than when the per-gene timeout
+    fires, so abandoned lookups still count against the NCBI rate cap.
+    Arguments and return value match rank_genes_by_specificity().
+    """
+    logger.info("Ranking %d genes by specificity (async)", len(gene_list))
+    loop = asyncio.get_running_loop()
+    
+    literature_map = None
+    if include_literature:
+        literature_map = await loop.run_in_executor(
+            None,
+            get_literature_support_batch,
+            [gene_info.get("symbol", "") for gene_info in gene_list],
+            taxid
+        )
+    
+    semaphore = asyncio.Semaphore(MAX_RANKING_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=MAX_RANKING_WORKERS, thread_name_prefix="ksites-rank")
+    
+    async def _rank(gene_info: Dict) -> Optional[GeneRankResult]:
+        await semaphore.acquire()
+        future = loop.run_in_executor(
+            executor,
+            partial(
+                _rank_single_gene,
+                gene_info,
+                taxid,
+                target_go_term,
+                evidence_filter,
+                include_literature,
+                include_cross_species,
+                max_pleiotropy_threshold,
+                literature_map
+            )
+        )
+        # A timed-out thread keeps running, so it keeps its slot until it is done
+        future.add_done_callback(lambda _: semaphore.release())
+        try:
+            # shield() so the timeout does not cancel (and thereby "finish") the future
+            return await asyncio.wait_for(asyncio.shield(future), timeout=RANKING_TIMEOUT)
+        except Exception as e:
+            logger.warning("Failed to rank gene %s: %s", gene_info.get("symbol", "unknown"), e)
+            return None
+    
+    try:
+        ranked_slots = await asyncio.gather(*[_rank(gene_info) for gene_info in gene_list])
+    finally:
+        # Timed-out lookups finish in the background
+        executor.shutdown(wait=False)
+    return _finalize_ranking(ranked_slots, top_k)
+
+
+def _finalize_ranking(ranked_slots: List[Optional[GeneRankResult]], top_k: Optional[int] = None) -> List[Dict]:
+    """Compute composite scores for ranked gene slots, sort them (stable for ties) and convert to dicts."""
+    ranked_genes = [gene for gene in ranked_slots if gene]
+    
+    if ranked_genes:
+        # Calculate COMPOSITE WEIGHTED SCORE for all genes in one matrix product; the
+        # per-gene score columns are the ones score_gene_pleiotropy() already computed
+        score_matrix = np.array(
+            [[getattr(gene, field) for field in COMPOSITE_SCORE_FIELDS] for gene in ranked_genes],
+            dtype=float
+        )
+        # Failed genes keep their fallback composite score
+        failed = np.array([gene.error is not None for gene in ranked_genes])
+        fallback_scores = np.array([gene.composite_score for gene in ranked_genes], dtype=float)
+        composite_scores = np.where(failed, fallback_scores, score_matrix @ COMPOSITE_SCORE_WEIGHTS)
+        for gene, composite_score in zip(ranked_genes, composite_scores.tolist()):
+            gene.composite_score = composite_score
+        
+        # Sort by composite score (DESCENDING - highest specificity first), stable for ties
+        if top_k is not None:
+            ranked_genes = heapq.nlargest(top_k, ranked_genes, key=attrgetter("composite_score"))
+        else:
+            order = np.argsort(-composite_scores, kind="stable")
+            ranked_genes = [ranked_genes[i] for i in order]
     
-    logger.info(f"Ranked {len(ranked_genes)} genes by specificity")
-    return ranked_genes
+    logger.info("Ranked %d genes by specificity", len(ranked_genes))
+    return [gene.to_dict() for gene in ranked_genes]
 
 
 # Legacy function for backward compatibility
@@ -6,81 +6,134 @@ Validates installation, dependencies, and external service connectivity.
 import os
 import sys
 import importlib.util
+import importlib.metadata as importlib_metadata
 import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
-import requests
-from packaging import version
+from typing import List, Tuple, Dict, Any, Sequence
+
+
+# Workspace layout checked by check_filesystem_integrity (paths relative to the repo root)
+_REQUIRED_TOP_LEVEL = ("k_sites", "Sandip_created", "k-sites.yaml")
+
+# Required files in the main package directory
+_REQUIRED_FILES = (
+    "cli.py",
+    "workflow/pipeline.py",
+    "data_retrieval/organism_resolver.py",
+    "data_retrieval/go_gene_mapper.py",
+    "gene_analysis/pleiotropy_scorer.py",
+    "crispr_design/guide_designer.py",
+    "neo4j/graph_client.py",
+    "rag_system/literature_context.py",
+    "reporting/report_generator.py"
+)
+
+# __init__.py files in all subpackages
+_REQUIRED_INITS = (
+    "k_sites/__init__.py",
+    "k_sites/data_retrieval/__init__.py",
+    "k_sites/gene_analysis/__init__.py",
+    "k_sites/crispr_design/__init__.py",
+    "k_sites/neo4j/__init__.py",
+    "k_sites/rag_system/__init__.py",
+    "k_sites/workflow/__init__.py",
+    "k_sites/reporting/__init__.py",
+    "k_sites/config/__init__.py"
+)
+
+_REQUIRED_PACKAGE_PATHS = tuple(f"k_sites/{file_path}" for file_path in _REQUIRED_FILES) + _REQUIRED_INITS
+
+
+def _scan_paths(paths: Sequence[str]) -> Dict[str, os.DirEntry]:
+    """
+    Look up many relative paths with a single os.scandir() per parent directory.
+    
+    Returns:
+        Mapping of each path that exists to its DirEntry
+    """
+    names_by_parent: Dict[str, set] = {}
+    for path in paths:
+        parent, _, name = path.rpartition("/")
+        names_by_parent.setdefault(parent, set()).add(name)
+    
+    found = {}
+    for parent, names in names_by_parent.items():
+        try:
+            with os.scandir(parent or ".") as entries:
+                for entry in entries:
+                    if entry.name in names:
+                        found[f"{parent}/{entry.name}" if parent else entry.name] = entry
+        except OSError:
+            continue  # Missing parent: none of its children exist
+    return found
 
 
 def check_filesystem_integrity() -> Tuple[bool, List[str]]:
     """Check filesystem integrity: required files and directories."""
     errors = []
     
+    # Top-level entries in one directory scan
+    top_level = _scan_paths(_REQUIRED_TOP_LEVEL)
+    
     # Check main package structure
-    k_sites_dir = Path("k_sites")
-    if not k_sites_dir.exists():
+    if "k_sites" not in top_level:
         errors.append("k_sites directory not found")
         return False, errors
     
+    # One scandir per package directory answers every lookup below
+    present = _scan_paths(_REQUIRED_PACKAGE_PATHS)
+    
     # Check required files in main directory
-    required_files = [
-        "cli.py",
-        "workflow/pipeline.py",
-        "data_retrieval/organism_resolver.py",
-        "data_retrieval/go_gene_mapper.py",
-        "gene_analysis/pleiotropy_scorer.py",
-        "crispr_design/guide_designer.py",
-        "neo4j/graph_client.py",
-        "rag_system/literature_context.py",
-        "reporting/report_generator.py"
-    ]
-    
-    for file_path in required_files:
-        full_path = k_sites_dir / file_path
-        if not full_path.exists():
+    for file_path in _REQUIRED_FILES:
+        if f"k_sites/{file_path}" not in present:
             errors.append(f"Missing required file: {file_path}")
     
     # Check for __init__.py files in all subdirectories
-    required_subdirs = [
-        "k_sites/__init__.py",
-        "k_sites/data_retrieval/__init__.py",
-        "k_sites/gene_analysis/__init__.py",
-        "k_sites/crispr_design/__init__.py",
-        "k_sites/neo4j/__init__.py",
-        "k_sites/rag_system/__init__.py",
-        "k_sites/workflow/__init__.py",
-        "k_sites/reporting/__init__.py",
-        "k_sites/config/__init__.py"
-    ]
-    
-    for subdir_init in required_subdirs:
-        if not Path(subdir_init).exists():
+    for subdir_init in _REQUIRED_INITS:
+        if subdir_init not in present:
             errors.append(f"Missing __init__.py: {subdir_init}")
     
     # Check if Sandip_created directory exists
-    if not Path("Sandip_created").exists():
+    if "Sandip_created" not in top_level:
         errors.append("Sandip_created directory not found - original Neo4j files missing")
     
     # Check for example config
-    if not Path("k-sites.yaml").exists():
+    if "k-sites.yaml" not in top_level:
         errors.append("Config template (k-sites.yaml) not found")
     
     return len(errors) == 0, errors
 
 
+# Memoized so repeated health checks in one process skip the import machinery
+_import_module = lru_cache(maxsize=None)(importlib.import_module)
+
+
+@contextmanager
+def _package_root_on_path():
+    """Temporarily put the repository root on sys.path (instead of changing the process cwd)."""
+    root = str(Path(__file__).parent.parent)
+    added = root not in sys.path
+    if added:
+        sys.path.insert(0, root)
+    try:
+        yield
+    finally:
+        if added and root in sys.path:
+            sys.path.remove(root)
+
+
 def check_python_imports() -> Tuple[bool, List[str]]:
     """Check that all modules import cleanly without circular dependencies."""
     errors = []
     
-    # Change to the parent directory to make imports work
-    original_cwd = os.getcwd()
-    os.chdir(Path(__file__).parent.parent)
-    
-    try:
+    # Make the package importable from the repository root
+    with _package_root_on_path():
         # Test main import
         try:
-            import k_sites
+            _import_module("k_sites")
         except ImportError as e:
             errors.append(f"Failed to import k_sites: {e}")
             return False, errors
@@ -99,12 +152,9 @@ def check_python_imports() -> Tuple[bool, List[str]]:
         
         for module_name in modules_to_test:
             try:
-                importlib.import_module(module_name)
+                _import_module(module_name)
             except ImportError as e:
                 errors.append(f"Failed to import {module_name}: {e}")
-        
-    finally:
-        os.chdir(original_cwd)
     
     return len(errors) == 0, errors
 
@@ -126,21 +176,22 @@ def check_dependencies() -> Tuple[bool, List[str], Dict[str, str]]:
     }
     
     for pkg_name, import_name in required_packages.items():
+        # Read the version from installed distribution metadata (no import needed)
         try:
-            module = importlib.import_module(import_name)
-            # Try to get version
-            if hasattr(module, '__version__'):
-                ver = module.__version__
-            elif hasattr(module, '__VERSION__'):
-                ver = module.__VERSION__
-            else:
-                ver = "unknown"
-            
-            versions[pkg_name] = str(ver)
-        except ImportError:
+            versions[pkg_name] = importlib_metadata.version(pkg_name)
+            continue
+        except importlib_metadata.PackageNotFoundError:
+            pass
+        
+        # Importable without dist-info (e.g. a source checkout on sys.path)
+        if importlib.util.find_spec(import_name) is not None:
+            versions[pkg_name] = "unknown"
+        else:
             errors.append(f"Package {pkg_name} not installed")
     
     # Check version compatibility
+    from packaging import version
+    
     if "biopython" in versions:
         bio_ver = versions["biopython"]
         try:
@@ -160,66 +211,103 @@ def check_dependencies() -> Tuple[bool, List[str], Dict[str, str]]:
     return len(errors) == 0, errors, versions
 
 
-def check_external_services() -> Dict[str, Any]:
-    """Check reachability of external services (non-blocking)."""
-    results = {}
-    
-    # Check NCBI E-Utils
-    try:
-        response = requests.head(
-            "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/",
-            timeout=5
+@lru_cache(maxsize=1)
+def _get_session() -> "requests.Session":
+    """
+    Return the shared keep-alive session with connection pooling and retries.
+    
+    Built on first use so importing the health check does not load requests.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD")
         )
-        results["ncbi"] = {
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Overall budget for all external service probes (they run concurrently)
+SERVICE_CHECK_TIMEOUT = 10
+
+# (connect, read) timeout per HTTP probe so unreachable hosts fail fast
+HTTP_PROBE_TIMEOUT = (2, 3)
+
+
+def _probe_http(name: str, url: str) -> Tuple[str, Dict[str, Any]]:
+    """Probe an HTTP service with a HEAD request (any non-5xx answer counts as reachable)."""
+    try:
+        response = _get_session().head(url, timeout=HTTP_PROBE_TIMEOUT, allow_redirects=False)
+        return name, {
             "reachable": response.status_code < 500,
             "status_code": response.status_code
         }
     except Exception as e:
-        results["ncbi"] = {
+        return name, {
             "reachable": False,
             "error": str(e)
         }
-    
-    # Check QuickGO
+
+
+def _probe_ncbi() -> Tuple[str, Dict[str, Any]]:
+    """Check NCBI E-Utils."""
+    return _probe_http("ncbi", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/")
+
+
+def _probe_quickgo() -> Tuple[str, Dict[str, Any]]:
+    """Check QuickGO."""
+    return _probe_http("quickgo", "https://www.ebi.ac.uk/QuickGO/services/")
+
+
+def _probe_neo4j() -> Tuple[str, Dict[str, Any]]:
+    """Check Neo4j reachability (connectivity only, no query) on the shared graph client driver."""
     try:
-        response = requests.head(
-            "https://www.ebi.ac.uk/QuickGO/services/",
-            timeout=5
-        )
-        results["quickgo"] = {
-            "reachable": response.status_code < 500,
-            "status_code": response.status_code
+        from k_sites.neo4j.graph_client import get_graph_client
+        client = get_graph_client()
+        client.driver.verify_connectivity()
+        return "neo4j", {
+            "reachable": True,
+            "connected": True
         }
     except Exception as e:
-        results["quickgo"] = {
+        return "neo4j", {
             "reachable": False,
             "error": str(e)
         }
+
+
+def check_external_services() -> Dict[str, Any]:
+    """Check reachability of external services (non-blocking, probes run concurrently)."""
+    results = {}
+    probes = (_probe_ncbi, _probe_quickgo, _probe_neo4j)
     
-    # Check Neo4j
+    executor = ThreadPoolExecutor(max_workers=len(probes))
     try:
-        from neo4j import GraphDatabase
-        driver = GraphDatabase.driver(
-            "bolt://localhost:7687",
-            auth=("neo4j", os.getenv("NEO4J_PASSWORD", "kkokay07")),
-            max_connection_lifetime=30  # Short lifetime for health check
-        )
-        
-        # Test connection with timeout
-        with driver.session() as session:
-            result = session.run("RETURN 1", timeout=2)
-            record = result.single()
-            results["neo4j"] = {
-                "reachable": record is not None,
-                "connected": True
-            }
-        
-        driver.close()
-    except Exception as e:
-        results["neo4j"] = {
+        futures = [executor.submit(probe) for probe in probes]
+        for future in as_completed(futures, timeout=SERVICE_CHECK_TIMEOUT):
+            name, result = future.result()
+            results[name] = result
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # Don't wait on a probe that is still hanging past the overall budget
+        executor.shutdown(wait=False)
+    
+    for name in ("ncbi", "quickgo", "neo4j"):
+        results.setdefault(name, {
             "reachable": False,
-            "error": str(e)
-        }
+            "error": f"timed out after {SERVICE_CHECK_TIMEOUT}s"
+        })
     
     return results
 
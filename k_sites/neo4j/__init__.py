@@ -6,14 +6,28 @@ the Neo4j graph database containing KEGG pathway information.
 """
 
 # Initialize Neo4j connection components
-from .graph_client import get_graph_client, get_pathway_neighbors, close_graph_client, GraphClient
-from .ingest_kegg import ingest_kegg_organism
+from .graph_client import (
+    get_graph_client,
+    get_pathway_neighbors,
+    get_pathway_neighbors_batch,
+    close_graph_client,
+    GraphClient,
+)
 
 __version__ = "1.0.0"
 __all__ = [
     "get_graph_client",
     "get_pathway_neighbors",
+    "get_pathway_neighbors_batch",
     "close_graph_client",
     "GraphClient",
     "ingest_kegg_organism"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # KEGG ingestion is only needed by the ingest CLI; import it on first access
+    if name == "ingest_kegg_organism":
+        from .ingest_kegg import ingest_kegg_organism
+        return ingest_kegg_organism
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,18 +6,137 @@ containing KEGG pathway information, integrating Sandip's KEGG-to-Neo4j logic
 into the K-Sites pipeline.
 """
 
+import atexit
 import os
 import logging
+import random
+import threading
 import time
-from typing import List, Dict, Optional
-from neo4j import GraphDatabase
-from neo4j.exceptions import ServiceUnavailable, AuthError
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Any, Callable, List, Dict, Mapping, Optional, Tuple
+from neo4j import GraphDatabase, Result
+from neo4j.exceptions import ServiceUnavailable, AuthError, TransientError
+
+# Driver-managed queries (pooled sessions + built-in retries) need neo4j >= 5.8
+try:
+    from neo4j import Driver, RoutingControl
+    EXECUTE_QUERY_AVAILABLE = hasattr(Driver, "execute_query")
+except ImportError:
+    RoutingControl = None
+    EXECUTE_QUERY_AVAILABLE = False
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+def _build_session() -> requests.Session:
+    """Create a keep-alive session with connection pooling and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD")
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared across calls so repeated requests reuse keep-alive connections
+_session = _build_session()
+
+NCBI_EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+# Gene symbols per bulk E-utilities request (keeps the esearch term a sane size)
+NCBI_BULK_RESOLVE_CHUNK = 200
+
+# Common mappings from NCBI TaxID to KEGG organism codes (read-only)
+TAXID_TO_KEGG = MappingProxyType({
+    "9606": "hsa",  # Homo sapiens
+    "10090": "mmu",  # Mus musculus
+    "10116": "rno",  # Rattus norvegicus
+    "7227": "dme",   # Drosophila melanogaster
+    "6239": "cel",   # Caenorhabditis elegans
+    "7955": "dre",   # Danio rerio
+    "4932": "sce",   # Saccharomyces cerevisiae
+    "3702": "ath",   # Arabidopsis thaliana
+})
+
+# Memoized lookups per (gene_symbol, organism_taxid)
+GENE_RESOLUTION_CACHE_SIZE = 16384
+GENE_RESOLUTION_CACHE_TTL = 86400  # seconds
+# Failed NCBI lookups are remembered briefly so a bad symbol isn't retried on every call
+FAILED_RESOLUTION_CACHE_SIZE = 4096
+FAILED_RESOLUTION_CACHE_TTL = 300  # seconds
+PATHWAY_NEIGHBOR_CACHE_SIZE = 4096
+PATHWAY_NEIGHBOR_CACHE_TTL = 3600  # seconds
+
+# Manual retry backoff for drivers without execute_query (seconds)
+RETRY_BACKOFF_BASE = 0.2
+RETRY_BACKOFF_MAX = 4.0
+
+# Cypher is kept in constants so every call sends an identical string and hits
+# the server's query plan cache. Input genes are found with a UNION of two
+# single-property lookups rather than `g.id = x OR g.entrez_id = x`, so the planner
+# can use an index seek on each of :Gene(id) and :Gene(entrez_id) (backed by the
+# uniqueness constraints ingest_kegg creates)
+
+# Genes sharing a pathway with any of $gene_ids (graph ID or Entrez ID)
+_NEIGHBOR_QUERY = """
+CALL {
+    MATCH (g:Gene) WHERE g.id IN $gene_ids RETURN g
+    UNION
+    MATCH (g:Gene) WHERE g.entrez_id IN $gene_ids RETURN g
+}
+MATCH (o:Organism {id: $organism_taxid})-[:HAS_PATHWAY]->(p:Pathway)<-[:HAS_GENE]-(g)
+WITH DISTINCT p
+MATCH (p)<-[:HAS_GENE]-(neighbor_gene:Gene)
+WHERE NOT neighbor_gene.id IN $gene_ids AND NOT neighbor_gene.entrez_id IN $gene_ids
+RETURN DISTINCT neighbor_gene.id AS gene_symbol
+"""
+
+# Pathway neighbors for each of $gene_ids separately
+_NEIGHBOR_BATCH_QUERY = """
+UNWIND $gene_ids AS gene_id
+CALL {
+    WITH gene_id MATCH (g:Gene {id: gene_id}) RETURN g
+    UNION
+    WITH gene_id MATCH (g:Gene {entrez_id: gene_id}) RETURN g
+}
+MATCH (o:Organism {id: $organism_taxid})-[:HAS_PATHWAY]->(p:Pathway)<-[:HAS_GENE]-(g)
+WITH DISTINCT gene_id, p
+MATCH (p)<-[:HAS_GENE]-(neighbor_gene:Gene)
+WHERE neighbor_gene.id <> gene_id AND neighbor_gene.entrez_id <> gene_id
+RETURN gene_id, collect(DISTINCT neighbor_gene.id) AS neighbors
+"""
+
+_CONNECTION_TEST_QUERY = "RETURN 1 AS test"
+
+
+@lru_cache(maxsize=1)
+def _connection_config() -> Mapping[str, str]:
+    """
+    Read the Neo4j connection settings from the environment once.
+    
+    Returns:
+        Read-only mapping with uri, user, password and database
+    """
+    return MappingProxyType({
+        'uri': os.getenv('NEO4J_URI', 'bolt://localhost:7687'),
+        'user': os.getenv('NEO4J_USER', 'neo4j'),
+        'password': os.getenv('NEO4J_PASSWORD', 'kkokay07'),
+        'database': os.getenv('NEO4J_DATABASE', 'neo4j'),
+    })
+
+
 class GraphClient:
     """
     Client for interacting with the Neo4j graph database containing KEGG pathway data.
@@ -27,9 +146,11 @@ class GraphClient:
         """
         Initialize the GraphClient with connection parameters from environment variables.
         """
-        self.uri = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
-        self.user = os.getenv('NEO4J_USER', 'neo4j')
-        self.password = os.getenv('NEO4J_PASSWORD', 'kkokay07')
+        config = _connection_config()
+        self.uri = config['uri']
+        self.user = config['user']
+        self.password = config['password']
+        self.database = config['database']
         
         # Initialize driver with connection pooling
         self.driver = GraphDatabase.driver(
@@ -38,9 +159,16 @@ class GraphClient:
             max_connection_lifetime=3600,
             max_connection_pool_size=10,
             connection_timeout=10,
-            max_retry_time=5
+            max_transaction_retry_time=5
         )
         
+        # Per-client caches: (gene_symbol, organism_taxid) -> (timestamp, resolved id) /
+        # failure timestamp / (timestamp, neighbors)
+        self._resolved_ids: Dict[tuple, tuple] = {}
+        self._failed_resolutions: Dict[tuple, float] = {}
+        self._neighbor_cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+        
         logger.info(f"Initialized Neo4j driver for {self.uri}")
 
     def close(self):
@@ -51,30 +179,61 @@ class GraphClient:
             self.driver.close()
             logger.info("Closed Neo4j driver connection")
 
-    def _run_query_with_retry(self, query: str, parameters: Optional[Dict] = None, max_retries: int = 2) -> List[Dict]:
+    def clear_cache(self):
         """
-        Run a Neo4j query with retry logic.
+        Clear memoized gene resolutions and pathway neighbors.
+        """
+        with self._cache_lock:
+            self._resolved_ids.clear()
+            self._failed_resolutions.clear()
+            self._neighbor_cache.clear()
+
+    def _run_query_with_retry(self, query: str, parameters: Optional[Dict] = None, max_retries: int = 2,
+                              result_transformer: Optional[Callable[[Result], Any]] = None) -> Any:
+        """
+        Run a read-only Neo4j query with retry logic.
+        
+        Uses driver.execute_query() when available, which reuses pooled sessions
+        and retries transient failures itself; older drivers fall back to a
+        manual session-per-attempt retry loop.
         
         Args:
             query: Cypher query to execute
             parameters: Parameters for the query
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of retry attempts (manual fallback only)
+            result_transformer: Consumes the open Result inside the transaction;
+                defaults to building one dict per record
             
         Returns:
-            List of records from the query
+            Output of result_transformer (list of record dicts by default)
         """
+        if result_transformer is None:
+            result_transformer = Result.data
+        
+        if EXECUTE_QUERY_AVAILABLE:
+            return self.driver.execute_query(
+                query,
+                parameters or {},
+                database_=self.database,
+                routing_=RoutingControl.READ,
+                result_transformer_=result_transformer
+            )
+        
         last_exception = None
         
         for attempt in range(max_retries + 1):
             try:
-                with self.driver.session() as session:
-                    result = session.run(query, parameters or {})
-                    return [record.data() for record in result]
-            except (ServiceUnavailable, AuthError) as e:
+                with self.driver.session(database=self.database) as session:
+                    return result_transformer(session.run(query, parameters or {}))
+            except AuthError:
+                # Bad credentials won't fix themselves; fail without retrying
+                raise
+            except (ServiceUnavailable, TransientError) as e:
                 last_exception = e
                 if attempt < max_retries:
-                    wait_time = (attempt + 1)  # 1s, 2s backoff
-                    logger.warning(f"Neo4j query failed (attempt {attempt + 1}/{max_retries + 1}), retrying in {wait_time}s: {str(e)}")
+                    # Exponential backoff with jitter so parallel callers don't reconnect in lockstep
+                    wait_time = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)) * (0.5 + random.random())
+                    logger.warning(f"Neo4j query failed (attempt {attempt + 1}/{max_retries + 1}), retrying in {wait_time:.2f}s: {str(e)}")
                     time.sleep(wait_time)
                 else:
                     logger.error(f"Neo4j query failed after {max_retries + 1} attempts: {str(e)}")
@@ -85,6 +244,25 @@ class GraphClient:
         # If we exhausted retries, raise the last exception
         raise last_exception
 
+    def _run_query_values(self, query: str, parameters: Optional[Dict], key: str) -> List[Any]:
+        """
+        Run a read-only query and pull a single column as the records stream in.
+        
+        Avoids building a dict per record when only one field is needed.
+        
+        Args:
+            query: Cypher query to execute
+            parameters: Parameters for the query
+            key: Column to extract
+            
+        Returns:
+            List of non-null values of the column
+        """
+        def values(result: Result) -> List[Any]:
+            return [value for value in (record[key] for record in result) if value]
+        
+        return self._run_query_with_retry(query, parameters, result_transformer=values)
+
     def get_pathway_neighbors(self, gene_symbol: str, organism_taxid: str) -> List[str]:
         """
         Get genes in the same pathways as the given gene symbol for the specified organism.
@@ -96,34 +274,144 @@ class GraphClient:
         Returns:
             List of gene symbols in the same pathways as the input gene
         """
+        cache_key = (gene_symbol, organism_taxid)
+        with self._cache_lock:
+            cached = self._neighbor_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < PATHWAY_NEIGHBOR_CACHE_TTL:
+            return list(cached[1])
+        
         try:
-            # First resolve gene symbol to Entrez ID if needed
-            entrez_id = self._resolve_gene_symbol(gene_symbol, organism_taxid)
+            # The KEGG-style graph ID is tried first; the neighbor query itself tells us
+            # whether the gene is in the graph, so no separate existence probe is needed
+            neighbors = []
+            kegg_org_code = self._map_taxid_to_kegg(organism_taxid)
+            if kegg_org_code:
+                neighbors = self._query_neighbors([f"{kegg_org_code}:{gene_symbol}"], organism_taxid)
             
-            # Query to find genes in the same pathways as the input gene
-            query = """
-            MATCH (o:Organism {id: $organism_taxid})-[:HAS_PATHWAY]->(p:Pathway)<-[:HAS_GENE]-(g:Gene)
-            WHERE g.id = $gene_id OR g.entrez_id = $gene_id
-            WITH p
-            MATCH (p)<-[:HAS_GENE]-(neighbor_gene:Gene)
-            WHERE neighbor_gene.id <> $gene_id AND neighbor_gene.entrez_id <> $gene_id
-            RETURN DISTINCT neighbor_gene.id AS gene_symbol
-            """
-            
-            # Try both the original gene ID and the resolved Entrez ID
-            parameters = {"gene_id": entrez_id, "organism_taxid": organism_taxid}
-            results = self._run_query_with_retry(query, parameters)
-            
-            # Extract gene symbols from results
-            neighbors = [record["gene_symbol"] for record in results if record["gene_symbol"]]
+            if not neighbors:
+                # Fall back to the NCBI-resolved Entrez ID (or the symbol itself)
+                entrez_id = self._resolve_gene_symbol(gene_symbol, organism_taxid)
+                neighbors = self._query_neighbors([entrez_id], organism_taxid)
             
             logger.info(f"Found {len(neighbors)} pathway neighbors for gene {gene_symbol}")
+            
+            # Only successful queries are cached so transient failures are retried
+            self._cache_neighbors(cache_key, neighbors)
             return neighbors
             
         except Exception as e:
             logger.warning(f"Could not retrieve pathway neighbors for gene {gene_symbol} in organism {organism_taxid}: {str(e)}")
             return []
 
+    def get_pathway_neighbors_batch(self, gene_symbols: List[str], organism_taxid: str) -> Dict[str, List[str]]:
+        """
+        Get pathway neighbors for many genes with batched UNWIND queries.
+        
+        Args:
+            gene_symbols: Gene symbols (resolved to Entrez IDs if needed)
+            organism_taxid: NCBI Taxonomy ID for the organism
+            
+        Returns:
+            Dictionary mapping each gene symbol to the gene symbols in its pathways
+        """
+        results = {}
+        pending = []
+        now = time.monotonic()
+        with self._cache_lock:
+            for gene_symbol in dict.fromkeys(symbol for symbol in gene_symbols if symbol):
+                cached = self._neighbor_cache.get((gene_symbol, organism_taxid))
+                if cached is not None and now - cached[0] < PATHWAY_NEIGHBOR_CACHE_TTL:
+                    results[gene_symbol] = list(cached[1])
+                else:
+                    pending.append(gene_symbol)
+        
+        if not pending:
+            return results
+        
+        try:
+            neighbors_by_symbol = {}
+            kegg_org_code = self._map_taxid_to_kegg(organism_taxid)
+            if kegg_org_code:
+                kegg_ids = {f"{kegg_org_code}:{gene_symbol}": gene_symbol for gene_symbol in pending}
+                for gene_id, neighbors in self._query_neighbors_batch(list(kegg_ids), organism_taxid).items():
+                    if neighbors:
+                        neighbors_by_symbol[kegg_ids[gene_id]] = neighbors
+            
+            # Genes not found under their KEGG ID fall back to NCBI-resolved Entrez IDs
+            missing = [gene_symbol for gene_symbol in pending if gene_symbol not in neighbors_by_symbol]
+            if missing:
+                entrez_ids = self._resolve_gene_symbols_bulk(missing, organism_taxid)
+                neighbors_by_id = self._query_neighbors_batch(list(set(entrez_ids.values())), organism_taxid)
+                for gene_symbol in missing:
+                    neighbors_by_symbol[gene_symbol] = neighbors_by_id.get(entrez_ids[gene_symbol], [])
+            
+            for gene_symbol in pending:
+                neighbors = neighbors_by_symbol[gene_symbol]
+                self._cache_neighbors((gene_symbol, organism_taxid), neighbors)
+                results[gene_symbol] = neighbors
+            
+            logger.info(f"Found pathway neighbors for {len(pending)} genes in one batch")
+            
+        except Exception as e:
+            logger.warning(f"Could not retrieve pathway neighbors for {len(pending)} genes in organism {organism_taxid}: {str(e)}")
+            for gene_symbol in pending:
+                results[gene_symbol] = []
+        
+        return results
+
+    def _cache_neighbors(self, cache_key: tuple, neighbors: List[str]) -> None:
+        """Store pathway neighbors in the TTL cache."""
+        with self._cache_lock:
+            self._neighbor_cache.pop(cache_key, None)
+            if len(self._neighbor_cache) >= PATHWAY_NEIGHBOR_CACHE_SIZE:
+                self._neighbor_cache.pop(next(iter(self._neighbor_cache)))  # Evict oldest entry
+            self._neighbor_cache[cache_key] = (time.monotonic(), tuple(neighbors))
+
+    def _cache_resolved_id(self, cache_key: tuple, resolved_id: str) -> None:
+        """Store a resolved gene ID in the TTL cache."""
+        with self._cache_lock:
+            self._failed_resolutions.pop(cache_key, None)
+            self._resolved_ids.pop(cache_key, None)
+            if len(self._resolved_ids) >= GENE_RESOLUTION_CACHE_SIZE:
+                self._resolved_ids.pop(next(iter(self._resolved_ids)))  # Evict oldest entry
+            self._resolved_ids[cache_key] = (time.monotonic(), resolved_id)
+
+    def _cache_failed_resolution(self, cache_key: tuple) -> None:
+        """Remember a failed gene ID lookup for a short while."""
+        with self._cache_lock:
+            self._failed_resolutions.pop(cache_key, None)
+            if len(self._failed_resolutions) >= FAILED_RESOLUTION_CACHE_SIZE:
+                self._failed_resolutions.pop(next(iter(self._failed_resolutions)))  # Evict oldest entry
+            self._failed_resolutions[cache_key] = time.monotonic()
+
+    def _query_neighbors(self, gene_ids: List[str], organism_taxid: str) -> List[str]:
+        """
+        Query genes sharing a pathway with any of the given IDs (graph ID or Entrez ID).
+        
+        Returns:
+            List of neighbor gene IDs (empty if the gene is not in the graph)
+        """
+        return self._run_query_values(_NEIGHBOR_QUERY, {"gene_ids": gene_ids, "organism_taxid": organism_taxid}, "gene_symbol")
+
+    def _query_neighbors_batch(self, gene_ids: List[str], organism_taxid: str) -> Dict[str, List[str]]:
+        """
+        Query pathway neighbors for many gene IDs in one UNWIND query.
+        
+        Returns:
+            Dictionary mapping each gene ID found in the graph to its neighbor gene IDs
+        """
+        def neighbors_by_id(result: Result) -> Dict[str, List[str]]:
+            return {
+                record["gene_id"]: [neighbor for neighbor in record["neighbors"] if neighbor]
+                for record in result
+            }
+        
+        return self._run_query_with_retry(
+            _NEIGHBOR_BATCH_QUERY,
+            {"gene_ids": gene_ids, "organism_taxid": organism_taxid},
+            result_transformer=neighbors_by_id
+        )
+
     def _resolve_gene_symbol(self, gene_symbol: str, organism_taxid: str) -> str:
         """
         Resolve a gene symbol to an Entrez ID using NCBI services.
@@ -135,29 +423,125 @@ class GraphClient:
         Returns:
             Resolved gene ID (either Entrez ID or original symbol if not found)
         """
-        # First, try to map organism taxid to KEGG organism code
-        kegg_org_code = self._map_taxid_to_kegg(organism_taxid)
+        cache_key = (gene_symbol, organism_taxid)
+        with self._cache_lock:
+            cached = self._resolved_ids.get(cache_key)
+            failed_at = self._failed_resolutions.get(cache_key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < GENE_RESOLUTION_CACHE_TTL:
+            return cached[1]
+        if failed_at is not None and now - failed_at < FAILED_RESOLUTION_CACHE_TTL:
+            return gene_symbol  # Recent lookup failed; skip the round-trip
+        
+        resolved_id, cacheable = self._resolve_via_ncbi(gene_symbol, organism_taxid)
+        if cacheable:
+            self._cache_resolved_id(cache_key, resolved_id)
+        else:
+            self._cache_failed_resolution(cache_key)
+        return resolved_id
+
+    def _resolve_gene_symbols_bulk(self, gene_symbols: List[str], organism_taxid: str) -> Dict[str, str]:
+        """
+        Resolve many gene symbols to Entrez IDs with batched NCBI requests.
+        
+        Uncached symbols are looked up with one esearch + esummary round-trip per
+        chunk, which warms the resolution cache; symbols the bulk lookup can't
+        match by official name (e.g. aliases) fall back to the single-symbol path.
         
-        if kegg_org_code:
-            # Try to find the gene in the KEGG database first
-            kegg_gene_id = f"{kegg_org_code}:{gene_symbol}"
+        Args:
+            gene_symbols: Gene symbols to resolve
+            organism_taxid: NCBI Taxonomy ID for the organism
             
-            # Check if this gene exists in our Neo4j database
-            check_query = """
-            MATCH (g:Gene {id: $gene_id})
-            RETURN g
-            """
-            try:
-                result = self._run_query_with_retry(check_query, {"gene_id": kegg_gene_id})
-                if result:
-                    return kegg_gene_id
-            except:
-                pass  # Continue to NCBI lookup if Neo4j check fails
+        Returns:
+            Dictionary mapping each gene symbol to its Entrez ID (or the symbol itself if not found)
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            uncached = []
+            for gene_symbol in dict.fromkeys(gene_symbols):
+                cached = self._resolved_ids.get((gene_symbol, organism_taxid))
+                failed_at = self._failed_resolutions.get((gene_symbol, organism_taxid))
+                if cached is not None and now - cached[0] < GENE_RESOLUTION_CACHE_TTL:
+                    continue
+                if failed_at is not None and now - failed_at < FAILED_RESOLUTION_CACHE_TTL:
+                    continue
+                uncached.append(gene_symbol)
+        
+        # Only worth a bulk request when it replaces several single lookups
+        if len(uncached) > 1:
+            for start in range(0, len(uncached), NCBI_BULK_RESOLVE_CHUNK):
+                chunk = uncached[start:start + NCBI_BULK_RESOLVE_CHUNK]
+                try:
+                    resolved = self._resolve_bulk_via_ncbi(chunk, organism_taxid)
+                except Exception as e:
+                    logger.debug(f"Bulk NCBI resolution failed for {len(chunk)} genes: {str(e)}")
+                    continue
+                for gene_symbol, entrez_id in resolved.items():
+                    self._cache_resolved_id((gene_symbol, organism_taxid), entrez_id)
+        
+        return {gene_symbol: self._resolve_gene_symbol(gene_symbol, organism_taxid) for gene_symbol in gene_symbols}
+
+    def _resolve_bulk_via_ncbi(self, gene_symbols: List[str], organism_taxid: str) -> Dict[str, str]:
+        """
+        Resolve a chunk of gene symbols with one esearch (history server) and one esummary call.
+        
+        Returns:
+            Dictionary mapping each symbol matched by official gene name to its Entrez ID
+        """
+        term = " OR ".join(f"{gene_symbol}[Gene Name]" for gene_symbol in gene_symbols)
+        search_response = _session.post(
+            f"{NCBI_EUTILS_URL}/esearch.fcgi",
+            data={
+                "db": "gene",
+                "term": f"({term}) AND {organism_taxid}[Organism]",
+                "usehistory": "y",
+                "retmax": 0,
+                "retmode": "json"
+            },
+            timeout=10
+        )
+        search_response.raise_for_status()
+        search_result = search_response.json()["esearchresult"]
+        count = int(search_result.get("count", 0))
+        if not count:
+            return {}
+        
+        summary_response = _session.post(
+            f"{NCBI_EUTILS_URL}/esummary.fcgi",
+            data={
+                "db": "gene",
+                "WebEnv": search_result["webenv"],
+                "query_key": search_result["querykey"],
+                "retmax": min(count, 10000),
+                "retmode": "json"
+            },
+            timeout=30
+        )
+        summary_response.raise_for_status()
+        summary = summary_response.json().get("result", {})
+        
+        # Records come back in search order, so the first official-name match wins
+        # (mirrors retmax=1 in the single-symbol lookup)
+        wanted = {gene_symbol.upper(): gene_symbol for gene_symbol in gene_symbols}
+        resolved = {}
+        for uid in summary.get("uids", []):
+            gene_symbol = wanted.get(str(summary.get(uid, {}).get("name", "")).upper())
+            if gene_symbol is not None and gene_symbol not in resolved:
+                resolved[gene_symbol] = uid
+        
+        logger.debug(f"Bulk-resolved {len(resolved)}/{len(gene_symbols)} gene symbols via NCBI")
+        return resolved
+
+    def _resolve_via_ncbi(self, gene_symbol: str, organism_taxid: str) -> Tuple[str, bool]:
+        """
+        Resolve a gene symbol to an Entrez ID with NCBI E-utilities.
         
-        # Fall back to NCBI Entrez for gene symbol resolution
+        Returns:
+            Tuple of (Entrez ID or the original symbol, whether the answer may be cached)
+        """
         try:
             # Use NCBI E-utilities to resolve gene symbol
-            base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+            base_url = f"{NCBI_EUTILS_URL}/esearch.fcgi"
             params = {
                 "db": "gene",
                 "term": f"{gene_symbol}[Gene Name] AND {organism_taxid}[Organism]",
@@ -165,7 +549,7 @@ class GraphClient:
                 "retmode": "json"
             }
             
-            response = requests.get(base_url, params=params, timeout=10)
+            response = _session.get(base_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -174,14 +558,15 @@ class GraphClient:
                 if id_list:
                     entrez_id = id_list[0]
                     logger.debug(f"Resolved {gene_symbol} to Entrez ID {entrez_id}")
-                    return entrez_id
+                    return entrez_id, True
                     
         except Exception as e:
             logger.debug(f"Could not resolve {gene_symbol} via NCBI: {str(e)}")
+            return gene_symbol, False
         
         # If all else fails, return the original symbol
         logger.debug(f"Returning original gene symbol {gene_symbol} as-is")
-        return gene_symbol
+        return gene_symbol, True
 
     def _map_taxid_to_kegg(self, taxid: str) -> Optional[str]:
         """
@@ -193,19 +578,7 @@ class GraphClient:
         Returns:
             KEGG organism code if found, None otherwise
         """
-        # Common mappings from NCBI TaxID to KEGG organism codes
-        taxid_to_kegg = {
-            "9606": "hsa",  # Homo sapiens
-            "10090": "mmu",  # Mus musculus
-            "10116": "rno",  # Rattus norvegicus
-            "7227": "dme",   # Drosophila melanogaster
-            "6239": "cel",   # Caenorhabditis elegans
-            "7955": "dre",   # Danio rerio
-            "4932": "sce",   # Saccharomyces cerevisiae
-            "3702": "ath",   # Arabidopsis thaliana
-        }
-        
-        return taxid_to_kegg.get(taxid)
+        return TAXID_TO_KEGG.get(taxid)
 
     def test_connection(self) -> bool:
         """
@@ -217,7 +590,7 @@ class GraphClient:
         try:
             # Run a simple test query
             with self.driver.session() as session:
-                result = session.run("RETURN 1 AS test")
+                result = session.run(_CONNECTION_TEST_QUERY)
                 record = result.single()
                 return record is not None and record["test"] == 1
         except Exception as e:
@@ -225,8 +598,9 @@ class GraphClient:
             return False
 
 
-# Global client instance
+# Global client instance (created once, even with concurrent first callers)
 _graph_client = None
+_graph_client_lock = threading.Lock()
 
 
 def get_graph_client() -> GraphClient:
@@ -238,7 +612,9 @@ def get_graph_client() -> GraphClient:
     """
     global _graph_client
     if _graph_client is None:
-        _graph_client = GraphClient()
+        with _graph_client_lock:
+            if _graph_client is None:
+                _graph_client = GraphClient()
     return _graph_client
 
 
@@ -257,11 +633,31 @@ def get_pathway_neighbors(gene_symbol: str, organism_taxid: str) -> List[str]:
     return client.get_pathway_neighbors(gene_symbol, organism_taxid)
 
 
+def get_pathway_neighbors_batch(gene_symbols: List[str], organism_taxid: str) -> Dict[str, List[str]]:
+    """
+    Get pathway neighbors for many genes with batched UNWIND queries.
+    
+    Args:
+        gene_symbols: Gene symbols (resolved to Entrez IDs if needed)
+        organism_taxid: NCBI Taxonomy ID for the organism
+        
+    Returns:
+        Dictionary mapping each gene symbol to the gene symbols in its pathways
+    """
+    client = get_graph_client()
+    return client.get_pathway_neighbors_batch(gene_symbols, organism_taxid)
+
+
 def close_graph_client():
     """
     Close the global graph client connection.
     """
     global _graph_client
-    if _graph_client:
-        _graph_client.close()
-        _graph_client = None
\ No newline at end of file
+    with _graph_client_lock:
+        if _graph_client:
+            _graph_client.close()
+            _graph_client = None
+
+
+# Close the driver's pooled connections on interpreter shutdown
+atexit.register(close_graph_client)
\ No newline at end of file
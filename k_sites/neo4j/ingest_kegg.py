@@ -6,16 +6,57 @@ Follows production hardening practices as per OpenClaw conventions.
 """
 
 import argparse
+import csv
+import hashlib
 import json
 import logging
 import os
+import random
+import shutil
+import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from urllib.parse import urlparse
+from typing import Dict, Final, Iterable, Iterator, List, Mapping, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from neo4j import GraphDatabase
-from neo4j.exceptions import ServiceUnavailable
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+# Driver-managed queries (pooled sessions + built-in retries) need neo4j >= 5.8
+try:
+    from neo4j import Driver, RoutingControl
+    EXECUTE_QUERY_AVAILABLE = hasattr(Driver, "execute_query")
+except ImportError:
+    RoutingControl = None
+    EXECUTE_QUERY_AVAILABLE = False
+
+# Optional fast JSON (de)serialization for checkpoints
+try:
+    import orjson
+    
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+    
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    def _json_dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    
+    def _json_dumps_line(obj) -> bytes:
+        return (json.dumps(obj) + "\n").encode("utf-8")
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,6 +68,97 @@ class KeggIngestionError(Exception):
     pass
 
 
+# Retry policy for KEGG requests (429 responses honor Retry-After)
+KEGG_MAX_RETRIES = 5
+KEGG_RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+KEGG_RETRY_JITTER = 0.5   # up to +50% random spread per backoff
+
+
+class _JitteredRetry(Retry):
+    """Exponential backoff spread by random jitter so concurrent workers don't retry in lockstep."""
+    
+    def get_backoff_time(self) -> float:
+        return super().get_backoff_time() * (1 + random.random() * KEGG_RETRY_JITTER)
+
+
+def _build_session() -> requests.Session:
+    """
+    Build a keep-alive HTTP session for KEGG requests with retries on the adapter.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=_JitteredRetry(
+            total=KEGG_MAX_RETRIES,
+            backoff_factor=KEGG_RETRY_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared across requests (and ingests) so KEGG calls reuse TLS connections
+_session = _build_session()
+
+
+class _RateLimiter:
+    """
+    Thread-safe rate limiter shared by all workers.
+    
+    Spaces calls at least 1/rate_per_sec apart and only sleeps for the
+    remaining gap, so a request that follows a slow one is not delayed.
+    """
+    
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until the caller may issue its request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Concurrent per-pathway gene fetches during ingestion
+KEGG_FETCH_WORKERS = 8
+
+# How long cached KEGG REST responses are reused (seconds)
+KEGG_HTTP_CACHE_TTL = 30 * 24 * 3600
+
+# Pathways written to Neo4j per transaction during ingestion
+PATHWAY_WRITE_BATCH_SIZE = 100
+
+# Gene nodes created per transaction when pre-creating an organism's genes
+GENE_WRITE_BATCH_SIZE = 5000
+
+# Rows committed per inner transaction by CALL { ... } IN TRANSACTIONS
+ROWS_PER_TRANSACTION = 1000
+
+# Error codes meaning the server does not support CALL { ... } IN TRANSACTIONS
+# (servers older than 4.4 reject the clause as a syntax error)
+_IN_TRANSACTIONS_UNSUPPORTED_CODES = frozenset({
+    "Neo.ClientError.Statement.SyntaxError",
+})
+
+# neo4j-admin only writes to a store on this machine
+_LOCAL_NEO4J_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+# Upper bound for an offline neo4j-admin import run (seconds)
+BULK_IMPORT_TIMEOUT = 1800
+
+# KEGG REST asks clients to stay at or below a few requests per second
+_KEGG_LIMITER = _RateLimiter(2.0)
+
+
 def _get_cache_dir() -> Path:
     """Get the cache directory path."""
     return Path.home() / ".openclaw" / "workspace" / "k-sites" / ".cache"
@@ -39,24 +171,60 @@ def _get_checkpoint_file(taxid: str) -> Path:
     return cache_dir / f"kegg_ingest_checkpoint_{taxid}.json"
 
 
+def _get_processed_file(taxid: str) -> Path:
+    """Get the append-only processed-pathways log path for a specific organism."""
+    return _get_checkpoint_file(taxid).with_name(f"kegg_ingest_processed_{taxid}.jsonl")
+
+
 def _save_checkpoint(taxid: str, progress_data: Dict) -> None:
-    """Save ingestion progress to checkpoint file."""
+    """Save ingestion progress to checkpoint file (atomically, via a temp file)."""
     checkpoint_file = _get_checkpoint_file(taxid)
+    tmp_file = checkpoint_file.with_suffix(".tmp")
     try:
-        with open(checkpoint_file, 'w') as f:
-            json.dump(progress_data, f, indent=2)
+        tmp_file.write_bytes(_json_dumps(progress_data))
+        os.replace(tmp_file, checkpoint_file)
         logger.debug(f"Saved checkpoint for taxid {taxid}")
     except Exception as e:
         logger.warning(f"Could not save checkpoint: {e}")
 
 
+def _append_processed_pathways(taxid: str, pathway_ids: List[str]) -> None:
+    """Append newly ingested pathway IDs to the processed-pathways log (one JSON string per line)."""
+    try:
+        with open(_get_processed_file(taxid), 'ab') as f:
+            f.write(b"".join(_json_dumps_line(pathway_id) for pathway_id in pathway_ids))
+            # Durable before the checkpoint that counts these pathways is written
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception as e:
+        logger.warning(f"Could not record processed pathways: {e}")
+
+
+def _reset_processed_pathways(taxid: str) -> None:
+    """Discard the processed-pathways log for a fresh ingest."""
+    try:
+        _get_processed_file(taxid).unlink()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not reset processed pathways: {e}")
+
+
 def _load_checkpoint(taxid: str) -> Optional[Dict]:
-    """Load ingestion progress from checkpoint file."""
+    """Load ingestion progress from checkpoint file and the processed-pathways log."""
     checkpoint_file = _get_checkpoint_file(taxid)
     if checkpoint_file.exists():
         try:
-            with open(checkpoint_file, 'r') as f:
-                data = json.load(f)
+            data = _json_loads(checkpoint_file.read_bytes())
+            
+            # Older checkpoints store the full list inline; newer ones keep it in the log
+            processed = set(data.get('processed_pathways', []))
+            processed_file = _get_processed_file(taxid)
+            if processed_file.exists():
+                with open(processed_file, 'rb') as f:
+                    processed.update(_json_loads(line) for line in f if line.strip())
+            data['processed_pathways'] = list(processed)
+            
             logger.info(f"Loaded checkpoint for taxid {taxid}, resuming from pathway: {data.get('last_pathway', 'None')}")
             return data
         except Exception as e:
@@ -64,47 +232,137 @@ def _load_checkpoint(taxid: str) -> Optional[Dict]:
     return None
 
 
-def _make_kegg_request(url: str, params: Dict = None, max_retries: int = 3) -> requests.Response:
+def _make_kegg_request(url: str, params: Dict = None, stream: bool = False) -> requests.Response:
     """
     Make a request to KEGG API with rate limiting and retry logic.
     
+    Transient failures (connection errors, 429 and 5xx) are retried by the
+    session's adapter with jittered exponential backoff.
+    
     Args:
         url: KEGG API URL
         params: Request parameters
-        max_retries: Maximum number of retry attempts
+        stream: Defer downloading the body until it is iterated
         
     Returns:
         Response object
     """
     # Rate limiting: max 2 requests per second
-    time.sleep(0.5)
+    _KEGG_LIMITER.acquire()
+    
+    try:
+        response = _session.get(url, params=params, timeout=30, stream=stream)
+        response.raise_for_status()
+        return response
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+            requests.exceptions.RetryError) as e:
+        # Only these went through the adapter's retries
+        raise KeggIngestionError(f"Failed to make request after {KEGG_MAX_RETRIES} retries: {e}")
+    except requests.exceptions.HTTPError as e:
+        # Statuses outside the retry list (e.g. 404) fail on the first attempt
+        raise KeggIngestionError(f"KEGG request failed with HTTP {e.response.status_code}: {e}")
+    except requests.exceptions.RequestException as e:
+        raise KeggIngestionError(f"KEGG request failed: {e}")
+
+
+def _get_http_cache_file(url: str) -> Path:
+    """Get the on-disk cache file for a KEGG REST URL."""
+    cache_dir = _get_cache_dir() / "kegg_http"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"{hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()}.txt"
+
+
+def _split_kegg_rows(lines: Iterable[str]) -> Iterator[List[str]]:
+    """Split tab-separated KEGG lines, skipping blank and single-column rows."""
+    for line in lines:
+        if line:
+            parts = line.split('\t', 2)
+            if len(parts) >= 2:
+                yield parts
+
+
+def _strip_prefix(value: str, prefix: str) -> str:
+    """Remove a leading KEGG namespace prefix (str.removeprefix needs Python 3.9)."""
+    return value[len(prefix):] if value.startswith(prefix) else value
+
+
+def _tee_lines(lines: Iterable[str], out) -> Iterator[str]:
+    """Yield lines unchanged, also writing them to out (if given)."""
+    for line in lines:
+        if out is not None:
+            out.write(line)
+            out.write('\n')
+        yield line
+
+
+def _iter_kegg_rows(url: str, refresh: bool = False) -> Iterator[List[str]]:
+    """
+    Stream a tab-separated KEGG REST response row by row.
     
-    for attempt in range(max_retries):
+    Responses are cached on disk for KEGG_HTTP_CACHE_TTL so resumed or repeated
+    ingests skip the network; the cache file is only kept once the full body
+    has been read.
+    
+    Args:
+        url: KEGG API URL
+        refresh: Ignore any cached copy and re-download (the cache is still updated)
+        
+    Yields:
+        Fields of each row with at least two columns (split at most twice)
+    """
+    try:
+        cache_file = _get_http_cache_file(url)
+    except OSError as e:
+        logger.debug(f"KEGG HTTP cache unavailable: {e}")
+        cache_file = None
+    
+    if cache_file is not None and not refresh:
         try:
-            response = requests.get(url, params=params, timeout=30)
-            
-            # Check for rate limiting or server errors
-            if response.status_code == 429 or 500 <= response.status_code < 600:
-                if attempt < max_retries - 1:
-                    # Exponential backoff
-                    wait_time = (2 ** attempt) + (attempt * 0.5)
-                    logger.warning(f"Received {response.status_code} from KEGG, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    response.raise_for_status()
-            else:
-                response.raise_for_status()
-                
-            return response
-            
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait_time = (2 ** attempt) + (attempt * 0.5)
-                logger.warning(f"Request failed, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries}): {e}")
-                time.sleep(wait_time)
+            if time.time() - cache_file.stat().st_mtime < KEGG_HTTP_CACHE_TTL:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    yield from _split_kegg_rows(line.rstrip('\n') for line in f)
+                return
+        except FileNotFoundError:
+            pass
+    
+    cache_out = None
+    if cache_file is not None:
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            cache_out = open(tmp_file, 'w', encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Could not write KEGG HTTP cache: {e}")
+    
+    completed = False
+    try:
+        with _make_kegg_request(url, stream=True) as response:
+            # iter_lines only decodes when an encoding is known
+            response.encoding = response.encoding or "utf-8"
+            for parts in _split_kegg_rows(_tee_lines(response.iter_lines(decode_unicode=True), cache_out)):
+                yield parts
+        completed = True
+    finally:
+        if cache_out is not None:
+            cache_out.close()
+            if completed:
+                os.replace(tmp_file, cache_file)
             else:
-                raise KeggIngestionError(f"Failed to make request after {max_retries} attempts: {e}")
+                tmp_file.unlink()
+
+
+# NCBI TaxID -> KEGG organism code for organisms that can be ingested (read-only)
+_TAXID_TO_KEGG: Final[Mapping[str, str]] = MappingProxyType({
+    "9606": "hsa",      # Homo sapiens
+    "10090": "mmu",     # Mus musculus
+    "10116": "rno",     # Rattus norvegicus
+    "7227": "dme",      # Drosophila melanogaster
+    "6239": "cel",      # Caenorhabditis elegans
+    "7955": "dre",      # Danio rerio
+    "4932": "sce",      # Saccharomyces cerevisiae
+    "3702": "ath",      # Arabidopsis thaliana
+    "9913": "bta",      # Bos taurus
+    "9031": "gga",      # Gallus gallus
+})
 
 
 def _taxid_to_kegg_code(taxid: str) -> Optional[str]:
@@ -117,25 +375,96 @@ def _taxid_to_kegg_code(taxid: str) -> Optional[str]:
     Returns:
         KEGG organism code if found, None otherwise
     """
-    taxid_to_kegg = {
-        "9606": "hsa",      # Homo sapiens
-        "10090": "mmu",     # Mus musculus
-        "10116": "rno",     # Rattus norvegicus
-        "7227": "dme",      # Drosophila melanogaster
-        "6239": "cel",      # Caenorhabditis elegans
-        "7955": "dre",      # Danio rerio
-        "4932": "sce",      # Saccharomyces cerevisiae
-        "3702": "ath",      # Arabidopsis thaliana
-        "9913": "bta",      # Bos taurus
-        "9031": "gga",      # Gallus gallus
-    }
+    return _TAXID_TO_KEGG.get(taxid)
+
+
+def _execute_write(session, transaction_function, *args) -> None:
+    """
+    Run a transaction function that the driver retries on transient errors.
+    
+    Uses session.execute_write on neo4j >= 5 and write_transaction on 4.x.
+    """
+    execute_write = getattr(session, "execute_write", None) or session.write_transaction
+    execute_write(transaction_function, *args)
+
+
+def _run_write_query(driver, query: str, parameters: Optional[Dict] = None) -> None:
+    """
+    Run a single write statement in a driver-retried transaction.
     
-    return taxid_to_kegg.get(taxid)
+    Args:
+        driver: Neo4j driver instance
+        query: Cypher query to execute
+        parameters: Parameters for the query
+    """
+    if EXECUTE_QUERY_AVAILABLE:
+        driver.execute_query(query, parameters or {}, routing_=RoutingControl.WRITE)
+        return
+    
+    with driver.session() as session:
+        # consume() lets the retry manager see the statement complete inside the transaction
+        _execute_write(session, lambda tx: tx.run(query, parameters or {}).consume())
+
+
+def _run_read_single(driver, query: str, parameters: Optional[Dict] = None):
+    """
+    Run a read-only statement (retried by the driver) and return its single record.
+    
+    Args:
+        driver: Neo4j driver instance
+        query: Cypher query to execute
+        parameters: Parameters for the query
+        
+    Returns:
+        The single result record, or None
+    """
+    if EXECUTE_QUERY_AVAILABLE:
+        records, _, _ = driver.execute_query(query, parameters or {}, routing_=RoutingControl.READ)
+        return records[0] if records else None
+    
+    with driver.session() as session:
+        execute_read = getattr(session, "execute_read", None) or session.read_transaction
+        return execute_read(lambda tx: tx.run(query, parameters or {}).single())
+
+
+def _run_in_transactions(driver, query: str, parameters: Optional[Dict] = None) -> bool:
+    """
+    Run a CALL { ... } IN TRANSACTIONS statement as an auto-commit query.
+    
+    Such statements commit their own inner transactions, so they cannot run
+    inside execute_write. Servers older than Neo4j 4.4 reject the syntax.
+    
+    Args:
+        driver: Neo4j driver instance
+        query: Cypher using IN TRANSACTIONS OF $rows ROWS
+        parameters: Query parameters ('rows' is filled in)
+        
+    Returns:
+        True if the statement ran, False if the server does not support it
+        
+    Raises:
+        ClientError: For any other client error (e.g. a constraint violation),
+            which a fallback write path would only repeat or mask
+    """
+    params = dict(parameters or {}, rows=ROWS_PER_TRANSACTION)
+    try:
+        with driver.session() as session:
+            session.run(query, params).consume()
+    except ClientError as e:
+        if e.code not in _IN_TRANSACTIONS_UNSUPPORTED_CODES:
+            raise
+        logger.debug(f"CALL IN TRANSACTIONS not available, using batched transactions: {str(e)}")
+        return False
+    return True
 
 
 def _create_neo4j_constraints(driver) -> None:
     """
-    Create Neo4j constraints for KEGG data.
+    Create Neo4j constraints and indexes for KEGG data.
+    
+    Uniqueness constraints already back the id/entrez_id lookups used by MERGE;
+    the extra indexes cover other hot lookup properties. Waits for all indexes to
+    come online so the first MERGE uses index seeks rather than label scans.
     
     Args:
         driver: Neo4j driver instance
@@ -147,62 +476,63 @@ def _create_neo4j_constraints(driver) -> None:
         "CREATE CONSTRAINT gene_entrez_id IF NOT EXISTS FOR (g:Gene) REQUIRE g.entrez_id IS UNIQUE"
     ]
     
-    with driver.session() as session:
-        for constraint in constraints:
-            session.run(constraint)
-            logger.debug(f"Applied constraint: {constraint}")
+    indexes = [
+        "CREATE INDEX gene_symbol IF NOT EXISTS FOR (g:Gene) ON (g.symbol)"
+    ]
+    
+    for constraint in constraints:
+        _run_write_query(driver, constraint)
+        logger.debug(f"Applied constraint: {constraint}")
+    for index in indexes:
+        _run_write_query(driver, index)
+        logger.debug(f"Applied index: {index}")
+    
+    # Block until the schema is populated before bulk MERGEs start
+    _run_write_query(driver, "CALL db.awaitIndexes()")
 
 
-def _fetch_kegg_pathways(kegg_code: str) -> List[Dict[str, str]]:
+def _fetch_kegg_pathways(kegg_code: str, refresh: bool = False) -> List[Dict[str, str]]:
     """
     Fetch all pathways for an organism from KEGG.
     
     Args:
         kegg_code: KEGG organism code (e.g., 'hsa')
+        refresh: Bypass the on-disk KEGG response cache
         
     Returns:
         List of pathway dictionaries with 'id' and 'name'
     """
     url = f"https://rest.kegg.jp/list/pathway/{kegg_code}"
-    response = _make_kegg_request(url)
-    
     pathways = []
-    for line in response.text.strip().split('\n'):
-        if line:
-            parts = line.split('\t')
-            if len(parts) >= 2:
-                pathway_id = parts[0].replace("path:", "")
-                pathway_name = parts[1]
-                pathways.append({"id": pathway_id, "name": pathway_name})
+    for parts in _iter_kegg_rows(url, refresh):
+        pathway_id = _strip_prefix(parts[0], "path:")
+        pathway_name = parts[1]
+        pathways.append({"id": pathway_id, "name": pathway_name})
     
     logger.info(f"Fetched {len(pathways)} pathways for organism {kegg_code}")
     return pathways
 
 
-def _fetch_pathway_genes(kegg_code: str, pathway_id: str) -> List[Dict[str, str]]:
+def _fetch_pathway_genes(kegg_code: str, pathway_id: str, refresh: bool = False) -> List[Dict[str, str]]:
     """
     Fetch genes in a specific pathway from KEGG.
     
     Args:
         kegg_code: KEGG organism code
         pathway_id: KEGG pathway ID
+        refresh: Bypass the on-disk KEGG response cache
         
     Returns:
         List of gene dictionaries with 'kegg_id' and 'symbol'
     """
     # First get genes linked to this pathway
     url = f"https://rest.kegg.jp/link/genes/{pathway_id}"
-    response = _make_kegg_request(url)
-    
     kegg_gene_ids = []
-    for line in response.text.strip().split('\n'):
-        if line:
-            parts = line.split('\t')
-            if len(parts) >= 2:
-                pathway_entry, gene_entry = parts[0], parts[1]
-                # Only take genes from the target organism
-                if gene_entry.startswith(f"{kegg_code}:"):
-                    kegg_gene_ids.append(gene_entry)
+    for parts in _iter_kegg_rows(url, refresh):
+        pathway_entry, gene_entry = parts[0], parts[1]
+        # Only take genes from the target organism
+        if gene_entry.startswith(f"{kegg_code}:"):
+            kegg_gene_ids.append(gene_entry)
     
     if not kegg_gene_ids:
         return []
@@ -211,30 +541,207 @@ def _fetch_pathway_genes(kegg_code: str, pathway_id: str) -> List[Dict[str, str]
     # Join the gene IDs with '+' for the conv API call
     gene_ids_str = '+'.join(kegg_gene_ids)
     url = f"https://rest.kegg.jp/conv/ncbi-geneid/{gene_ids_str}"
-    response = _make_kegg_request(url)
-    
     genes = []
-    for line in response.text.strip().split('\n'):
-        if line:
-            parts = line.split('\t')
-            if len(parts) >= 2:
-                kegg_gene_id = parts[0]  # e.g., hsa:1234
-                entrez_id = parts[1].replace("ncbi-geneid:", "")  # e.g., 1234
-                
-                # Extract symbol from KEGG ID (part after ':')
-                symbol = kegg_gene_id.split(':')[-1]
-                
-                genes.append({
-                    "kegg_id": kegg_gene_id,
-                    "entrez_id": entrez_id,
-                    "symbol": symbol
-                })
+    for parts in _iter_kegg_rows(url, refresh):
+        kegg_gene_id = parts[0]  # e.g., hsa:1234
+        entrez_id = _strip_prefix(parts[1], "ncbi-geneid:")  # e.g., 1234
+        
+        # Extract symbol from KEGG ID (part after ':')
+        symbol = kegg_gene_id.split(':')[-1]
+        
+        genes.append({
+            "kegg_id": kegg_gene_id,
+            "entrez_id": entrez_id,
+            "symbol": symbol
+        })
     
     logger.debug(f"Found {len(genes)} genes for pathway {pathway_id}")
     return genes
 
 
-def _ingest_pathway_to_neo4j(driver, kegg_code: str, pathway: Dict[str, str], genes: List[Dict[str, str]]) -> None:
+def _fetch_organism_pathway_genes(kegg_code: str, refresh: bool = False) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Fetch the genes of every pathway of an organism with two organism-wide KEGG calls.
+    
+    Args:
+        kegg_code: KEGG organism code
+        refresh: Bypass the on-disk KEGG response cache
+        
+    Returns:
+        Dictionary mapping pathway ID to its gene dictionaries ('kegg_id', 'entrez_id', 'symbol')
+    """
+    # All gene -> Entrez ID conversions for the organism
+    entrez_ids = {
+        parts[0]: _strip_prefix(parts[1], "ncbi-geneid:")
+        for parts in _iter_kegg_rows(f"https://rest.kegg.jp/conv/ncbi-geneid/{kegg_code}", refresh)
+    }
+    
+    # All pathway <-> gene links for the organism
+    pathway_genes: Dict[str, List[Dict[str, str]]] = {}
+    for parts in _iter_kegg_rows(f"https://rest.kegg.jp/link/{kegg_code}/pathway", refresh):
+        pathway_id = _strip_prefix(parts[0], "path:")
+        kegg_gene_id = parts[1]
+        # Genes without an Entrez ID are skipped, as in the per-pathway conversion
+        entrez_id = entrez_ids.get(kegg_gene_id)
+        if entrez_id is not None:
+            pathway_genes.setdefault(pathway_id, []).append({
+                "kegg_id": kegg_gene_id,
+                "entrez_id": entrez_id,
+                "symbol": kegg_gene_id.split(':')[-1]
+            })
+    
+    logger.info(f"Fetched gene links for {len(pathway_genes)} pathways of organism {kegg_code}")
+    return pathway_genes
+
+
+def _iter_pathway_genes(kegg_code: str, pathways: List[Dict[str, str]], refresh: bool = False,
+                        pathway_genes: Optional[Dict[str, List[Dict[str, str]]]] = None) -> Iterator[Tuple[Dict[str, str], List[Dict[str, str]], Optional[Exception]]]:
+    """
+    Yield (pathway, genes, error) for each pathway.
+    
+    Uses the organism-wide gene links when available; otherwise falls back to
+    concurrent per-pathway fetches.
+    
+    Args:
+        kegg_code: KEGG organism code
+        pathways: Pathway dictionaries to fetch genes for
+        refresh: Bypass the on-disk KEGG response cache
+        pathway_genes: Organism-wide pathway -> genes mapping, if already fetched
+    """
+    if pathway_genes is not None:
+        for pathway in pathways:
+            yield pathway, pathway_genes.get(pathway["id"], []), None
+        return
+    
+    # Gene lists are fetched concurrently (the shared rate limiter still caps KEGG
+    # traffic, but request latencies overlap); Neo4j writes stay on the caller's thread
+    with ThreadPoolExecutor(max_workers=KEGG_FETCH_WORKERS, thread_name_prefix="kegg-fetch") as executor:
+        future_to_pathway = {
+            executor.submit(_fetch_pathway_genes, kegg_code, pathway["id"], refresh): pathway
+            for pathway in pathways
+        }
+        for future in as_completed(future_to_pathway):
+            try:
+                yield future_to_pathway[future], future.result(), None
+            except Exception as e:
+                yield future_to_pathway[future], [], e
+
+
+# Organism and pathway scaffold for a pathway batch. The merged organism and
+# pathway are carried forward with WITH, so neither is re-MATCHed per gene.
+_PATHWAY_SCAFFOLD_PREFIX = """
+    MERGE (o:Organism {id: $organism_id})
+    WITH o
+    UNWIND $batch AS item
+    MERGE (p:Pathway {id: item.id})
+    SET p.name = item.name,
+        p.kegg_code = $kegg_code
+    MERGE (o)-[:HAS_PATHWAY]->(p)
+    WITH p, item
+    UNWIND item.genes AS gene
+"""
+
+_PATHWAY_SCAFFOLD_QUERY = _PATHWAY_SCAFFOLD_PREFIX + """
+    MERGE (g:Gene {id: gene.kegg_id})
+    SET g.entrez_id = gene.entrez_id,
+        g.symbol = gene.symbol
+    MERGE (g)-[:PARTICIPATES_IN]->(p)
+"""
+
+# Same scaffold when gene nodes were pre-created: look genes up instead of merging them
+_PATHWAY_LINK_QUERY = _PATHWAY_SCAFFOLD_PREFIX + """
+    MATCH (g:Gene {id: gene.kegg_id})
+    MERGE (g)-[:PARTICIPATES_IN]->(p)
+"""
+
+
+def _write_genes(tx, genes: List[Dict[str, str]]) -> None:
+    """
+    Upsert gene nodes (without pathway links) in one statement.
+    
+    Args:
+        tx: Neo4j transaction
+        genes: List of gene dictionaries
+    """
+    tx.run("""
+        UNWIND $genes AS gene
+        MERGE (g:Gene {id: gene.kegg_id})
+        SET g.entrez_id = gene.entrez_id,
+            g.symbol = gene.symbol
+    """, {"genes": genes}).consume()
+
+
+def _ingest_genes_to_neo4j(driver, genes: List[Dict[str, str]]) -> None:
+    """
+    Create every gene node up front.
+    
+    Genes shared by many pathways are then merged once rather than once per pathway.
+    The payload is committed ROWS_PER_TRANSACTION genes at a time server-side so heap
+    use stays bounded for large organisms; servers without CALL IN TRANSACTIONS get
+    GENE_WRITE_BATCH_SIZE genes per client-side transaction instead.
+    
+    Args:
+        driver: Neo4j driver instance
+        genes: List of gene dictionaries (deduplicated by 'kegg_id')
+    """
+    if _run_in_transactions(driver, """
+        UNWIND $genes AS gene
+        CALL {
+            WITH gene
+            MERGE (g:Gene {id: gene.kegg_id})
+            SET g.entrez_id = gene.entrez_id,
+                g.symbol = gene.symbol
+        } IN TRANSACTIONS OF $rows ROWS
+    """, {"genes": genes}):
+        logger.info(f"Created {len(genes)} gene nodes")
+        return
+    
+    with driver.session() as session:
+        for start in range(0, len(genes), GENE_WRITE_BATCH_SIZE):
+            _execute_write(session, _write_genes, genes[start:start + GENE_WRITE_BATCH_SIZE])
+    logger.info(f"Created {len(genes)} gene nodes")
+
+
+def _write_pathways(tx, kegg_code: str, batch: List[Dict], genes_preloaded: bool = False) -> None:
+    """
+    Write a batch of pathways, their organism links and all of their genes in one statement.
+    
+    Args:
+        tx: Neo4j transaction
+        kegg_code: KEGG organism code
+        batch: List of {'id', 'name', 'genes'} pathway dictionaries
+        genes_preloaded: Gene nodes already exist, so only link them to pathways
+    """
+    query = _PATHWAY_LINK_QUERY if genes_preloaded else _PATHWAY_SCAFFOLD_QUERY
+    tx.run(query, {
+        "batch": batch,
+        "kegg_code": kegg_code,
+        "organism_id": kegg_code
+    }).consume()
+
+
+def _ingest_pathways_to_neo4j(driver, kegg_code: str, pathways_with_genes: List[Tuple[Dict[str, str], List[Dict[str, str]]]],
+                              genes_preloaded: bool = False) -> None:
+    """
+    Ingest several pathways and their genes into Neo4j in a single transaction.
+    
+    Args:
+        driver: Neo4j driver instance
+        kegg_code: KEGG organism code
+        pathways_with_genes: List of (pathway dictionary, gene dictionaries) pairs
+        genes_preloaded: Gene nodes already exist, so only link them to pathways
+    """
+    batch = [
+        {"id": pathway["id"], "name": pathway["name"], "genes": genes}
+        for pathway, genes in pathways_with_genes
+    ]
+    with driver.session() as session:
+        # Transaction functions are retried by the driver on transient errors
+        _execute_write(session, _write_pathways, kegg_code, batch, genes_preloaded)
+
+
+def _ingest_pathway_to_neo4j(driver, kegg_code: str, pathway: Dict[str, str], genes: List[Dict[str, str]],
+                             genes_preloaded: bool = False) -> None:
     """
     Ingest a single pathway and its genes into Neo4j.
     
@@ -243,45 +750,40 @@ def _ingest_pathway_to_neo4j(driver, kegg_code: str, pathway: Dict[str, str], ge
         kegg_code: KEGG organism code
         pathway: Pathway dictionary with 'id' and 'name'
         genes: List of gene dictionaries
+        genes_preloaded: Gene nodes already exist, so only link them to pathways
     """
-    with driver.session() as session:
-        # Create pathway node
-        session.run("""
-            MERGE (p:Pathway {id: $pathway_id})
-            SET p.name = $pathway_name,
-                p.kegg_code = $kegg_code
-        """, {
-            "pathway_id": pathway["id"],
-            "pathway_name": pathway["name"],
-            "kegg_code": kegg_code
-        })
-        
-        # Create organism node and relationship
-        session.run("""
-            MERGE (o:Organism {id: $organism_id})
-            WITH o
-            MATCH (p:Pathway {id: $pathway_id})
-            MERGE (o)-[:HAS_PATHWAY]->(p)
-        """, {
-            "organism_id": kegg_code,
-            "pathway_id": pathway["id"]
-        })
+    _ingest_pathways_to_neo4j(driver, kegg_code, [(pathway, genes)], genes_preloaded)
+
+
+def _flush_pathway_batch(driver, kegg_code: str, pathways_with_genes: List[Tuple[Dict[str, str], List[Dict[str, str]]]],
+                         genes_preloaded: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    Write buffered pathways in one transaction, isolating failures if the batch is rejected.
+    
+    Args:
+        driver: Neo4j driver instance
+        kegg_code: KEGG organism code
+        pathways_with_genes: List of (pathway dictionary, gene dictionaries) pairs
+        genes_preloaded: Gene nodes already exist, so only link them to pathways
         
-        # Create gene nodes and relationships
-        for gene in genes:
-            session.run("""
-                MERGE (g:Gene {id: $gene_id})
-                SET g.entrez_id = $entrez_id,
-                    g.symbol = $symbol
-                WITH g
-                MATCH (p:Pathway {id: $pathway_id})
-                MERGE (g)-[:PARTICIPATES_IN]->(p)
-            """, {
-                "gene_id": gene["kegg_id"],
-                "entrez_id": gene["entrez_id"],
-                "symbol": gene["symbol"],
-                "pathway_id": pathway["id"]
-            })
+    Returns:
+        Tuple of (ingested pathway IDs, failed pathway IDs)
+    """
+    try:
+        _ingest_pathways_to_neo4j(driver, kegg_code, pathways_with_genes, genes_preloaded)
+        return [pathway["id"] for pathway, _ in pathways_with_genes], []
+    except Exception as e:
+        logger.warning(f"Batch write of {len(pathways_with_genes)} pathways failed, retrying individually: {str(e)}")
+    
+    ingested, failed = [], []
+    for pathway, genes in pathways_with_genes:
+        try:
+            _ingest_pathway_to_neo4j(driver, kegg_code, pathway, genes, genes_preloaded)
+            ingested.append(pathway["id"])
+        except Exception as e:
+            logger.warning(f"Failed to process pathway {pathway['id']}: {str(e)}")
+            failed.append(pathway["id"])
+    return ingested, failed
 
 
 def _validate_ingestion(driver, kegg_code: str) -> Dict[str, int]:
@@ -295,38 +797,136 @@ def _validate_ingestion(driver, kegg_code: str) -> Dict[str, int]:
     Returns:
         Dictionary with validation metrics
     """
-    with driver.session() as session:
-        # Count genes for this organism
-        gene_count_result = session.run("""
-            MATCH (o:Organism {id: $organism_id})-[:HAS_PATHWAY]->()-[:PARTICIPATES_IN]-(g:Gene)
-            RETURN count(DISTINCT g) AS gene_count
-        """, {"organism_id": kegg_code})
-        
-        gene_count = gene_count_result.single()["gene_count"]
-        
-        # Count pathways for this organism
-        pathway_count_result = session.run("""
-            MATCH (o:Organism {id: $organism_id})-[:HAS_PATHWAY]->(p:Pathway)
-            RETURN count(p) AS pathway_count
-        """, {"organism_id": kegg_code})
-        
-        pathway_count = pathway_count_result.single()["pathway_count"]
+    # Pathway, gene and gene-pathway relationship counts in one traversal
+    counts = _run_read_single(driver, """
+        MATCH (o:Organism {id: $organism_id})-[:HAS_PATHWAY]->(p:Pathway)
+        OPTIONAL MATCH (p)<-[r:PARTICIPATES_IN]-(g:Gene)
+        RETURN count(DISTINCT p) AS pathway_count,
+               count(DISTINCT g) AS gene_count,
+               count(r) AS relationship_count
+    """, {"organism_id": kegg_code})
+    
+    gene_count = counts["gene_count"]
+    pathway_count = counts["pathway_count"]
+    relationship_count = counts["relationship_count"]
+    
+    logger.info(f"Validation for {kegg_code}: {gene_count} genes, {pathway_count} pathways, {relationship_count} relationships")
+    
+    return {
+        "genes": gene_count,
+        "pathways": pathway_count,
+        "relationships": relationship_count
+    }
+
+
+def _write_import_csvs(import_dir: Path, kegg_code: str, pathways: List[Dict[str, str]],
+                       pathway_genes: Dict[str, List[Dict[str, str]]]) -> Dict[str, Path]:
+    """
+    Write deduplicated neo4j-admin import CSVs for one organism.
+    
+    Args:
+        import_dir: Directory to write the CSV files into
+        kegg_code: KEGG organism code
+        pathways: Pathway dictionaries with 'id' and 'name'
+        pathway_genes: Mapping of pathway ID to gene dictionaries
         
-        # Count gene-pathway relationships for this organism
-        relationship_count_result = session.run("""
-            MATCH (o:Organism {id: $organism_id})-[:HAS_PATHWAY]->()-[:PARTICIPATES_IN]-(g:Gene)
-            RETURN count(*) AS relationship_count
-        """, {"organism_id": kegg_code})
+    Returns:
+        Mapping of file role to CSV path
+    """
+    import_dir.mkdir(parents=True, exist_ok=True)
+    files = {
+        name: import_dir / f"{name}.csv"
+        for name in ("organisms", "pathways", "genes", "op", "gp")
+    }
+    
+    genes = {}
+    with open(files["organisms"], "w", newline="", encoding="utf-8") as organisms_out, \
+            open(files["pathways"], "w", newline="", encoding="utf-8") as pathways_out, \
+            open(files["op"], "w", newline="", encoding="utf-8") as op_out, \
+            open(files["gp"], "w", newline="", encoding="utf-8") as gp_out:
+        organisms_csv = csv.writer(organisms_out)
+        pathways_csv = csv.writer(pathways_out)
+        op_csv = csv.writer(op_out)
+        gp_csv = csv.writer(gp_out)
         
-        relationship_count = relationship_count_result.single()["relationship_count"]
+        organisms_csv.writerows([["id:ID(Organism)"], [kegg_code]])
+        pathways_csv.writerow(["id:ID(Pathway)", "name", "kegg_code"])
+        op_csv.writerow([":START_ID(Organism)", ":END_ID(Pathway)"])
+        gp_csv.writerow([":START_ID(Gene)", ":END_ID(Pathway)"])
         
-        logger.info(f"Validation for {kegg_code}: {gene_count} genes, {pathway_count} pathways, {relationship_count} relationships")
+        for pathway in pathways:
+            pathway_id = pathway["id"]
+            pathways_csv.writerow([pathway_id, pathway["name"], kegg_code])
+            op_csv.writerow([kegg_code, pathway_id])
+            linked = set()
+            for gene in pathway_genes.get(pathway_id, []):
+                if gene["kegg_id"] in linked:
+                    continue
+                linked.add(gene["kegg_id"])
+                genes.setdefault(gene["kegg_id"], gene)
+                gp_csv.writerow([gene["kegg_id"], pathway_id])
+    
+    with open(files["genes"], "w", newline="", encoding="utf-8") as genes_out:
+        genes_csv = csv.writer(genes_out)
+        genes_csv.writerow(["id:ID(Gene)", "entrez_id", "symbol"])
+        genes_csv.writerows(
+            [gene["kegg_id"], gene.get("entrez_id", ""), gene.get("symbol", "")]
+            for gene in genes.values()
+        )
+    
+    logger.info(f"Wrote import CSVs for {len(pathways)} pathways and {len(genes)} genes to {import_dir}")
+    return files
+
+
+def _bulk_import(neo4j_uri: str, kegg_code: str, pathways: List[Dict[str, str]],
+                 pathway_genes: Dict[str, List[Dict[str, str]]]) -> bool:
+    """
+    Load an organism with `neo4j-admin database import incremental`.
+    
+    Only possible against a local Neo4j with neo4j-admin on PATH; the tool
+    also needs a store it may write to (Enterprise, database offline or
+    read-only). Any of those missing is reported as False so the caller can
+    fall back to MERGE ingestion.
+    
+    Args:
+        neo4j_uri: Bolt URI of the target server
+        kegg_code: KEGG organism code
+        pathways: Pathway dictionaries with 'id' and 'name'
+        pathway_genes: Mapping of pathway ID to gene dictionaries
         
-        return {
-            "genes": gene_count,
-            "pathways": pathway_count,
-            "relationships": relationship_count
-        }
+    Returns:
+        True if neo4j-admin imported the data
+    """
+    if urlparse(neo4j_uri).hostname not in _LOCAL_NEO4J_HOSTS:
+        logger.info("Neo4j is not local, using MERGE ingestion instead of neo4j-admin import")
+        return False
+    neo4j_admin = shutil.which("neo4j-admin")
+    if not neo4j_admin:
+        logger.info("neo4j-admin not found on PATH, using MERGE ingestion instead")
+        return False
+    
+    files = _write_import_csvs(_get_cache_dir() / "import" / kegg_code, kegg_code, pathways, pathway_genes)
+    command = [
+        neo4j_admin, "database", "import", "incremental", "--force",
+        f"--nodes=Organism={files['organisms']}",
+        f"--nodes=Pathway={files['pathways']}",
+        f"--nodes=Gene={files['genes']}",
+        f"--relationships=HAS_PATHWAY={files['op']}",
+        f"--relationships=PARTICIPATES_IN={files['gp']}",
+        "--multiline-fields=true",
+        os.getenv('NEO4J_DATABASE', 'neo4j')
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=BULK_IMPORT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"neo4j-admin import could not run, using MERGE ingestion instead: {str(e)}")
+        return False
+    if completed.returncode != 0:
+        logger.warning(f"neo4j-admin import failed, using MERGE ingestion instead: {completed.stderr.strip()}")
+        return False
+    
+    logger.info(f"Bulk imported {len(pathways)} pathways for {kegg_code} with neo4j-admin")
+    return True
 
 
 def _clear_existing_data(driver, kegg_code: str) -> None:
@@ -339,21 +939,31 @@ def _clear_existing_data(driver, kegg_code: str) -> None:
     """
     logger.info(f"Clearing existing KEGG data for organism {kegg_code}")
     
-    with driver.session() as session:
+    # Delete genes and pathways in bounded inner transactions where supported
+    if not _run_in_transactions(driver, """
+        MATCH (o:Organism {id: $organism_id})-[:HAS_PATHWAY]->(p:Pathway)<-[:PARTICIPATES_IN]-(g:Gene)
+        WITH collect(DISTINCT g) + collect(DISTINCT p) AS nodes
+        UNWIND nodes AS n
+        CALL {
+            WITH n
+            DETACH DELETE n
+        } IN TRANSACTIONS OF $rows ROWS
+    """, {"organism_id": kegg_code}):
         # Delete relationships and genes for this organism's pathways
-        session.run("""
+        _run_write_query(driver, """
             MATCH (o:Organism {id: $organism_id})-[:HAS_PATHWAY]->(p:Pathway)<-[:PARTICIPATES_IN]-(g:Gene)
             DETACH DELETE g, p
         """, {"organism_id": kegg_code})
-        
-        # Delete the organism itself
-        session.run("""
-            MATCH (o:Organism {id: $organism_id})
-            DETACH DELETE o
-        """, {"organism_id": kegg_code})
+    
+    # Delete the organism itself
+    _run_write_query(driver, """
+        MATCH (o:Organism {id: $organism_id})
+        DETACH DELETE o
+    """, {"organism_id": kegg_code})
 
 
-def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, show_progress: bool = True) -> Dict:
+def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, show_progress: bool = True,
+                         refresh_cache: bool = False, bulk: bool = False) -> Dict:
     """
     Ingest KEGG pathway data for a specific organism into Neo4j.
     
@@ -362,6 +972,8 @@ def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, sh
         organism_name: Organism scientific name
         force: Whether to re-ingest and clear existing data
         show_progress: Whether to show progress updates
+        refresh_cache: Whether to re-download KEGG data instead of using cached responses
+        bulk: With force, try an offline neo4j-admin import before MERGE ingestion
         
     Returns:
         Dictionary with ingestion statistics
@@ -380,17 +992,20 @@ def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, sh
     neo4j_user = os.getenv('NEO4J_USER', 'neo4j')
     neo4j_password = os.getenv('NEO4J_PASSWORD', 'kkokay07')
     
+    # Keep-alive stops idle pooled connections from being dropped between pathway batches
     driver = GraphDatabase.driver(
         neo4j_uri,
         auth=(neo4j_user, neo4j_password),
         max_connection_lifetime=3600,
-        max_connection_pool_size=10
+        max_connection_pool_size=50,
+        connection_acquisition_timeout=60,
+        connection_timeout=30,
+        keep_alive=True
     )
     
     try:
         # Test connection
-        with driver.session() as session:
-            session.run("RETURN 1")
+        driver.verify_connectivity()
         logger.info("Connected to Neo4j successfully")
         
         # Create constraints
@@ -399,6 +1014,7 @@ def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, sh
         # Clear existing data if force is True
         if force:
             _clear_existing_data(driver, kegg_code)
+            _reset_processed_pathways(taxid)
         
         # Load checkpoint if available
         checkpoint = _load_checkpoint(taxid)
@@ -410,7 +1026,7 @@ def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, sh
             logger.info(f"Resuming from checkpoint - already processed {len(processed_pathways)} pathways")
         
         # Fetch pathways
-        pathways = _fetch_kegg_pathways(kegg_code)
+        pathways = _fetch_kegg_pathways(kegg_code, refresh_cache)
         total_pathways = len(pathways)
         
         if show_progress:
@@ -420,53 +1036,83 @@ def ingest_kegg_organism(taxid: str, organism_name: str, force: bool = False, sh
         successful_ingests = 0
         failed_ingests = 0
         
-        for idx, pathway in enumerate(pathways):
+        remaining = [pathway for pathway in pathways if pathway["id"] not in processed_pathways]
+        if show_progress and len(remaining) < total_pathways:
+            logger.info(f"Skipping {total_pathways - len(remaining)} already processed pathways")
+        
+        # Organism-wide gene links let every gene node be created once up front
+        pathway_genes = None
+        genes_preloaded = False
+        if remaining:
+            try:
+                pathway_genes = _fetch_organism_pathway_genes(kegg_code, refresh_cache)
+            except Exception as e:
+                logger.warning(f"Organism-wide gene fetch failed, falling back to per-pathway requests: {str(e)}")
+        if force and bulk and pathway_genes is not None and _bulk_import(neo4j_uri, kegg_code, remaining, pathway_genes):
+            bulk_ids = [pathway["id"] for pathway in remaining]
+            processed_pathways.update(bulk_ids)
+            _append_processed_pathways(taxid, bulk_ids)
+            successful_ingests += len(bulk_ids)
+            remaining = []
+        elif pathway_genes is not None:
+            unique_genes = {
+                gene["kegg_id"]: gene
+                for pathway in remaining
+                for gene in pathway_genes.get(pathway["id"], [])
+            }
+            try:
+                _ingest_genes_to_neo4j(driver, list(unique_genes.values()))
+                genes_preloaded = True
+            except Exception as e:
+                logger.warning(f"Could not pre-create gene nodes, merging them per pathway instead: {str(e)}")
+        
+        pending_writes = []
+        for done, (pathway, genes, error) in enumerate(_iter_pathway_genes(kegg_code, remaining, refresh_cache, pathway_genes), 1):
             pathway_id = pathway["id"]
             
-            # Skip if already processed
-            if pathway_id in processed_pathways:
-                if show_progress and idx % 50 == 0:
-                    logger.info(f"Progress: {idx}/{total_pathways} pathways (skipping already processed)")
-                continue
+            if show_progress and done % 10 == 0:
+                logger.info(f"Fetched {done}/{len(remaining)} pathways (latest: {pathway_id})")
             
-            try:
-                if show_progress and idx % 10 == 0:
-                    logger.info(f"Processing pathway {idx+1}/{total_pathways}: {pathway_id}")
-                
-                # Fetch genes for this pathway
-                genes = _fetch_pathway_genes(kegg_code, pathway_id)
-                
-                # Ingest pathway and genes
-                _ingest_pathway_to_neo4j(driver, kegg_code, pathway, genes)
-                
-                # Mark as processed
-                processed_pathways.add(pathway_id)
-                successful_ingests += 1
-                
-                # Save checkpoint periodically
-                if successful_ingests % 10 == 0:
-                    checkpoint_data = {
-                        "taxid": taxid,
-                        "organism_name": organism_name,
-                        "kegg_code": kegg_code,
-                        "processed_pathways": list(processed_pathways),
-                        "last_pathway": pathway_id,
-                        "successful_ingests": successful_ingests,
-                        "failed_ingests": failed_ingests
-                    }
-                    _save_checkpoint(taxid, checkpoint_data)
-                
-            except Exception as e:
-                logger.warning(f"Failed to process pathway {pathway_id}: {str(e)}")
+            if error is None:
+                # Genes fetched for this pathway
+                pending_writes.append((pathway, genes))
+            else:
+                logger.warning(f"Failed to process pathway {pathway_id}: {str(error)}")
                 failed_ingests += 1
-                continue  # Continue with next pathway
+            
+            # Ingest buffered pathways and genes in one transaction
+            if len(pending_writes) < PATHWAY_WRITE_BATCH_SIZE and done < len(remaining):
+                continue
+            if not pending_writes:
+                continue
+            
+            ingested, failed = _flush_pathway_batch(driver, kegg_code, pending_writes, genes_preloaded)
+            pending_writes = []
+            
+            # Mark as processed (only the new IDs are written)
+            processed_pathways.update(ingested)
+            _append_processed_pathways(taxid, ingested)
+            successful_ingests += len(ingested)
+            failed_ingests += len(failed)
+            
+            # Save checkpoint after every flushed batch
+            checkpoint_data = {
+                "taxid": taxid,
+                "organism_name": organism_name,
+                "kegg_code": kegg_code,
+                "processed_count": len(processed_pathways),
+                "last_pathway": pathway_id,
+                "successful_ingests": successful_ingests,
+                "failed_ingests": failed_ingests
+            }
+            _save_checkpoint(taxid, checkpoint_data)
         
         # Final checkpoint
         checkpoint_data = {
             "taxid": taxid,
             "organism_name": organism_name,
             "kegg_code": kegg_code,
-            "processed_pathways": list(processed_pathways),
+            "processed_count": len(processed_pathways),
             "last_pathway": pathways[-1]["id"] if pathways else "none",
             "successful_ingests": successful_ingests,
             "failed_ingests": failed_ingests,
@@ -505,6 +1151,8 @@ def main():
     parser.add_argument("--taxid", required=True, help="NCBI Taxonomy ID (e.g., 9606)")
     parser.add_argument("--organism", required=True, help="Organism name (e.g., 'Homo sapiens')")
     parser.add_argument("--force", action="store_true", help="Force re-ingestion (clear existing data)")
+    parser.add_argument("--refresh-cache", action="store_true", help="Re-download KEGG data instead of using cached responses")
+    parser.add_argument("--bulk", action="store_true", help="With --force, load via neo4j-admin import when Neo4j is local")
     
     args = parser.parse_args()
     
@@ -512,7 +1160,9 @@ def main():
         results = ingest_kegg_organism(
             taxid=args.taxid,
             organism_name=args.organism,
-            force=args.force
+            force=args.force,
+            refresh_cache=args.refresh_cache,
+            bulk=args.bulk
         )
         
         print(f"\nIngestion completed successfully!")
@@ -5,34 +5,14 @@ This module provides comprehensive RAG (Retrieval-Augmented Generation) capabili
 for predicting gene knockout phenotypes by mining and analyzing scientific literature.
 """
 
-from .literature_context import (
-    # Core classes
-    LiteratureMiner,
-    DiversityAwareVectorStore,
-    PhenotypeExtractor,
-    RAGPhenotypePredictor,
-    
-    # Data classes
-    PhenotypePrediction,
-    LiteratureRecord,
-    
-    # Enums
-    PhenotypeSeverity,
-    RiskLevel,
-    
-    # Convenience functions
-    predict_gene_phenotype,
-    batch_predict_gene_phenotypes,
-)
+import importlib.util
 
-# Make RAG availability check available
-try:
-    from sentence_transformers import SentenceTransformer
-    import faiss
-    import numpy as np
-    RAG_AVAILABLE = True
-except ImportError:
-    RAG_AVAILABLE = False
+# Availability is checked without importing: sentence_transformers pulls in torch,
+# which costs seconds and hundreds of MB for callers that never use RAG
+RAG_AVAILABLE = all(
+    importlib.util.find_spec(module_name) is not None
+    for module_name in ("sentence_transformers", "faiss", "numpy")
+)
 
 __all__ = [
     # Main classes
@@ -52,7 +32,18 @@ __all__ = [
     # Functions
     'predict_gene_phenotype',
     'batch_predict_gene_phenotypes',
+    'predictions_to_frame',
     
     # Flags
     'RAG_AVAILABLE',
 ]
+
+
+def __getattr__(name):
+    # literature_context (and its embedding stack) is imported on first access
+    if name in __all__ and name != 'RAG_AVAILABLE':
+        from . import literature_context
+        value = getattr(literature_context, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
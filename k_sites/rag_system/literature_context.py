@@ -6,31 +6,216 @@ Implements comprehensive RAG capabilities with PubMed/PMC integration, semantic
 adaptive retrieval, and phenotype extraction/classification.
 """
 
+import hashlib
+import io
 import logging
 import os
+import pickle
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from typing import Dict, List, Optional, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 from pathlib import Path
 import re
 from dataclasses import dataclass, field
 from enum import Enum
 import json
 from collections import defaultdict
+from contextlib import closing
+from functools import lru_cache
+import xml.etree.ElementTree as ET
+import numpy as np
 
 # Optional imports for RAG functionality
 try:
     from sentence_transformers import SentenceTransformer
     import faiss
-    import numpy as np
     RAG_AVAILABLE = True
 except ImportError:
     RAG_AVAILABLE = False
     logging.warning("RAG libraries not available. Install sentence-transformers, faiss-cpu, numpy for full functionality.")
 
+# Faster JSON parsing of E-utilities responses when orjson is installed
+try:
+    import orjson
+    
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+# Optional int8 ONNX Runtime encoder (opt in with K_SITES_USE_ONNX=1)
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Corpus size at which the exact index is replaced by IVF-PQ. PQ with 8-bit codes and
+# ~4*sqrt(N) inverted lists needs roughly 39 training vectors per list.
+IVF_PQ_MIN_DOCUMENTS = 25000
+IVF_PQ_NPROBE = 16
+
+
+# PMIDs per EFetch request (NCBI recommends POSTing beyond ~200 IDs)
+PUBMED_EFETCH_CHUNK = 200
+
+# Concurrent E-utilities requests; NCBI allows 3/s without an API key, 10/s with one
+NCBI_WORKERS = 3
+NCBI_WORKERS_WITH_KEY = 10
+
+# Phenotype predictions are reused for this long (new PubMed records are picked up after it)
+PREDICTION_CACHE_TTL = 7 * 24 * 3600
+
+# Genes predicted concurrently by batch_predict_phenotypes
+PREDICTION_WORKERS = 8
+
+# Texts whose extracted phenotypes are kept by PhenotypeExtractor
+PHENOTYPE_CACHE_SIZE = 10000
+
+# Per-document severity counts kept by PhenotypeExtractor (abstracts recur across genes)
+SEVERITY_COUNT_CACHE_SIZE = 10000
+
+# Embeddings are stored on disk (SQLite cache, saved stores) at half precision; MiniLM
+# cosine scores barely move, and reads are half the bytes. They are widened to
+# float32 in memory because NumPy/BLAS have no fast float16 matmul on CPU.
+EMBEDDING_STORAGE_DTYPE = 'float16'
+
+# PMIDs per SQLite lookup (stays under SQLITE_MAX_VARIABLE_NUMBER on old builds)
+EMBEDDING_CACHE_LOOKUP_CHUNK = 500
+
+
+def _get_cache_dir() -> Path:
+    """Get the cache directory path."""
+    return Path.home() / ".openclaw" / "workspace" / "k-sites" / ".cache"
+
+
+def _get_onnx_model_dir(model_name: str) -> Path:
+    """Get the directory holding the exported, quantized ONNX model."""
+    return _get_cache_dir() / "onnx" / model_name
+
+
+def _get_literature_cache_file() -> Path:
+    """Get the SQLite file holding document embeddings and phenotype predictions."""
+    cache_dir = _get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / "literature_cache.sqlite"
+
+
+def _connect_literature_cache() -> sqlite3.Connection:
+    """Open the literature cache, creating its tables on first use."""
+    connection = sqlite3.connect(str(_get_literature_cache_file()), timeout=30)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS embeddings (
+            model TEXT NOT NULL,
+            pmid TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            embedding BLOB NOT NULL,
+            PRIMARY KEY (model, pmid)
+        )
+    """)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS predictions (
+            cache_key TEXT PRIMARY KEY,
+            created REAL NOT NULL,
+            prediction BLOB NOT NULL
+        )
+    """)
+    return connection
+
+
+def _text_hash(text: str) -> str:
+    """Digest of the embedded text, so edited records (e.g. added full text) are re-encoded."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class OnnxSentenceEncoder:
+    """
+    Dynamically int8-quantized ONNX Runtime replacement for SentenceTransformer.encode.
+    
+    Reproduces the all-MiniLM pipeline (fast tokenizer, mean pooling over the
+    attention mask, L2 normalization). The export and quantization happen once
+    and are cached on disk.
+    """
+    
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        hub_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        model_dir = _get_onnx_model_dir(hub_name.replace("/", "__"))
+        quantized_file = "model_quantized.onnx"
+        
+        if not (model_dir / quantized_file).exists():
+            exported = ORTModelForFeatureExtraction.from_pretrained(hub_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(exported)
+            quantizer.quantize(
+                save_dir=model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+            )
+            AutoTokenizer.from_pretrained(hub_name, use_fast=True).save_pretrained(model_dir)
+            logger.info(f"Exported int8 ONNX model for {hub_name} to {model_dir}")
+        
+        self.model = ORTModelForFeatureExtraction.from_pretrained(model_dir, file_name=quantized_file)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+    
+    def encode(self, texts: List[str], batch_size: int = 64, **kwargs) -> "np.ndarray":
+        """Encode texts to L2-normalized float32 embeddings (extra kwargs are ignored)."""
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                    max_length=256, return_tensors="np")
+            hidden = self.model(**tokens).last_hidden_state
+            mask = tokens["attention_mask"][..., None].astype('float32')
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None))
+        return np.vstack(batches).astype('float32') if batches else np.zeros((0, 0), dtype='float32')
+
+
+_encoder_load_lock = threading.Lock()
+
+
+def _load_encoder(model_name: str):
+    """
+    Return the shared sentence encoder for model_name, loading it on first use.
+    
+    lru_cache alone does not serialize concurrent misses, so the lock keeps
+    parallel predictions on a cold process from each loading their own copy.
+    """
+    with _encoder_load_lock:
+        return _create_encoder(model_name)
+
+
+@lru_cache(maxsize=4)
+def _create_encoder(model_name: str):
+    """
+    Load the sentence encoder, preferring int8 ONNX when K_SITES_USE_ONNX is set.
+    
+    Cached, so every vector store in the process shares one copy of the weights
+    (and forked workers share its pages copy-on-write).
+    """
+    if os.getenv('K_SITES_USE_ONNX', '').lower() in ('1', 'true', 'yes'):
+        if ONNX_AVAILABLE:
+            try:
+                return OnnxSentenceEncoder(model_name)
+            except Exception as e:
+                logger.warning(f"ONNX encoder unavailable, using sentence-transformers: {e}")
+        else:
+            logger.warning("K_SITES_USE_ONNX is set but optimum[onnxruntime] is not installed")
+    return SentenceTransformer(model_name)
+
+
+# The shared encoder's HF fast tokenizer is not thread-safe ("Already borrowed"),
+# so concurrent predictions take turns calling encode()
+_encoder_lock = threading.Lock()
+
 # Define phenotype severity categories
 class PhenotypeSeverity(Enum):
     LETHAL = "LETHAL"
@@ -46,6 +231,17 @@ class RiskLevel(Enum):
     LOW = "LOW"
     UNKNOWN = "UNKNOWN"
 
+# Patterns with no regex syntax (lowercase words, spaces, hyphens, %) match as plain substrings
+_LITERAL_PATTERN = re.compile(r"[a-z0-9 %-]+")
+
+# Severity levels from most to least severe, with the label used in reasoning text
+SEVERITY_LEVELS = (
+    (PhenotypeSeverity.LETHAL, "Lethality terms"),
+    (PhenotypeSeverity.SEVERE, "Severe phenotype terms"),
+    (PhenotypeSeverity.MODERATE, "Moderate phenotype terms"),
+    (PhenotypeSeverity.MILD, "Mild phenotype terms"),
+)
+
 @dataclass
 class PhenotypePrediction:
     severity: PhenotypeSeverity
@@ -83,6 +279,43 @@ class LiteratureMiner:
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
         self.pmc_base_url = "https://www.ncbi.nlm.nih.gov/pmc/articles/"
         self.oai_base_url = "https://www.ncbi.nlm.nih.gov/pmc/oai/oai.cgi"
+        # Pooled keep-alive connections, shared by worker threads in batch searches
+        self.session = self._build_session()
+        # Request start times are spaced out across threads by a shared schedule
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+    
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """
+        Build a session that reuses TLS connections to NCBI and retries transient failures.
+        
+        The pool is sized for the largest batch worker count, so concurrent
+        gene searches never open throwaway connections.
+        """
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=NCBI_WORKERS_WITH_KEY, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _wait_for_rate_limit(self) -> None:
+        """Block until this thread may start an NCBI request."""
+        # NCBI allows 3 requests/second without API key, 10/second with
+        interval = 0.1 if self.api_key else 0.35
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_time)
+            self._next_request_time = start + interval
+        if start > now:
+            time.sleep(start - now)
         
     def _make_request(self, endpoint: str, params: Dict, timeout: int = 30) -> Optional[Dict]:
         """Make a request to NCBI E-Utilities with rate limiting."""
@@ -90,12 +323,10 @@ class LiteratureMiner:
             if self.api_key:
                 params["api_key"] = self.api_key
             
-            response = requests.get(self.base_url + endpoint, params=params, timeout=timeout)
+            self._wait_for_rate_limit()
+            response = self.session.get(self.base_url + endpoint, params=params, timeout=timeout)
             response.raise_for_status()
             
-            # Rate limiting - NCBI allows 3 requests/second without API key, 10/second with
-            time.sleep(0.2 if self.api_key else 0.35)
-            
             return response
         except Exception as e:
             logger.error(f"Error in NCBI request: {str(e)}")
@@ -116,18 +347,40 @@ class LiteratureMiner:
             List of LiteratureRecord objects
         """
         # Smart query construction based on search type
-        query_templates = {
-            "knockout": f"{gene_symbol}[Gene] AND (knockout[Title/Abstract] OR knockout[MeSH Terms] OR 'gene knockout'[Title/Abstract] OR deletion[Title/Abstract])",
-            "phenotype": f"{gene_symbol}[Gene] AND (phenotype[Title/Abstract] OR phenotypic[Title/Abstract] OR 'mutant phenotype'[Title/Abstract] OR morphological[Title/Abstract])",
-            "viability": f"{gene_symbol}[Gene] AND (viability[Title/Abstract] OR viable[Title/Abstract] OR lethal[Title/Abstract] OR lethality[Title/Abstract] OR survival[Title/Abstract] OR 'embryonic lethal'[Title/Abstract])",
-            "crispr": f"{gene_symbol}[Gene] AND (CRISPR[Title/Abstract] OR 'guide RNA'[Title/Abstract] OR gRNA[Title/Abstract] OR 'gene editing'[Title/Abstract])",
-            "compensatory": f"{gene_symbol}[Gene] AND (compensatory[Title/Abstract] OR compensation[Title/Abstract] OR 'redundant gene'[Title/Abstract] OR paralog[Title/Abstract] OR 'genetic buffering'[Title/Abstract])",
-            "comprehensive": f"{gene_symbol}[Gene] AND (knockout[Title/Abstract] OR phenotype[Title/Abstract] OR mutant[Title/Abstract] OR viability[Title/Abstract] OR CRISPR[Title/Abstract])"
-        }
-        
-        query = query_templates.get(search_type, query_templates["comprehensive"])
+        query = self._build_query(gene_symbol, [search_type])
         
         # Step 1: Search for PMIDs
+        id_list = self._search_pmids(query, retmax)
+        
+        if not id_list:
+            logger.info(f"No publications found for gene {gene_symbol} with search type {search_type}")
+            return []
+        
+        # Step 2: Fetch detailed records
+        return self._fetch_pubmed_details(id_list[:min(50, retmax)])
+    
+    @staticmethod
+    def _build_query(gene_symbol: str, search_types: List[str]) -> str:
+        """Build one ESearch term covering the given search types (OR-ed together)."""
+        query_clauses = {
+            "knockout": "knockout[Title/Abstract] OR knockout[MeSH Terms] OR 'gene knockout'[Title/Abstract] OR deletion[Title/Abstract]",
+            "phenotype": "phenotype[Title/Abstract] OR phenotypic[Title/Abstract] OR 'mutant phenotype'[Title/Abstract] OR morphological[Title/Abstract]",
+            "viability": "viability[Title/Abstract] OR viable[Title/Abstract] OR lethal[Title/Abstract] OR lethality[Title/Abstract] OR survival[Title/Abstract] OR 'embryonic lethal'[Title/Abstract]",
+            "crispr": "CRISPR[Title/Abstract] OR 'guide RNA'[Title/Abstract] OR gRNA[Title/Abstract] OR 'gene editing'[Title/Abstract]",
+            "compensatory": "compensatory[Title/Abstract] OR compensation[Title/Abstract] OR 'redundant gene'[Title/Abstract] OR paralog[Title/Abstract] OR 'genetic buffering'[Title/Abstract]",
+            "comprehensive": "knockout[Title/Abstract] OR phenotype[Title/Abstract] OR mutant[Title/Abstract] OR viability[Title/Abstract] OR CRISPR[Title/Abstract]"
+        }
+        clauses = []
+        for search_type in search_types:
+            clause = query_clauses.get(search_type, query_clauses["comprehensive"])
+            if clause not in clauses:
+                clauses.append(clause)
+        if len(clauses) == 1:
+            return f"{gene_symbol}[Gene] AND ({clauses[0]})"
+        return f"{gene_symbol}[Gene] AND (" + " OR ".join(f"({clause})" for clause in clauses) + ")"
+    
+    def _search_pmids(self, query: str, retmax: int) -> List[str]:
+        """Run an ESearch and return the matching PMIDs (most relevant first)."""
         search_params = {
             "db": "pubmed",
             "term": query,
@@ -142,24 +395,23 @@ class LiteratureMiner:
             return []
         
         try:
-            search_results = response.json()
-            id_list = search_results.get("esearchresult", {}).get("idlist", [])
+            search_results = _json_loads(response.content)
+            return search_results.get("esearchresult", {}).get("idlist", [])
         except:
             logger.error("Failed to parse PubMed search response")
             return []
-        
-        if not id_list:
-            logger.info(f"No publications found for gene {gene_symbol} with search type {search_type}")
-            return []
-        
-        # Step 2: Fetch detailed records
-        return self._fetch_pubmed_details(id_list[:min(50, retmax)])
     
     def _fetch_pubmed_details(self, pmid_list: List[str]) -> List[LiteratureRecord]:
         """Fetch detailed PubMed records including abstracts."""
         if not pmid_list:
             return []
         
+        if len(pmid_list) > PUBMED_EFETCH_CHUNK:
+            records = []
+            for start in range(0, len(pmid_list), PUBMED_EFETCH_CHUNK):
+                records.extend(self._fetch_pubmed_details(pmid_list[start:start + PUBMED_EFETCH_CHUNK]))
+            return records
+        
         fetch_params = {
             "db": "pubmed",
             "id": ",".join(pmid_list),
@@ -172,14 +424,16 @@ class LiteratureMiner:
             return []
         
         try:
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-            
+            # Stream articles and free each one once parsed, so large EFetch
+            # responses never sit in memory as a full tree
             records = []
-            for article in root.findall('.//PubmedArticle'):
+            for _, article in ET.iterparse(io.BytesIO(response.content), events=("end",)):
+                if article.tag != 'PubmedArticle':
+                    continue
                 record = self._parse_pubmed_article(article)
                 if record:
                     records.append(record)
+                article.clear()
             
             return records
         except Exception as e:
@@ -189,8 +443,6 @@ class LiteratureMiner:
     def _parse_pubmed_article(self, article) -> Optional[LiteratureRecord]:
         """Parse a PubMed XML article into a LiteratureRecord."""
         try:
-            import xml.etree.ElementTree as ET
-            
             # Get PMID
             pmid_elem = article.find('.//PMID')
             pmid = pmid_elem.text if pmid_elem is not None else ""
@@ -202,15 +454,16 @@ class LiteratureMiner:
                     pmcid = article_id.text
                     break
             
-            # Get title
+            # Get title (itertext keeps text inside inline markup such as <i> and <sup>)
             title_elem = article.find('.//ArticleTitle')
-            title = title_elem.text if title_elem is not None else ""
+            title = "".join(title_elem.itertext()).strip() if title_elem is not None else ""
             
-            # Get abstract
+            # Get abstract (structured abstracts have one AbstractText per section)
             abstract_texts = []
             for abstract in article.findall('.//Abstract/AbstractText'):
-                if abstract.text:
-                    abstract_texts.append(abstract.text)
+                abstract_text = "".join(abstract.itertext()).strip()
+                if abstract_text:
+                    abstract_texts.append(abstract_text)
             abstract = " ".join(abstract_texts)
             
             # Get authors
@@ -233,6 +486,10 @@ class LiteratureMiner:
             year_elem = article.find('.//PubDate/Year')
             if year_elem is not None and year_elem.text:
                 pub_date = year_elem.text
+            else:
+                medline_date = article.find('.//PubDate/MedlineDate')
+                if medline_date is not None and medline_date.text:
+                    pub_date = medline_date.text[:4]
             
             # Get DOI
             doi = None
@@ -287,11 +544,10 @@ class LiteratureMiner:
                 "metadataPrefix": "pmc"
             }
             
-            response = requests.get(self.oai_base_url, params=params, timeout=30)
+            response = self.session.get(self.oai_base_url, params=params, timeout=30)
             response.raise_for_status()
             
             # Parse XML to extract full text
-            import xml.etree.ElementTree as ET
             root = ET.fromstring(response.content)
             
             # Extract body text
@@ -323,33 +579,47 @@ class LiteratureMiner:
         if search_types is None:
             search_types = ["knockout", "phenotype", "viability", "crispr", "compensatory", "comprehensive"]
         
-        results = {}
+        # Genes are searched concurrently; the shared rate limiter keeps the
+        # request rate within NCBI's limits. Full texts use their own pool so
+        # gene workers never wait on tasks queued behind themselves.
+        workers = NCBI_WORKERS_WITH_KEY if self.api_key else NCBI_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as gene_executor, \
+                ThreadPoolExecutor(max_workers=workers) as fulltext_executor:
+            gene_results = gene_executor.map(
+                lambda gene_symbol: self._search_gene(gene_symbol, search_types, fulltext_executor),
+                gene_symbols
+            )
+            return dict(zip(gene_symbols, gene_results))
+    
+    def _search_gene(self, gene_symbol: str, search_types: List[str],
+                     executor: ThreadPoolExecutor) -> List[LiteratureRecord]:
+        """
+        Search one gene with all search types in a single ESearch.
         
-        for gene_symbol in gene_symbols:
-            logger.info(f"Batch searching literature for gene: {gene_symbol}")
-            
-            gene_publications = []
-            seen_pmids = set()
-            
-            for search_type in search_types:
-                pubs = self.search_pubmed(gene_symbol, search_type, retmax=50)
-                
-                for pub in pubs:
-                    if pub.pmid not in seen_pmids:
-                        seen_pmids.add(pub.pmid)
-                        gene_publications.append(pub)
-                        
-                        # Try to fetch full text if PMC ID available
-                        if pub.pmcid:
-                            full_text = self.fetch_pmc_fulltext(pub.pmcid)
-                            if full_text:
-                                pub.full_text = full_text
-                                pub.evidence_quality = "high"  # Full text available
-            
-            results[gene_symbol] = gene_publications
-            logger.info(f"Found {len(gene_publications)} unique publications for {gene_symbol}")
+        The OR-ed query returns the union of the per-type searches, so one
+        request replaces one per search type.
+        """
+        logger.info(f"Batch searching literature for gene: {gene_symbol}")
         
-        return results
+        query = self._build_query(gene_symbol, search_types)
+        gene_publications = []
+        seen_pmids = set()
+        for pub in self._fetch_pubmed_details(self._search_pmids(query, 50 * len(search_types))):
+            if pub.pmid not in seen_pmids:
+                seen_pmids.add(pub.pmid)
+                gene_publications.append(pub)
+        
+        # Try to fetch full text if PMC ID available
+        with_pmc = [pub for pub in gene_publications if pub.pmcid]
+        full_texts = [executor.submit(self.fetch_pmc_fulltext, pub.pmcid) for pub in with_pmc]
+        for pub, future in zip(with_pmc, full_texts):
+            full_text = future.result()
+            if full_text:
+                pub.full_text = full_text
+                pub.evidence_quality = "high"  # Full text available
+        
+        logger.info(f"Found {len(gene_publications)} unique publications for {gene_symbol}")
+        return gene_publications
 
 
 class DiversityAwareVectorStore:
@@ -367,7 +637,7 @@ class DiversityAwareVectorStore:
             self.embeddings = None
         else:
             try:
-                self.model = SentenceTransformer(model_name)
+                self.model = _load_encoder(model_name)
                 logger.info(f"Loaded sentence transformer model: {model_name}")
             except Exception as e:
                 logger.error(f"Could not load sentence transformer model: {e}")
@@ -376,15 +646,127 @@ class DiversityAwareVectorStore:
             self.index = None
             self.documents = []
             self.embeddings = None
+            # Cached embeddings are only valid for the encoder that produced them
+            encoder = "onnx-int8" if isinstance(self.model, OnnxSentenceEncoder) else "st"
+            self.embedding_namespace = f"{model_name}:{encoder}:fp16"
+    
+    def _encode_with_cache(self, documents: List[LiteratureRecord], texts: List[str],
+                           extra_texts: Optional[List[str]] = None) -> Tuple["np.ndarray", Optional["np.ndarray"]]:
+        """
+        Return normalized embeddings for documents, encoding only PMIDs not cached on disk.
+        
+        Any extra_texts (e.g. search queries) are encoded in the same model call as the
+        cache misses and returned separately, uncached.
+        
+        Falls back to encoding everything if the cache cannot be read or written.
+        """
+        hashes = [_text_hash(text) for text in texts]
+        cached = {}
+        try:
+            with closing(_connect_literature_cache()) as connection, connection:
+                pmids = list({doc.pmid for doc in documents})
+                for start in range(0, len(pmids), EMBEDDING_CACHE_LOOKUP_CHUNK):
+                    chunk = pmids[start:start + EMBEDDING_CACHE_LOOKUP_CHUNK]
+                    rows = connection.execute(
+                        f"SELECT pmid, text_hash, embedding FROM embeddings "
+                        f"WHERE model = ? AND pmid IN ({','.join('?' * len(chunk))})",
+                        [self.embedding_namespace, *chunk]
+                    )
+                    for pmid, text_hash, blob in rows:
+                        cached[pmid] = (text_hash, np.frombuffer(blob, dtype=EMBEDDING_STORAGE_DTYPE))
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache unavailable: {e}")
+        
+        misses = [
+            i for i, doc in enumerate(documents)
+            if doc.pmid not in cached or cached[doc.pmid][0] != hashes[i]
+        ]
+        extra_texts = list(extra_texts or [])
+        encoded = {}
+        extra_embeddings = None
+        if misses or extra_texts:
+            # One encode call for misses and extras; the model batches them internally
+            fresh = self._normalize(
+                self._encode([texts[i] for i in misses] + extra_texts)
+            )
+            if extra_texts:
+                extra_embeddings = fresh[len(misses):]
+            # Rounded to the storage dtype up front so fresh and cached rows score identically
+            encoded = dict(zip(misses, fresh[:len(misses)].astype(EMBEDDING_STORAGE_DTYPE)))
+        if encoded:
+            try:
+                with closing(_connect_literature_cache()) as connection, connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, pmid, text_hash, embedding) VALUES (?, ?, ?, ?)",
+                        [
+                            (self.embedding_namespace, documents[i].pmid, hashes[i], embedding.tobytes())
+                            for i, embedding in encoded.items()
+                        ]
+                    )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Could not update embedding cache: {e}")
+        
+        logger.debug(f"Embedding cache: {len(documents) - len(misses)} hits, {len(misses)} encoded")
+        embeddings = np.stack([
+            encoded[i] if i in encoded else cached[doc.pmid][1]
+            for i, doc in enumerate(documents)
+        ]).astype('float32')
+        return embeddings, extra_embeddings
     
-    def add_documents(self, documents: List[LiteratureRecord]):
-        """Add documents to the vector store."""
+    def save(self, path: str) -> None:
+        """
+        Persist the index, embeddings and documents next to each other.
+        
+        Writes {path}.npy and {path}.docs.pkl, plus {path}.faiss when the store
+        is large enough to have an IVF-PQ index.
+        """
+        if self.embeddings is None:
+            logger.warning("Nothing to save: vector store is empty")
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        if self.index is not None:
+            faiss.write_index(self.index, f"{path}.faiss")
+        else:
+            Path(f"{path}.faiss").unlink(missing_ok=True)
+        np.save(f"{path}.npy", self.embeddings.astype(EMBEDDING_STORAGE_DTYPE))
+        with open(f"{path}.docs.pkl", "wb") as f:
+            pickle.dump(self.documents, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Saved vector store with {len(self.documents)} documents to {path}")
+    
+    def load(self, path: str) -> bool:
+        """
+        Load a store written by save(), replacing the current contents.
+        
+        Returns:
+            True if the store was loaded
+        """
+        if not RAG_AVAILABLE or not Path(f"{path}.npy").exists():
+            return False
+        self.index = faiss.read_index(f"{path}.faiss") if Path(f"{path}.faiss").exists() else None
+        if isinstance(self.index, faiss.IndexIVFPQ):
+            # Keep RAM low, as when the index was built
+            self.index.use_precomputed_table = -1
+            self.index.precomputed_table.resize(0)
+        self.embeddings = np.load(f"{path}.npy").astype('float32')
+        with open(f"{path}.docs.pkl", "rb") as f:
+            self.documents = pickle.load(f)
+        logger.info(f"Loaded vector store with {len(self.documents)} documents from {path}")
+        return True
+    
+    def add_documents(self, documents: List[LiteratureRecord],
+                      queries: Optional[List[str]] = None) -> Optional["np.ndarray"]:
+        """
+        Add documents to the vector store.
+        
+        If queries are given they are encoded in the same batch as the documents and
+        their normalized embeddings are returned, ready for search_batch(query_embeddings=...).
+        """
         if not RAG_AVAILABLE or self.model is None:
             logger.warning("Cannot add documents: RAG libraries not available")
-            return
+            return None
         
         if not documents:
-            return
+            return None
         
         # Prepare text for embedding
         texts = []
@@ -394,22 +776,75 @@ class DiversityAwareVectorStore:
                 text += f" {doc.full_text[:2000]}"  # Add first 2000 chars of full text
             texts.append(text)
         
-        # Generate embeddings
-        embeddings = self.model.encode(texts, show_progress_bar=False)
+        # Unit-length embeddings (inner product equals cosine), reusing cached PMIDs
+        embeddings, query_embeddings = self._encode_with_cache(documents, texts, queries)
         
-        # Create FAISS index if doesn't exist
-        if self.index is None:
-            dimension = embeddings.shape[1]
-            self.index = faiss.IndexFlatL2(dimension)
+        if self.embeddings is None:
             self.embeddings = embeddings
         else:
             self.embeddings = np.vstack([self.embeddings, embeddings])
         
-        # Add to index
-        self.index.add(embeddings.astype('float32'))
+        # Small (per-gene) corpora are searched exactly with a matmul over the raw
+        # embeddings; an IVF-PQ index is built once the corpus is large enough to train
+        if self.index is not None:
+            self.index.add(embeddings)
+        elif len(self.embeddings) >= IVF_PQ_MIN_DOCUMENTS:
+            self.index = self._build_index(self.embeddings)
         self.documents.extend(documents)
         
         logger.info(f"Added {len(documents)} documents to vector store (total: {len(self.documents)})")
+        return query_embeddings
+    
+    def _encode(self, texts: List[str]):
+        """Encode texts with the shared encoder, one thread at a time."""
+        with _encoder_lock:
+            return self.model.encode(texts, show_progress_bar=False)
+    
+    @staticmethod
+    def _normalize(embeddings) -> "np.ndarray":
+        """Return float32 embeddings scaled to unit L2 norm."""
+        embeddings = np.asarray(embeddings, dtype='float32')
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return np.ascontiguousarray(embeddings / np.maximum(norms, 1e-12))
+    
+    def _exact_search(self, query_embeddings: "np.ndarray", k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Top-k cosine search over all stored embeddings with one matmul.
+        
+        Returns (scores, indices) shaped like faiss Index.search, best first.
+        """
+        scores = query_embeddings @ self.embeddings.T
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            empty = np.zeros((len(query_embeddings), 0))
+            return empty, empty.astype(np.int64)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+    
+    @staticmethod
+    def _build_index(embeddings):
+        """
+        Build an IVF-PQ cosine (inner-product) index over normalized embeddings.
+        
+        Probes IVF_PQ_NPROBE of ~4*sqrt(N) lists instead of scanning every
+        vector and stores 8-bit PQ codes instead of full float32 vectors.
+        """
+        count, dimension = embeddings.shape
+        nlist = min(4096, max(32, int(4 * np.sqrt(count))))
+        # Sub-quantizer count must divide the embedding dimension
+        m = next(m for m in (48, 32, 24, 16, 8, 4, 2, 1) if dimension % m == 0)
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFPQ(quantizer, dimension, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+        index.nprobe = IVF_PQ_NPROBE
+        # Precomputed tables trade nlist * m * 256 floats of RAM for a small speedup
+        index.use_precomputed_table = -1
+        index.precomputed_table.resize(0)
+        index.add(embeddings)
+        logger.info(f"Built IVF-PQ index over {count} documents (nlist={nlist}, m={m})")
+        return index
     
     def search(self, query: str, k: int = 10, relevance_threshold: float = 0.7,
                diversity_weight: float = 0.3, context_aware: bool = True) -> List[Tuple[LiteratureRecord, float]]:
@@ -426,44 +861,71 @@ class DiversityAwareVectorStore:
         Returns:
             List of tuples (document, adjusted_score)
         """
-        if not RAG_AVAILABLE or self.model is None or self.index is None:
+        return self.search_batch([query], k, relevance_threshold, diversity_weight, context_aware)[0]
+    
+    def search_batch(self, queries: List[str], k: int = 10, relevance_threshold: float = 0.7,
+                     diversity_weight: float = 0.3, context_aware: bool = True,
+                     query_embeddings: Optional["np.ndarray"] = None) -> List[List[Tuple[LiteratureRecord, float]]]:
+        """
+        Run several searches with one encode call and one index lookup.
+        
+        Takes the same options as search(), applied to every query. Pass
+        query_embeddings (as returned by add_documents) to skip encoding.
+        
+        Returns:
+            One list of (document, adjusted_score) tuples per query, in query order
+        """
+        if not RAG_AVAILABLE or self.model is None or self.embeddings is None:
             logger.warning("Cannot perform search: RAG libraries not available or index empty")
+            return [[] for _ in queries]
+        if not queries:
             return []
         
         # Context-aware k selection
-        if context_aware:
-            k = self._adapt_k_for_context(query, k)
+        ks = [self._adapt_k_for_context(query, k) if context_aware else k for query in queries]
         
-        # Generate query embedding
-        query_embedding = self.model.encode([query])
+        # Encode all queries together (normalized like the documents)
+        if query_embeddings is None:
+            query_embeddings = self._normalize(self._encode(queries))
         
         # Search for more results than needed for diversity reranking
-        search_k = min(k * 3, len(self.documents))
-        
-        # Perform similarity search
-        distances, indices = self.index.search(query_embedding.astype('float32'), search_k)
+        search_ks = [min(query_k * 3, len(self.documents)) for query_k in ks]
         
-        # Convert distances to similarities (FAISS returns L2 distances)
-        # Convert: similarity = 1 / (1 + distance)
-        similarities = 1.0 / (1.0 + distances[0])
+        # Perform similarity search; rows are ranked, so each query keeps its own prefix
+        if self.index is None:
+            cosines, indices = self._exact_search(query_embeddings, max(search_ks))
+        else:
+            cosines, indices = self.index.search(query_embeddings, max(search_ks))
         
-        # Filter by relevance threshold
-        candidates = []
-        for idx, sim in zip(indices[0], similarities):
-            if idx < len(self.documents) and sim >= relevance_threshold:
-                candidates.append((self.documents[idx], float(sim), idx))
+        # Keep the original 1 / (1 + squared L2) scale so relevance thresholds are
+        # unchanged: for unit vectors squared L2 = 2 - 2 * cosine
+        similarities = 1.0 / (3.0 - 2.0 * cosines)
         
-        if not candidates:
-            return []
-        
-        # Apply diversity weighting using Maximal Marginal Relevance (MMR)
-        if diversity_weight > 0 and len(candidates) > k:
-            selected = self._maximal_marginal_relevance(candidates, k, diversity_weight)
-        else:
-            selected = candidates[:k]
+        results = []
+        for row, query in enumerate(queries):
+            query_k = ks[row]
+            search_k = search_ks[row]
+            
+            # Filter by relevance threshold (IVF-PQ pads short result lists with -1)
+            candidates = []
+            for idx, sim in zip(indices[row][:search_k], similarities[row][:search_k]):
+                if 0 <= idx < len(self.documents) and sim >= relevance_threshold:
+                    candidates.append((self.documents[idx], float(sim), idx))
+            
+            if not candidates:
+                results.append([])
+                continue
+            
+            # Apply diversity weighting using Maximal Marginal Relevance (MMR)
+            if diversity_weight > 0 and len(candidates) > query_k:
+                selected = self._maximal_marginal_relevance(candidates, query_k, diversity_weight)
+            else:
+                selected = candidates[:query_k]
+            
+            logger.info(f"Retrieved {len(selected)} diverse documents for query: {query[:50]}...")
+            results.append([(doc, score) for doc, score, _ in selected])
         
-        logger.info(f"Retrieved {len(selected)} diverse documents for query: {query[:50]}...")
-        return [(doc, score) for doc, score, _ in selected]
+        return results
     
     def _adapt_k_for_context(self, query: str, base_k: int) -> int:
         """
@@ -616,6 +1078,70 @@ class PhenotypeExtractor:
             r"backup\s+gene", r"functional\s+redundancy", r"gene\s+duplication",
             r"homeostatic\s+mechanism", r"feedback\s+mechanism"
         ]
+        
+        # Lethality stages, checked in order
+        self.lethality_stages = [
+            (r"embryonic\s+lethal|embryo\s+lethal|prenatal\s+lethal|e\d+\.\d", "Embryonic"),
+            (r"perinatal\s+lethal|perinatal\s+death|birth\s+lethal", "Perinatal"),
+            (r"postnatal\s+lethal|adult\s+lethal|juvenile\s+lethal|p\d+\.\d", "Postnatal"),
+            (r"larval\s+lethal|l\d+\s+lethal", "Larval"),
+            (r"neonatal\s+lethal|newborn\s+lethal", "Neonatal")
+        ]
+        
+        # Compile every pattern once, plus one alternation per group that rejects
+        # texts with no match in a single scan before the per-pattern passes
+        self._phenotype_matchers = {
+            category: self._compile_patterns(patterns)
+            for category, patterns in self.phenotype_patterns.items()
+        }
+        self._severity_matchers = {
+            severity: self._compile_patterns(patterns)
+            for severity, patterns in self.severity_indicators.items()
+        }
+        self._compensatory_matcher = self._compile_patterns(self.compensatory_patterns)
+        self._lethality_stage_regexes = [
+            (re.compile(pattern), stage) for pattern, stage in self.lethality_stages
+        ]
+        self._severity_count_cache: Dict[str, np.ndarray] = {}
+        self._phenotype_cache: Dict[str, List[Dict]] = {}
+        # Guards cache eviction when one extractor serves several threads
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def _compile_patterns(patterns: List[str]) -> Tuple["re.Pattern", List]:
+        """
+        Compile patterns individually and as a single any-of prefilter.
+        
+        Patterns are written in lowercase and only ever run on lowercased text, so
+        they are compiled without re.IGNORECASE (which disables SRE's literal-prefix
+        fast paths). Plain lowercase words are kept as strings and matched with str.count /
+        str.find on the lowercased text; everything else becomes a re.Pattern.
+        """
+        prefilter = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+        matchers = [
+            pattern if _LITERAL_PATTERN.fullmatch(pattern) else re.compile(pattern)
+            for pattern in patterns
+        ]
+        return prefilter, matchers
+    
+    @staticmethod
+    def _count_matches(matcher, text_lower: str) -> int:
+        """Count non-overlapping matches of a literal or compiled pattern."""
+        if isinstance(matcher, str):
+            return text_lower.count(matcher)
+        return sum(1 for _ in matcher.finditer(text_lower))
+    
+    @staticmethod
+    def _iter_spans(matcher, text_lower: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) of non-overlapping matches, in order."""
+        if isinstance(matcher, str):
+            start = text_lower.find(matcher)
+            while start != -1:
+                yield start, start + len(matcher)
+                start = text_lower.find(matcher, start + len(matcher))
+        else:
+            for match in matcher.finditer(text_lower):
+                yield match.span()
     
     def extract_phenotypes_from_text(self, text: str) -> List[Dict]:
         """
@@ -625,31 +1151,44 @@ class PhenotypeExtractor:
             text: Text to extract phenotypes from
             
         Returns:
-            List of extracted phenotypes with details
+            List of extracted phenotypes with details; "context_span" holds
+            offsets into text (see get_context)
         """
         if not text:
             return []
         
+        # The same abstracts come back for several queries and genes
+        key = _text_hash(text)
+        cached = self._phenotype_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
         phenotypes = []
         text_lower = text.lower()
         
         # Check for each phenotype category
-        for category, patterns in self.phenotype_patterns.items():
-            for pattern in patterns:
-                for match in re.finditer(pattern, text_lower, re.IGNORECASE):
-                    context_start = max(0, match.start() - 100)
-                    context_end = min(len(text), match.end() + 100)
+        for category, (prefilter, matchers) in self._phenotype_matchers.items():
+            if not prefilter.search(text_lower):
+                continue
+            for matcher in matchers:
+                for start, end in self._iter_spans(matcher, text_lower):
+                    context_start = max(0, start - 100)
+                    context_end = min(len(text), end + 100)
                     
                     phenotype = {
                         "category": category,
-                        "term": match.group(),
-                        "position": match.span(),
-                        "context": text[context_start:context_end].strip(),
+                        "term": text_lower[start:end],
+                        "position": (start, end),
+                        "context_span": (context_start, context_end),
                         "evidence_quality": "high" if len(text) > 500 else "medium"
                     }
                     phenotypes.append(phenotype)
         
-        return phenotypes
+        with self._cache_lock:
+            if len(self._phenotype_cache) >= PHENOTYPE_CACHE_SIZE:
+                self._phenotype_cache.pop(next(iter(self._phenotype_cache)))
+            self._phenotype_cache[key] = phenotypes
+        return list(phenotypes)
     
     def extract_compensatory_mechanisms(self, text: str) -> List[Dict]:
         """Extract compensatory mechanism mentions from text."""
@@ -659,23 +1198,42 @@ class PhenotypeExtractor:
         mechanisms = []
         text_lower = text.lower()
         
-        for pattern in self.compensatory_patterns:
-            for match in re.finditer(pattern, text_lower, re.IGNORECASE):
-                context_start = max(0, match.start() - 150)
-                context_end = min(len(text), match.end() + 150)
+        prefilter, matchers = self._compensatory_matcher
+        if not prefilter.search(text_lower):
+            return []
+        
+        for matcher in matchers:
+            for start, end in self._iter_spans(matcher, text_lower):
+                context_start = max(0, start - 150)
+                context_end = min(len(text), end + 150)
+                term = text_lower[start:end]
                 
                 mechanisms.append({
-                    "term": match.group(),
-                    "context": text[context_start:context_end].strip(),
-                    "confidence": "high" if "compensat" in match.group() else "medium"
+                    "term": term,
+                    "context_span": (context_start, context_end),
+                    "confidence": "high" if "compensat" in term else "medium"
                 })
         
         return mechanisms
     
-    def classify_severity(self, phenotypes: List[Dict], text: str = "") -> Tuple[PhenotypeSeverity, str]:
+    @staticmethod
+    def get_context(text: str, span: Tuple[int, int]) -> str:
+        """
+        Return the context snippet for a "context_span" from the extractors.
+        
+        Snippets are sliced on demand so extraction does not allocate one per match.
+        """
+        start, end = span
+        return text[start:end].strip()
+    
+    def classify_severity(self, phenotypes: List[Dict], text: str = "",
+                          count_instances: bool = False) -> Tuple[PhenotypeSeverity, str]:
         """
         Classify the overall severity based on extracted phenotypes and text.
         
+        Stops at the first match of the highest severity level; set count_instances
+        to scan that level fully and report its match count (for auditing).
+        
         Returns:
             Tuple of (severity, reasoning)
         """
@@ -686,25 +1244,76 @@ class PhenotypeExtractor:
         for pheno in phenotypes:
             combined_text += " " + pheno.get("term", "").lower()
         
-        # Count severity indicators
-        severity_counts = {severity: 0 for severity in PhenotypeSeverity}
-        
-        for severity, patterns in self.severity_indicators.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, combined_text, re.IGNORECASE)
-                severity_counts[severity] += len(matches)
-        
-        # Determine overall severity (highest severity with at least one match)
-        if severity_counts[PhenotypeSeverity.LETHAL] > 0:
-            return PhenotypeSeverity.LETHAL, f"Lethality terms detected ({severity_counts[PhenotypeSeverity.LETHAL]} instances)"
-        elif severity_counts[PhenotypeSeverity.SEVERE] > 0:
-            return PhenotypeSeverity.SEVERE, f"Severe phenotype terms detected ({severity_counts[PhenotypeSeverity.SEVERE]} instances)"
-        elif severity_counts[PhenotypeSeverity.MODERATE] > 0:
-            return PhenotypeSeverity.MODERATE, f"Moderate phenotype terms detected ({severity_counts[PhenotypeSeverity.MODERATE]} instances)"
-        elif severity_counts[PhenotypeSeverity.MILD] > 0:
-            return PhenotypeSeverity.MILD, f"Mild phenotype terms detected ({severity_counts[PhenotypeSeverity.MILD]} instances)"
-        else:
+        # Highest severity with at least one match wins, so lower levels are only
+        # searched when every level above them has no match
+        for severity, label in SEVERITY_LEVELS:
+            prefilter, matchers = self._severity_matchers[severity]
+            if not prefilter.search(combined_text):
+                continue
+            if not count_instances:
+                return severity, f"{label} detected"
+            count = sum(self._count_matches(matcher, combined_text) for matcher in matchers)
+            return severity, f"{label} detected ({count} instances)"
+        
+        return PhenotypeSeverity.UNKNOWN, "No clear severity indicators found in literature"
+    
+    def severity_count_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Count severity indicator matches per text.
+        
+        Rows follow texts and columns follow SEVERITY_LEVELS. Counts are cached
+        per text, so abstracts shared by several genes are scanned once.
+        """
+        counts = np.zeros((len(texts), len(SEVERITY_LEVELS)), dtype=np.int32)
+        for row, text in enumerate(texts):
+            text_lower = text.lower()
+            key = _text_hash(text_lower)
+            cached = self._severity_count_cache.get(key)
+            if cached is None:
+                cached = np.array([
+                    sum(self._count_matches(matcher, text_lower) for matcher in matchers)
+                    if prefilter.search(text_lower) else 0
+                    for prefilter, matchers in (self._severity_matchers[severity] for severity, _ in SEVERITY_LEVELS)
+                ], dtype=np.int32)
+                with self._cache_lock:
+                    if len(self._severity_count_cache) >= SEVERITY_COUNT_CACHE_SIZE:
+                        self._severity_count_cache.pop(next(iter(self._severity_count_cache)))
+                    self._severity_count_cache[key] = cached
+            counts[row] = cached
+        return counts
+    
+    def classify_severity_documents(self, phenotypes: List[Dict], texts: List[str],
+                                    count_instances: bool = False) -> Tuple[PhenotypeSeverity, str]:
+        """
+        Classify overall severity document by document.
+        
+        Equivalent to classify_severity on the joined texts, except that matches
+        spanning two documents are not seen. Without count_instances each level
+        stops at its first matching document; with it, per-document counts from
+        severity_count_matrix are summed and reported.
+        
+        Returns:
+            Tuple of (severity, reasoning)
+        """
+        if not phenotypes and not any(texts):
+            return PhenotypeSeverity.UNKNOWN, "No phenotype data available"
+        
+        terms = " ".join(pheno.get("term", "") for pheno in phenotypes)
+        if not count_instances:
+            lowered = [text.lower() for text in texts] + [terms.lower()]
+            for severity, label in SEVERITY_LEVELS:
+                prefilter, _ = self._severity_matchers[severity]
+                if any(prefilter.search(text) for text in lowered):
+                    return severity, f"{label} detected"
             return PhenotypeSeverity.UNKNOWN, "No clear severity indicators found in literature"
+        
+        totals = self.severity_count_matrix(list(texts) + [terms]).sum(axis=0)
+        matched = np.flatnonzero(totals)
+        if not len(matched):
+            return PhenotypeSeverity.UNKNOWN, "No clear severity indicators found in literature"
+        
+        severity, label = SEVERITY_LEVELS[matched[0]]
+        return severity, f"{label} detected ({int(totals[matched[0]])} instances)"
     
     def detect_lethality_stage(self, text: str) -> Optional[str]:
         """
@@ -718,16 +1327,8 @@ class PhenotypeExtractor:
         
         text_lower = text.lower()
         
-        stages = [
-            (r"embryonic\s+lethal|embryo\s+lethal|prenatal\s+lethal|e\d+\.\d", "Embryonic"),
-            (r"perinatal\s+lethal|perinatal\s+death|birth\s+lethal", "Perinatal"),
-            (r"postnatal\s+lethal|adult\s+lethal|juvenile\s+lethal|p\d+\.\d", "Postnatal"),
-            (r"larval\s+lethal|l\d+\s+lethal", "Larval"),
-            (r"neonatal\s+lethal|newborn\s+lethal", "Neonatal")
-        ]
-        
-        for pattern, stage in stages:
-            if re.search(pattern, text_lower, re.IGNORECASE):
+        for regex, stage in self._lethality_stage_regexes:
+            if regex.search(text_lower):
                 return stage
         
         return None
@@ -792,7 +1393,6 @@ class RAGPhenotypePredictor:
     
     def __init__(self):
         self.literature_miner = LiteratureMiner()
-        self.vector_store = DiversityAwareVectorStore()
         self.phenotype_extractor = PhenotypeExtractor()
         self.logger = logging.getLogger(__name__)
     
@@ -801,6 +1401,9 @@ class RAGPhenotypePredictor:
         """
         Predict knockout phenotype for a gene using RAG.
         
+        Predictions are cached on disk for PREDICTION_CACHE_TTL seconds, since the
+        result depends only on the gene, organism and current PubMed contents.
+        
         Args:
             gene_symbol: Gene symbol to predict phenotype for
             organism_taxid: NCBI Taxonomy ID for the organism
@@ -809,6 +1412,46 @@ class RAGPhenotypePredictor:
         Returns:
             PhenotypePrediction object with results
         """
+        cache_key = f"{gene_symbol.upper()}|{organism_taxid}|{int(include_compensatory)}"
+        cached = self._load_cached_prediction(cache_key)
+        if cached is not None:
+            self.logger.info(f"Using cached phenotype prediction for gene {gene_symbol}")
+            return cached
+        
+        prediction = self._predict_phenotype_uncached(gene_symbol, organism_taxid, include_compensatory)
+        # Empty results may just mean PubMed was unreachable, so only cache real evidence
+        if prediction.supporting_evidence:
+            self._store_cached_prediction(cache_key, prediction)
+        return prediction
+    
+    def _load_cached_prediction(self, cache_key: str) -> Optional[PhenotypePrediction]:
+        """Return a cached prediction younger than PREDICTION_CACHE_TTL, if any."""
+        try:
+            with closing(_connect_literature_cache()) as connection, connection:
+                row = connection.execute(
+                    "SELECT created, prediction FROM predictions WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+            if row and time.time() - row[0] < PREDICTION_CACHE_TTL:
+                return pickle.loads(row[1])
+        except Exception as e:
+            # Any cache problem (unwritable cache dir, corrupt or stale pickle) is just a miss
+            self.logger.warning(f"Could not read prediction cache: {e}")
+        return None
+    
+    def _store_cached_prediction(self, cache_key: str, prediction: PhenotypePrediction) -> None:
+        """Cache a prediction on disk."""
+        try:
+            with closing(_connect_literature_cache()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO predictions (cache_key, created, prediction) VALUES (?, ?, ?)",
+                    (cache_key, time.time(), pickle.dumps(prediction, protocol=pickle.HIGHEST_PROTOCOL))
+                )
+        except Exception as e:
+            self.logger.warning(f"Could not update prediction cache: {e}")
+    
+    def _predict_phenotype_uncached(self, gene_symbol: str, organism_taxid: str,
+                                    include_compensatory: bool) -> PhenotypePrediction:
+        """Run the full mine -> embed -> search -> extract pipeline for one gene."""
         self.logger.info(f"Predicting phenotype for gene {gene_symbol} in organism {organism_taxid}")
         
         # Step 1: Mine literature with multiple search strategies
@@ -843,23 +1486,23 @@ class RAGPhenotypePredictor:
         
         self.logger.info(f"Retrieved {len(unique_publications)} unique publications for {gene_symbol}")
         
-        # Step 2: Add to vector store for semantic search
-        self.vector_store.clear()
-        self.vector_store.add_documents(unique_publications)
-        
-        # Step 3: Perform specialized queries
+        # Step 2: Add to a per-call vector store for semantic search, so concurrent
+        # predictions never share one (the encoder itself is loaded once)
+        # Queries are encoded in the same model call as the uncached documents
         queries = self._construct_specialized_queries(gene_symbol, include_compensatory)
+        vector_store = DiversityAwareVectorStore()
+        query_embeddings = vector_store.add_documents(unique_publications, queries)
         
+        # Step 3: Use adaptive retrieval with diversity weighting, all queries in one pass
         all_relevant_docs = []
-        for query in queries:
-            # Use adaptive retrieval with diversity weighting
-            relevant_docs = self.vector_store.search(
-                query, 
-                k=5, 
-                relevance_threshold=0.6,
-                diversity_weight=0.3,
-                context_aware=True
-            )
+        for relevant_docs in vector_store.search_batch(
+            queries,
+            k=5,
+            relevance_threshold=0.6,
+            diversity_weight=0.3,
+            context_aware=True,
+            query_embeddings=query_embeddings
+        ):
             all_relevant_docs.extend(relevant_docs)
         
         # Deduplicate
@@ -907,9 +1550,10 @@ class RAGPhenotypePredictor:
             supporting_evidence.append(evidence)
         
         # Step 5: Classify severity
-        combined_text = " ".join([doc.title + " " + doc.abstract for doc, _ in unique_docs])
-        severity, severity_reasoning = self.phenotype_extractor.classify_severity(
-            all_phenotypes, combined_text
+        document_texts = [doc.title + " " + doc.abstract for doc, _ in unique_docs]
+        combined_text = " ".join(document_texts)
+        severity, severity_reasoning = self.phenotype_extractor.classify_severity_documents(
+            all_phenotypes, document_texts
         )
         
         # Step 6: Determine risk level
@@ -990,10 +1634,20 @@ class RAGPhenotypePredictor:
             Dictionary mapping gene symbols to predictions
         """
         results = {}
+        if not gene_list:
+            return results
+        
+        # Predictions are mostly PubMed round-trips; the literature miner's shared
+        # rate limiter keeps concurrent genes within NCBI's request limits
+        with ThreadPoolExecutor(max_workers=min(PREDICTION_WORKERS, len(gene_list))) as executor:
+            futures = {
+                gene_symbol: executor.submit(self.predict_phenotype, gene_symbol, organism_taxid, include_compensatory)
+                for gene_symbol in gene_list
+            }
         
-        for gene_symbol in gene_list:
+        for gene_symbol, future in futures.items():
             try:
-                prediction = self.predict_phenotype(gene_symbol, organism_taxid, include_compensatory)
+                prediction = future.result()
                 results[gene_symbol] = prediction
             except Exception as e:
                 self.logger.error(f"Error predicting phenotype for {gene_symbol}: {str(e)}")
@@ -1008,17 +1662,82 @@ class RAGPhenotypePredictor:
                 )
         
         return results
+    
+    def batch_predict_phenotypes_columnar(self, gene_list: List[str], organism_taxid: str = "9606",
+                                          include_compensatory: bool = True) -> "pd.DataFrame":
+        """
+        Predict phenotypes for multiple genes and return them as one column-oriented table.
+        
+        Same predictions as batch_predict_phenotypes; see predictions_to_frame for the layout.
+        """
+        return predictions_to_frame(
+            self.batch_predict_phenotypes(gene_list, organism_taxid, include_compensatory)
+        )
+
+
+def predictions_to_frame(predictions: Dict[str, PhenotypePrediction]) -> "pd.DataFrame":
+    """
+    Convert per-gene predictions into a column-oriented DataFrame.
+    
+    Severity and risk are categoricals (one int8 code per row) over the enum
+    values, confidence is float32 and n_evidence is uint16, so large batches
+    filter and serialize without touching one Python object per gene.
+    
+    Args:
+        predictions: Mapping of gene symbol to prediction (as returned by batch_predict_phenotypes)
+        
+    Returns:
+        DataFrame with columns gene, severity, risk, confidence, lethality_stage,
+        n_evidence, phenotypes and compensatory_mechanisms
+    """
+    import pandas as pd
+    
+    items = list(predictions.items())
+    return pd.DataFrame({
+        "gene": pd.array([gene for gene, _ in items], dtype="string"),
+        "severity": pd.Categorical(
+            [prediction.severity.value for _, prediction in items],
+            categories=[severity.value for severity in PhenotypeSeverity]
+        ),
+        "risk": pd.Categorical(
+            [prediction.risk_level.value for _, prediction in items],
+            categories=[risk.value for risk in RiskLevel]
+        ),
+        "confidence": np.fromiter(
+            (prediction.confidence_score for _, prediction in items), dtype=np.float32, count=len(items)
+        ),
+        "lethality_stage": pd.array([prediction.lethality_stage for _, prediction in items], dtype="string"),
+        "n_evidence": np.fromiter(
+            (min(len(prediction.supporting_evidence), np.iinfo(np.uint16).max) for _, prediction in items),
+            dtype=np.uint16, count=len(items)
+        ),
+        "phenotypes": [prediction.predicted_phenotypes for _, prediction in items],
+        "compensatory_mechanisms": [prediction.compensatory_mechanisms for _, prediction in items],
+    })
+
+
+# Shared predictor for the convenience functions (created once, even with concurrent first callers)
+_predictor: Optional[RAGPhenotypePredictor] = None
+_predictor_lock = threading.Lock()
+
+
+def _get_predictor() -> RAGPhenotypePredictor:
+    """Get the process-wide predictor, creating it on first use."""
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = RAGPhenotypePredictor()
+    return _predictor
 
 
 # Convenience functions for easy access
 def predict_gene_phenotype(gene_symbol: str, organism_taxid: str = "9606",
                           include_compensatory: bool = True) -> PhenotypePrediction:
     """Convenience function to predict phenotype for a single gene."""
-    predictor = RAGPhenotypePredictor()
-    return predictor.predict_phenotype(gene_symbol, organism_taxid, include_compensatory)
+    return _get_predictor().predict_phenotype(gene_symbol, organism_taxid, include_compensatory)
 
 def batch_predict_gene_phenotypes(gene_list: List[str], organism_taxid: str = "9606",
                                   include_compensatory: bool = True) -> Dict[str, PhenotypePrediction]:
     """Convenience function to predict phenotypes for multiple genes."""
-    predictor = RAGPhenotypePredictor()
-    return predictor.batch_predict_phenotypes(gene_list, organism_taxid, include_compensatory)
+    return _get_predictor().batch_predict_phenotypes(gene_list, organism_taxid, include_compensatory)
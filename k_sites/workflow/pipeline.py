@@ -166,6 +166,17 @@ def run_k_sites_pipeline(
                 logger.warning(f"Could not initialize phenotype predictor: {e}")
                 predict_phenotypes = False  # Disable if dependencies missing
         
+        # Prefetch pathway neighbors for every gene that can reach gRNA design in one Neo4j round trip
+        if use_graph:
+            try:
+                from k_sites.neo4j.graph_client import get_pathway_neighbors_batch
+                get_pathway_neighbors_batch(
+                    [g.get("symbol", "") for g in ranked_genes if g.get("pleiotropy_score", 0) <= max_pleiotropy],
+                    taxid
+                )
+            except Exception as e:
+                logger.warning(f"Could not prefetch pathway neighbors: {str(e)}")
+        
         for i, gene_info in enumerate(ranked_genes):
             gene_symbol = gene_info.get("symbol", "unknown")
             logger.info(f"Processing gene {i+1}/{len(ranked_genes)}: {gene_symbol}")
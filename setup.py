@@ -58,6 +58,12 @@ setup(
             "sentence-transformers>=2.2.0",
             "faiss-cpu>=1.7.4",
         ],
+        "speedups": [
+            "orjson>=3.6.0",
+        ],
+        "fuzzy": [
+            "rapidfuzz>=3.0.0",
+        ],
         "webapp": [
             "flask>=3.0.0",
             "flask-sqlalchemy>=3.0.0",
@@ -76,6 +82,8 @@ setup(
             "email-validator>=2.1.0",
             "jinja2>=3.1.0",
             "python-dotenv>=1.0.0",
+            "rapidfuzz>=3.0.0",
+            "orjson>=3.6.0",
         ],
     },
     entry_points={
@@ -29,15 +29,17 @@ def mock_ncbi_efetch_response():
     """Mock NCBI efetch response for organism details."""
     def _mock_response(taxid, scientific_name, common_name=""):
         mock_result = MagicMock()
-        mock_result.json.return_value = {
-            "taxonomy": [{
-                "TaxId": taxid,
-                "ScientificName": scientific_name,
-                "OtherNames": {
-                    "GenbankCommonName": common_name
-                }
-            }]
-        }
+        mock_result.content = (
+            "<?xml version=\"1.0\" ?>"
+            "<TaxaSet><Taxon>"
+            f"<TaxId>{taxid}</TaxId>"
+            f"<ScientificName>{scientific_name}</ScientificName>"
+            f"<OtherNames><GenbankCommonName>{common_name}</GenbankCommonName></OtherNames>"
+            "<LineageEx><Taxon><TaxId>1</TaxId><ScientificName>root</ScientificName></Taxon></LineageEx>"
+            "</Taxon></TaxaSet>"
+        ).encode()
+        mock_result.headers = {}
+        mock_result.raise_for_status.return_value = None
         return mock_result
     return _mock_response
 
@@ -3,14 +3,16 @@ Unit tests for go_gene_mapper module.
 """
 
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
 from k_sites.data_retrieval.go_gene_mapper import get_genes_for_go_term, GoTermNotFoundError, GeneRetrievalError
+from k_sites.data_retrieval import go_gene_mapper
 
 
 class TestGoGeneMapper:
     """Test cases for GO term to gene mapping functionality."""
     
-    @patch('requests.get')
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
     def test_get_genes_for_valid_go_term(self, mock_get):
         """Test getting genes for a valid GO term."""
         # Mock the API response
@@ -44,7 +46,7 @@ class TestGoGeneMapper:
         assert genes[1]["symbol"] == "TP53"
         assert genes[1]["entrez_id"] == "7157"
     
-    @patch('requests.get')
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
     def test_get_genes_filters_iea_evidence(self, mock_get):
         """Test that IEA evidence codes are filtered out."""
         # Mock response with only IEA evidence
@@ -76,7 +78,7 @@ class TestGoGeneMapper:
         assert len(genes) == 1
         assert genes[0]["symbol"] == "TP53"
     
-    @patch('requests.get')
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
     def test_get_genes_empty_result(self, mock_get):
         """Test getting genes for a GO term with no results."""
         mock_response = MagicMock()
@@ -90,7 +92,7 @@ class TestGoGeneMapper:
         
         assert len(genes) == 0
     
-    @patch('requests.get')
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
     def test_go_term_not_found_raises_error(self, mock_get):
         """Test that non-existent GO term raises GoTermNotFoundError."""
         mock_response = MagicMock()
@@ -101,7 +103,7 @@ class TestGoGeneMapper:
         with pytest.raises(GoTermNotFoundError):
             get_genes_for_go_term("GO:0000000", "9606")
     
-    @patch('requests.get')
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
     def test_request_failure_raises_error(self, mock_get):
         """Test that API request failure raises GeneRetrievalError."""
         mock_get.side_effect = Exception("Network error")
@@ -117,7 +119,7 @@ class TestGoGeneMapper:
         with pytest.raises(ValueError):
             get_genes_for_go_term("GO:123", "9606")  # Wrong length
     
-    @patch('requests.get')
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
     def test_taxid_to_species_mapping(self, mock_get):
         """Test that taxid gets properly mapped to species name."""
         # This test verifies the internal mapping works
@@ -132,4 +134,87 @@ class TestGoGeneMapper:
             # Even if no genes are returned, the call should succeed
         except GeneRetrievalError:
             # This is expected if the API call fails for other reasons
-            pass
\ No newline at end of file
+            pass
+
+
+class TestCrossSpeciesGoTerms:
+    """Test cases for the batched cross-species GO term lookup."""
+    
+    @staticmethod
+    def _annotation(accession, go_id):
+        return {
+            "geneProductId": f"UniProtKB:{accession}",
+            "goId": go_id,
+            "goName": go_id,
+            "goAspect": "biological_process",
+            "evidenceCode": "ECO:0000314",
+            "goEvidence": "IDA",
+            "qualifier": "involved_in"
+        }
+    
+    def test_batch_failure_falls_back_per_species(self):
+        """A 400 on the combined query retries each species on its own."""
+        accessions = {"9606": "P38398", "10090": "BADACC"}
+        
+        def fake_fetch(gene_product_ids):
+            if len(gene_product_ids) > 1 or gene_product_ids == ["BADACC"]:
+                raise GeneRetrievalError("400 Bad Request")
+            return [self._annotation(gene_product_ids[0], "GO:0006281")]
+        
+        with patch.object(go_gene_mapper, "_batch_resolve_gene_to_uniprot", return_value=accessions), \
+                patch.object(go_gene_mapper, "_fetch_quickgo_annotations", side_effect=fake_fetch):
+            result = go_gene_mapper.get_go_terms_for_gene_across_species("BRCA1", ["9606", "10090"])
+        
+        assert list(result) == ["9606"]
+        assert [term["go_id"] for term in result["9606"]] == ["GO:0006281"]
+    
+    def test_page_limit_scales_with_species(self):
+        """The QuickGO page cap applies per gene product, not per batch."""
+        page = {"results": [self._annotation("P38398", "GO:0006281")] * go_gene_mapper.QUICKGO_PAGE_SIZE,
+                "numberOfHits": 10 ** 6}
+        response = MagicMock()
+        response.json.return_value = page
+        response.raise_for_status.return_value = None
+        
+        with patch.object(go_gene_mapper._session, "get", return_value=response) as mock_get:
+            go_gene_mapper._fetch_quickgo_annotations(["P38398", "P04637"])
+        
+        assert mock_get.call_count == 2 * go_gene_mapper.QUICKGO_MAX_PAGES_PER_PRODUCT
+
+
+class TestGoTermsForGeneCache:
+    """Test cases for the memoized per-species GO term fetch."""
+    
+    def setup_method(self):
+        go_gene_mapper._fetch_go_terms_for_gene.cache_clear()
+    
+    def teardown_method(self):
+        go_gene_mapper._fetch_go_terms_for_gene.cache_clear()
+    
+    @patch('k_sites.data_retrieval.go_gene_mapper._session.get')
+    def test_transient_failure_is_not_cached(self, mock_get):
+        """A UniProt connection error is reported as no terms but not memoized."""
+        mock_get.side_effect = requests.ConnectionError("connection reset")
+        
+        assert go_gene_mapper._get_all_go_terms_for_gene("BRCA1", "9606") == []
+        assert go_gene_mapper._fetch_go_terms_for_gene.cache_info().currsize == 0
+        
+        uniprot_response = MagicMock()
+        uniprot_response.json.return_value = {"results": [{"primaryAccession": "P38398"}]}
+        mock_get.side_effect = None
+        mock_get.return_value = uniprot_response
+        annotations = [TestCrossSpeciesGoTerms._annotation("P38398", "GO:0006281")]
+        with patch.object(go_gene_mapper, "_fetch_quickgo_annotations", return_value=annotations):
+            terms = go_gene_mapper._get_all_go_terms_for_gene("BRCA1", "9606")
+        
+        assert [term["go_id"] for term in terms] == ["GO:0006281"]
+    
+    def test_returned_terms_are_copies(self):
+        """Mutating a returned term does not change the cached one."""
+        annotations = [TestCrossSpeciesGoTerms._annotation("P38398", "GO:0006281")]
+        with patch.object(go_gene_mapper, "_resolve_gene_to_uniprot", return_value="P38398"), \
+                patch.object(go_gene_mapper, "_fetch_quickgo_annotations", return_value=annotations):
+            go_gene_mapper._get_all_go_terms_for_gene("BRCA1", "9606")[0]["go_id"] = "mutated"
+            terms = go_gene_mapper._get_all_go_terms_for_gene("BRCA1", "9606")
+        
+        assert terms[0]["go_id"] == "GO:0006281"
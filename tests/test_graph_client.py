@@ -0,0 +1,138 @@
+"""
+Unit tests for graph_client module.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from neo4j.exceptions import ServiceUnavailable
+from k_sites.neo4j import graph_client
+from k_sites.neo4j.graph_client import GraphClient
+
+
+def _graph(neighbors_by_id):
+    """Fake execute_query that answers the batch neighbor query from a dict of gene ID -> neighbors."""
+    calls = []
+    
+    def execute_query(query, parameters, **kwargs):
+        calls.append(list(parameters["gene_ids"]))
+        records = [
+            {"gene_id": gene_id, "neighbors": neighbors_by_id[gene_id]}
+            for gene_id in parameters["gene_ids"] if gene_id in neighbors_by_id
+        ]
+        return kwargs["result_transformer_"](records)
+    
+    execute_query.calls = calls
+    return execute_query
+
+
+def _json_response(data):
+    """Mock requests response returning the given JSON."""
+    response = MagicMock()
+    response.json.return_value = data
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def client(mock_neo4j_driver):
+    """GraphClient on a mocked driver, using the execute_query code path."""
+    with patch.object(graph_client, "EXECUTE_QUERY_AVAILABLE", True):
+        yield GraphClient()
+
+
+class TestPathwayNeighborsBatch:
+    """Test cases for batched pathway neighbor lookups."""
+    
+    def test_kegg_ids_are_mapped_back_to_symbols(self, client, mock_neo4j_driver):
+        """Test that neighbors found under KEGG IDs are keyed by the input symbols."""
+        execute_query = _graph({"hsa:TP53": ["hsa:MDM2", "hsa:ATM"], "hsa:BRCA1": ["hsa:BARD1"]})
+        mock_neo4j_driver['driver'].execute_query.side_effect = execute_query
+        
+        with patch.object(graph_client._session, "get") as mock_get, \
+                patch.object(graph_client._session, "post") as mock_post:
+            result = client.get_pathway_neighbors_batch(["TP53", "BRCA1", "TP53", ""], "9606")
+        
+        assert result == {"TP53": ["hsa:MDM2", "hsa:ATM"], "BRCA1": ["hsa:BARD1"]}
+        assert execute_query.calls == [["hsa:TP53", "hsa:BRCA1"]]
+        mock_get.assert_not_called()
+        mock_post.assert_not_called()
+    
+    def test_missing_genes_fall_back_to_entrez_ids(self, client, mock_neo4j_driver):
+        """Test that genes absent under their KEGG ID are retried by resolved Entrez ID."""
+        execute_query = _graph({"hsa:TP53": ["hsa:MDM2"], "672": ["hsa:BARD1"]})
+        mock_neo4j_driver['driver'].execute_query.side_effect = execute_query
+        
+        with patch.object(client, "_resolve_gene_symbols_bulk",
+                          return_value={"BRCA1": "672", "NOVEL1": "NOVEL1"}) as mock_resolve:
+            result = client.get_pathway_neighbors_batch(["TP53", "BRCA1", "NOVEL1"], "9606")
+        
+        assert result == {"TP53": ["hsa:MDM2"], "BRCA1": ["hsa:BARD1"], "NOVEL1": []}
+        mock_resolve.assert_called_once_with(["BRCA1", "NOVEL1"], "9606")
+        assert execute_query.calls[0] == ["hsa:TP53", "hsa:BRCA1", "hsa:NOVEL1"]
+        assert sorted(execute_query.calls[1]) == ["672", "NOVEL1"]
+    
+    def test_results_are_served_from_cache(self, client, mock_neo4j_driver):
+        """Test that a repeated batch does not query Neo4j again."""
+        execute_query = _graph({"hsa:TP53": ["hsa:MDM2"]})
+        mock_neo4j_driver['driver'].execute_query.side_effect = execute_query
+        
+        first = client.get_pathway_neighbors_batch(["TP53"], "9606")
+        first["TP53"].append("mutated")
+        second = client.get_pathway_neighbors_batch(["TP53"], "9606")
+        
+        assert second == {"TP53": ["hsa:MDM2"]}
+        assert len(execute_query.calls) == 1
+    
+    def test_query_failure_returns_empty_lists_uncached(self, client, mock_neo4j_driver):
+        """Test that a failed batch yields empty neighbor lists and is retried next time."""
+        mock_neo4j_driver['driver'].execute_query.side_effect = ServiceUnavailable("down")
+        
+        assert client.get_pathway_neighbors_batch(["TP53", "BRCA1"], "9606") == {"TP53": [], "BRCA1": []}
+        
+        mock_neo4j_driver['driver'].execute_query.side_effect = _graph({"hsa:TP53": ["hsa:MDM2"]})
+        assert client.get_pathway_neighbors_batch(["TP53"], "9606") == {"TP53": ["hsa:MDM2"]}
+
+
+class TestBulkGeneResolution:
+    """Test cases for bulk NCBI gene symbol resolution."""
+    
+    def test_bulk_lookup_resolves_official_names(self, client):
+        """Test that esearch + esummary results are matched to symbols case-insensitively."""
+        search = _json_response({"esearchresult": {"count": "3", "webenv": "WE", "querykey": "1"}})
+        summary = _json_response({"result": {
+            "uids": ["672", "7157", "99999"],
+            "672": {"name": "BRCA1"},
+            "7157": {"name": "TP53"},
+            "99999": {"name": "TP53"},
+        }})
+        with patch.object(graph_client._session, "post", side_effect=[search, summary]) as mock_post, \
+                patch.object(graph_client._session, "get") as mock_get:
+            result = client._resolve_gene_symbols_bulk(["brca1", "TP53"], "9606")
+        
+        assert result == {"brca1": "672", "TP53": "7157"}
+        assert mock_post.call_count == 2
+        assert mock_post.call_args_list[1][1]["data"]["WebEnv"] == "WE"
+        mock_get.assert_not_called()
+    
+    def test_symbols_are_resolved_in_chunks_and_cached(self, client):
+        """Test that uncached symbols are sent in chunks and later lookups hit the cache."""
+        def resolve_chunk(gene_symbols, organism_taxid):
+            return {gene_symbol: f"id-{gene_symbol}" for gene_symbol in gene_symbols if gene_symbol != "ALIAS"}
+        
+        with patch.object(graph_client, "NCBI_BULK_RESOLVE_CHUNK", 2), \
+                patch.object(client, "_resolve_bulk_via_ncbi", side_effect=resolve_chunk) as mock_bulk, \
+                patch.object(client, "_resolve_via_ncbi", return_value=("id-alias", True)) as mock_single:
+            result = client._resolve_gene_symbols_bulk(["A", "B", "ALIAS"], "9606")
+            again = client._resolve_gene_symbols_bulk(["A", "B", "ALIAS"], "9606")
+        
+        assert result == again == {"A": "id-A", "B": "id-B", "ALIAS": "id-alias"}
+        assert [call[0][0] for call in mock_bulk.call_args_list] == [["A", "B"], ["ALIAS"]]
+        mock_single.assert_called_once_with("ALIAS", "9606")
+    
+    def test_bulk_failure_falls_back_to_single_lookups(self, client):
+        """Test that a failed bulk request does not prevent per-symbol resolution."""
+        with patch.object(client, "_resolve_bulk_via_ncbi", side_effect=RuntimeError("NCBI down")), \
+                patch.object(client, "_resolve_via_ncbi", side_effect=lambda symbol, taxid: (f"id-{symbol}", True)):
+            result = client._resolve_gene_symbols_bulk(["A", "B"], "9606")
+        
+        assert result == {"A": "id-A", "B": "id-B"}
@@ -0,0 +1,29 @@
+"""
+Unit tests for healthcheck module.
+"""
+
+import sys
+
+from k_sites import healthcheck
+
+
+class TestPythonImports:
+    """Test cases for the import health check."""
+    
+    def test_passes_for_importable_modules(self):
+        """Test that the package's own modules import cleanly."""
+        ok, errors = healthcheck.check_python_imports()
+        assert ok, errors
+    
+    def test_broken_parent_package_is_reported(self, monkeypatch):
+        """Test that an ImportError in a parent package is reported, not raised."""
+        healthcheck._import_module.cache_clear()
+        monkeypatch.delitem(sys.modules, "k_sites.neo4j.graph_client", raising=False)
+        monkeypatch.setitem(sys.modules, "k_sites.neo4j", None)
+        try:
+            ok, errors = healthcheck.check_python_imports()
+        finally:
+            healthcheck._import_module.cache_clear()
+        
+        assert not ok
+        assert any(error.startswith("Failed to import k_sites.neo4j.graph_client") for error in errors)
@@ -0,0 +1,132 @@
+"""
+Unit tests for ingest_kegg module.
+"""
+
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from neo4j.exceptions import ClientError
+from k_sites.neo4j import ingest_kegg
+from k_sites.neo4j.ingest_kegg import KeggIngestionError
+
+KEGG_URL = "https://rest.kegg.jp/list/pathway/hsa"
+
+
+def _streamed_response(lines):
+    """Mock streamed KEGG response yielding the given lines."""
+    response = MagicMock()
+    response.encoding = "utf-8"
+    response.iter_lines.return_value = iter(lines)
+    response.__enter__.return_value = response
+    return response
+
+
+def _client_error(code):
+    """Neo4j ClientError carrying the given status code."""
+    return ClientError._hydrate_neo4j(code=code, message="rejected")
+
+
+@pytest.fixture
+def http_cache_dir(tmp_path):
+    """Point the KEGG HTTP cache at a temporary directory."""
+    with patch.object(ingest_kegg, "_get_cache_dir", return_value=tmp_path):
+        yield tmp_path / "kegg_http"
+
+
+class TestIterKeggRows:
+    """Test cases for streaming and caching KEGG REST rows."""
+    
+    @patch('k_sites.neo4j.ingest_kegg._make_kegg_request')
+    def test_full_read_is_cached(self, mock_request, http_cache_dir):
+        """Test that a fully read response is cached and reused without a request."""
+        mock_request.return_value = _streamed_response(["path:hsa00010\tGlycolysis", "", "bad row"])
+        
+        first = list(ingest_kegg._iter_kegg_rows(KEGG_URL))
+        second = list(ingest_kegg._iter_kegg_rows(KEGG_URL))
+        
+        assert first == second == [["path:hsa00010", "Glycolysis"]]
+        assert mock_request.call_count == 1
+        assert [path.suffix for path in http_cache_dir.iterdir()] == [".txt"]
+    
+    @patch('k_sites.neo4j.ingest_kegg._make_kegg_request')
+    def test_partial_read_removes_temp_file(self, mock_request, http_cache_dir):
+        """Test that abandoning the stream leaves neither a cache file nor a temp file."""
+        mock_request.return_value = _streamed_response(["a\t1", "b\t2", "c\t3"])
+        
+        rows = ingest_kegg._iter_kegg_rows(KEGG_URL)
+        assert next(rows) == ["a", "1"]
+        rows.close()
+        
+        assert list(http_cache_dir.iterdir()) == []
+    
+    @patch('k_sites.neo4j.ingest_kegg._make_kegg_request')
+    def test_request_failure_removes_temp_file(self, mock_request, http_cache_dir):
+        """Test that a failed request propagates and leaves no temp file behind."""
+        mock_request.side_effect = KeggIngestionError("KEGG request failed with HTTP 404")
+        
+        with pytest.raises(KeggIngestionError):
+            list(ingest_kegg._iter_kegg_rows(KEGG_URL))
+        
+        assert list(http_cache_dir.iterdir()) == []
+    
+    @patch('k_sites.neo4j.ingest_kegg._make_kegg_request')
+    def test_refresh_ignores_cached_copy(self, mock_request, http_cache_dir):
+        """Test that refresh=True re-downloads and updates the cache."""
+        mock_request.side_effect = [_streamed_response(["a\told"]), _streamed_response(["a\tnew"])]
+        
+        list(ingest_kegg._iter_kegg_rows(KEGG_URL))
+        
+        assert list(ingest_kegg._iter_kegg_rows(KEGG_URL, refresh=True)) == [["a", "new"]]
+        assert list(ingest_kegg._iter_kegg_rows(KEGG_URL)) == [["a", "new"]]
+        assert mock_request.call_count == 2
+
+
+class TestMakeKeggRequest:
+    """Test cases for KEGG request error reporting."""
+    
+    @pytest.fixture(autouse=True)
+    def no_rate_limit(self):
+        """Skip the shared KEGG rate limiter."""
+        with patch.object(ingest_kegg._KEGG_LIMITER, "acquire"):
+            yield
+    
+    def test_http_error_reports_status(self):
+        """Test that a non-retried HTTP error reports its real status code."""
+        response = requests.Response()
+        response.status_code = 404
+        response.url = KEGG_URL
+        with patch.object(ingest_kegg._session, "get", return_value=response):
+            with pytest.raises(KeggIngestionError, match="HTTP 404"):
+                ingest_kegg._make_kegg_request(KEGG_URL)
+    
+    def test_connection_error_reports_retries(self):
+        """Test that connection failures report the exhausted adapter retries."""
+        with patch.object(ingest_kegg._session, "get", side_effect=requests.exceptions.ConnectionError("refused")):
+            with pytest.raises(KeggIngestionError, match=f"after {ingest_kegg.KEGG_MAX_RETRIES} retries"):
+                ingest_kegg._make_kegg_request(KEGG_URL)
+
+
+class TestRunInTransactions:
+    """Test cases for CALL { ... } IN TRANSACTIONS with fallback."""
+    
+    def test_runs_with_rows_parameter(self, mock_neo4j_driver):
+        """Test that the statement runs with the configured rows per transaction."""
+        session = mock_neo4j_driver['session']
+        
+        assert ingest_kegg._run_in_transactions(mock_neo4j_driver['driver'], "QUERY", {"taxid": "9606"})
+        session.run.assert_called_once_with("QUERY", {"taxid": "9606", "rows": ingest_kegg.ROWS_PER_TRANSACTION})
+    
+    def test_unsupported_syntax_falls_back(self, mock_neo4j_driver):
+        """Test that servers rejecting the syntax signal the batched fallback."""
+        mock_neo4j_driver['session'].run.side_effect = _client_error("Neo.ClientError.Statement.SyntaxError")
+        
+        assert ingest_kegg._run_in_transactions(mock_neo4j_driver['driver'], "QUERY") is False
+    
+    def test_other_client_errors_are_raised(self, mock_neo4j_driver):
+        """Test that real failures such as constraint violations are not masked by the fallback."""
+        mock_neo4j_driver['session'].run.side_effect = _client_error(
+            "Neo.ClientError.Schema.ConstraintValidationFailed"
+        )
+        
+        with pytest.raises(ClientError):
+            ingest_kegg._run_in_transactions(mock_neo4j_driver['driver'], "QUERY")
@@ -176,6 +176,100 @@ class TestWeightedRanking(unittest.TestCase):
         self.assertIn('include_literature', params)
         self.assertIn('include_cross_species', params)
     
+    def test_ranking_keeps_per_gene_scores(self):
+        """Test that ranking uses the scores from score_gene_pleiotropy, failed scoring included."""
+        from unittest.mock import patch
+        from k_sites.gene_analysis import pleiotropy_scorer
+        
+        base = {
+            "bp_term_count": 0, "other_bp_term_count": 0, "pleiotropy_score": 0.0,
+            "specificity_score": 1.0, "evidence_quality": 0.0, "experimental_evidence_count": 0,
+            "computational_evidence_count": 0, "iea_evidence_count": 0, "kegg_pathway_count": 0,
+            "database_sources": []
+        }
+        scorings = {
+            # Scores deliberately differ from what the raw counts would give
+            "GENEA": dict(base, bp_term_count=3, other_bp_term_count=2, pleiotropy_score=4.0,
+                          specificity_score=0.7, evidence_quality=0.8, experimental_evidence_count=1),
+            "GENEB": dict(base, bp_term_count=1, pleiotropy_score=0.0, specificity_score=1.0,
+                          evidence_quality=0.3, iea_evidence_count=2),
+            # Scoring failed: defaults with evidence_quality 0.0
+            "GENEC": dict(base, error="QuickGO unavailable"),
+        }
+        
+        def fake_score(gene_symbol, *args, **kwargs):
+            if gene_symbol == "GENED":
+                raise RuntimeError("boom")
+            return dict(scorings[gene_symbol])
+        
+        genes = [{"symbol": symbol} for symbol in ("GENEA", "GENEB", "GENEC", "GENED")]
+        with patch.object(pleiotropy_scorer, "score_gene_pleiotropy", side_effect=fake_score):
+            ranked = pleiotropy_scorer.rank_genes_by_specificity(
+                genes, "9606", include_literature=False, include_cross_species=False
+            )
+        
+        # Composite as computed per gene before vectorization (literature 0.5, conservation 0.0)
+        expected = {
+            symbol: scoring["specificity_score"] * 0.40 + scoring["evidence_quality"] * 0.25 + 0.5 * 0.20
+            for symbol, scoring in scorings.items()
+        }
+        expected["GENED"] = 0.375
+        
+        self.assertEqual([gene["symbol"] for gene in ranked], ["GENEA", "GENEB", "GENEC", "GENED"])
+        for gene in ranked:
+            self.assertAlmostEqual(gene["composite_score"], expected[gene["symbol"]])
+            if gene["symbol"] in scorings:
+                self.assertEqual(gene["evidence_quality"], scorings[gene["symbol"]]["evidence_quality"])
+                self.assertEqual(gene["specificity_score"], scorings[gene["symbol"]]["specificity_score"])
+        
+        by_symbol = {gene["symbol"]: gene for gene in ranked}
+        self.assertNotIn("error", by_symbol["GENEA"])
+        self.assertEqual(by_symbol["GENED"]["error"], "boom")
+        self.assertEqual(by_symbol["GENEA"]["passes_threshold"], True)
+    
+    def test_top_k_zero_returns_no_genes(self):
+        """Test that top_k=0 is honoured rather than treated as "all genes"."""
+        from unittest.mock import patch
+        from k_sites.gene_analysis import pleiotropy_scorer
+        
+        genes = [{"symbol": "GENEA"}, {"symbol": "GENEB"}]
+        with patch.object(pleiotropy_scorer, "score_gene_pleiotropy", return_value={"bp_term_count": 1}):
+            ranked = pleiotropy_scorer.rank_genes_by_specificity(
+                genes, "9606", include_literature=False, include_cross_species=False, top_k=0
+            )
+        
+        self.assertEqual(ranked, [])
+    
+    def test_async_ranking_respects_worker_cap_after_timeouts(self):
+        """Test that timed-out genes keep their worker slot until their thread finishes."""
+        import asyncio
+        import threading
+        import time
+        from unittest.mock import patch
+        from k_sites.gene_analysis import pleiotropy_scorer
+        
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+        
+        def fake_rank(gene_info, *args):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.3 if gene_info["symbol"].startswith("SLOW") else 0.01)
+            with lock:
+                state["running"] -= 1
+            return None
+        
+        genes = [{"symbol": "SLOW1"}, {"symbol": "SLOW2"}] + [{"symbol": f"FAST{i}"} for i in range(4)]
+        with patch.object(pleiotropy_scorer, "MAX_RANKING_WORKERS", 2), \
+                patch.object(pleiotropy_scorer, "RANKING_TIMEOUT", 0.05), \
+                patch.object(pleiotropy_scorer, "_rank_single_gene", side_effect=fake_rank):
+            asyncio.run(pleiotropy_scorer.rank_genes_by_specificity_async(
+                genes, "9606", include_literature=False, include_cross_species=False
+            ))
+        
+        self.assertLessEqual(state["peak"], 2)
+    
     def test_literature_support_is_real(self):
         """Test that literature support queries PubMed (not a stub)."""
         from k_sites.gene_analysis.pleiotropy_scorer import get_literature_support
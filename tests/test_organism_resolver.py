@@ -4,9 +4,19 @@ Unit tests for organism_resolver module.
 
 import pytest
 from unittest.mock import patch, MagicMock
+from k_sites.data_retrieval import organism_resolver
 from k_sites.data_retrieval.organism_resolver import resolve_organism, OrganismNotFoundError
 
 
+@pytest.fixture(autouse=True)
+def isolated_organism_cache(tmp_path, monkeypatch):
+    """Point the organism cache at tmp_path so tests never touch the user's real cache file."""
+    monkeypatch.setattr(organism_resolver, "ORGANISM_CACHE_FILE", tmp_path / "organism_cache.json")
+    monkeypatch.setattr(organism_resolver, "_organism_cache", {})
+    monkeypatch.setattr(organism_resolver, "_organism_cache_by_taxid", {})
+    monkeypatch.setattr(organism_resolver, "_cache_loaded", False)
+
+
 class TestOrganismResolver:
     """Test cases for organism resolution functionality."""
     
@@ -97,4 +107,77 @@ class TestOrganismResolver:
         result = resolve_organism("mouse")
         assert result["taxid"] == "10090"
         assert result["scientific_name"] == "Mus musculus"
-        assert result["common_name"] == "mouse"
\ No newline at end of file
+        assert result["common_name"] == "mouse"
+    
+    @patch('requests.get')
+    def test_ncbi_failure_fuzzy_matches_misspelling(self, mock_get):
+        """Test that the offline fallback tolerates misspelled organism names."""
+        pytest.importorskip("rapidfuzz")
+        mock_get.side_effect = Exception("Network error")
+        
+        result = resolve_organism("Drosphila melanogaster")
+        assert result["taxid"] == "7227"
+        assert result["scientific_name"] == "Drosophila melanogaster"
+    
+    @patch('requests.get')
+    def test_ncbi_failure_does_not_fuzzy_match_other_species(self, mock_get):
+        """Test that a different species of a known genus is not resolved to the common one."""
+        pytest.importorskip("rapidfuzz")
+        mock_get.side_effect = Exception("Network error")
+        
+        with pytest.raises(OrganismNotFoundError):
+            resolve_organism("Homo neanderthalensis")
+        assert organism_resolver._get_cached_result("Homo neanderthalensis") is None
+    
+    @patch('requests.get')
+    def test_common_name_lookup_ignores_case_and_spacing(self, mock_get):
+        """Test that case/whitespace variants resolve without hitting NCBI."""
+        result = resolve_organism("  homo   SAPIENS ")
+        assert result["taxid"] == "9606"
+        mock_get.assert_not_called()
+    
+    @patch('k_sites.data_retrieval.organism_resolver._cache_result')
+    @patch('k_sites.data_retrieval.organism_resolver._get_cached_result', return_value=None)
+    @patch('requests.get')
+    def test_taxid_lookup_parses_efetch_xml(self, mock_get, mock_cached, mock_cache_result,
+                                            mock_ncbi_efetch_response):
+        """Test resolving an uncommon TaxID from the EFetch taxonomy XML."""
+        mock_get.return_value = mock_ncbi_efetch_response("7460", "Apis mellifera", "honey bee")
+        
+        result = resolve_organism("7460")
+        assert result == {"taxid": "7460", "scientific_name": "Apis mellifera", "common_name": "honey bee"}
+        assert "retmode=xml" in mock_get.call_args.args[0]
+    
+    @patch('requests.get')
+    def test_revalidate_returns_cached_on_not_modified(self, mock_get):
+        """Test that a 304 on revalidation serves the cached record."""
+        cached = {"taxid": "7460", "scientific_name": "Apis mellifera", "common_name": "honey bee",
+                  "_etag": '"abc"'}
+        mock_get.return_value = MagicMock(status_code=304)
+        
+        with patch('k_sites.data_retrieval.organism_resolver._get_cached_result', return_value=cached):
+            result = resolve_organism("7460", revalidate=True)
+        
+        assert result == {"taxid": "7460", "scientific_name": "Apis mellifera", "common_name": "honey bee"}
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+    
+    @patch('requests.get')
+    def test_etag_is_cached_but_not_returned(self, mock_get, mock_ncbi_efetch_response):
+        """Test that the ETag validator stays in the cache and out of the returned result."""
+        response = mock_ncbi_efetch_response("7460", "Apis mellifera", "honey bee")
+        response.headers = {"ETag": '"abc"'}
+        mock_get.return_value = response
+        
+        result = resolve_organism("7460")
+        
+        assert "_etag" not in result
+        assert organism_resolver._get_cached_result("7460")["_etag"] == '"abc"'
+        assert "_etag" not in resolve_organism("7460")
+    
+    def test_mutating_result_does_not_change_cache_or_mapping(self):
+        """Test that callers receive copies of cached and built-in organism entries."""
+        result = resolve_organism("mouse")
+        result["scientific_name"] = "changed"
+        
+        assert resolve_organism("mouse")["scientific_name"] == "Mus musculus"
+        assert organism_resolver.COMMON_ORGANISMS["mouse"]["scientific_name"] == "Mus musculus"
@@ -21,11 +21,22 @@ from k_sites.rag_system import (
     RAG_AVAILABLE
 )
 import logging
+import threading
+import time
+
+import numpy as np
+import pytest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@pytest.fixture(autouse=True)
+def offline_ncbi(monkeypatch):
+    """Answer NCBI requests as failed under pytest; run the script for live calls."""
+    monkeypatch.setattr(LiteratureMiner, "_make_request", lambda self, endpoint, params, timeout=30: None)
+
+
 def test_literature_mining():
     """Test A: Literature Mining capabilities"""
     print("\n" + "="*60)
@@ -292,6 +303,136 @@ def test_rag_predictor():
     return True
 
 
+class _NonReentrantEncoder:
+    """Fake encoder that fails like a HF fast tokenizer when used by two threads at once."""
+    
+    def __init__(self):
+        self._busy = threading.Lock()
+    
+    def encode(self, texts, **kwargs):
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("Already borrowed")
+        try:
+            time.sleep(0.01)
+            return np.array([[len(text) % 7 + 1.0, len(text) % 5 + 1.0, 1.0] for text in texts])
+        finally:
+            self._busy.release()
+
+
+def test_concurrent_batch_predictions_share_encoder(monkeypatch, tmp_path):
+    """Concurrent predictions must take turns on the shared encoder instead of failing."""
+    from k_sites.rag_system import literature_context
+    
+    encoder = _NonReentrantEncoder()
+    monkeypatch.setattr(literature_context, "RAG_AVAILABLE", True)
+    monkeypatch.setattr(literature_context, "_load_encoder", lambda model_name: encoder)
+    monkeypatch.setattr(literature_context, "_get_cache_dir", lambda: tmp_path)
+    
+    def fake_search(gene_symbol, search_type="knockout", retmax=30):
+        return [
+            LiteratureRecord(f"{gene_symbol}{search_type}{i}", None, f"{gene_symbol} knockout {i}",
+                             "Knockout mice showed embryonic lethality.", None, [], "Journal", "2020", None, [])
+            for i in range(3)
+        ]
+    
+    predictor = RAGPhenotypePredictor()
+    monkeypatch.setattr(predictor.literature_miner, "search_pubmed", fake_search)
+    
+    genes = [f"GENE{i}" for i in range(8)]
+    results = predictor.batch_predict_phenotypes(genes)
+    
+    failed = [gene for gene, prediction in results.items()
+              if prediction.confidence_reasoning.startswith("Prediction failed")]
+    assert failed == []
+
+
+def test_encoder_is_loaded_once_under_concurrency(monkeypatch):
+    """Concurrent first use of the encoder must load the model only once."""
+    from k_sites.rag_system import literature_context
+    
+    loads = []
+    
+    class SlowEncoder:
+        def __init__(self, model_name):
+            time.sleep(0.05)
+            loads.append(model_name)
+    
+    monkeypatch.setattr(literature_context, "SentenceTransformer", SlowEncoder, raising=False)
+    monkeypatch.delenv("K_SITES_USE_ONNX", raising=False)
+    literature_context._create_encoder.cache_clear()
+    try:
+        threads = [threading.Thread(target=literature_context._load_encoder, args=("test-model",))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        literature_context._create_encoder.cache_clear()
+    
+    assert loads == ["test-model"]
+
+
+def _prediction(evidence):
+    return PhenotypePrediction(
+        severity=PhenotypeSeverity.LETHAL,
+        risk_level=RiskLevel.CRITICAL,
+        confidence_score=0.8,
+        predicted_phenotypes=["embryonic lethality"],
+        supporting_evidence=evidence
+    )
+
+
+def test_prediction_cache_ttl_and_empty_results(monkeypatch, tmp_path):
+    """Predictions with evidence are cached until PREDICTION_CACHE_TTL; empty ones never are."""
+    from unittest.mock import patch
+    from k_sites.rag_system import literature_context
+    
+    monkeypatch.setattr(literature_context, "_get_cache_dir", lambda: tmp_path)
+    predictor = RAGPhenotypePredictor()
+    
+    with patch.object(predictor, "_predict_phenotype_uncached",
+                      return_value=_prediction([{"pmid": "1"}])) as uncached:
+        predictor.predict_phenotype("GENEA")
+        assert predictor.predict_phenotype("GENEA").supporting_evidence == [{"pmid": "1"}]
+        assert uncached.call_count == 1
+        
+        expired = time.time() + literature_context.PREDICTION_CACHE_TTL + 1
+        with patch.object(literature_context.time, "time", return_value=expired):
+            predictor.predict_phenotype("GENEA")
+        assert uncached.call_count == 2
+    
+    with patch.object(predictor, "_predict_phenotype_uncached", return_value=_prediction([])) as uncached:
+        predictor.predict_phenotype("GENEB")
+        predictor.predict_phenotype("GENEB")
+        assert uncached.call_count == 2
+
+
+def test_prediction_cache_errors_are_misses(monkeypatch, tmp_path):
+    """An unusable cache directory or an unreadable cached entry falls back to the pipeline."""
+    from unittest.mock import patch
+    from k_sites.rag_system import literature_context
+    
+    def unwritable_cache_dir():
+        raise PermissionError("read-only home")
+    
+    predictor = RAGPhenotypePredictor()
+    expected = _prediction([{"pmid": "1"}])
+    
+    monkeypatch.setattr(literature_context, "_get_literature_cache_file", unwritable_cache_dir)
+    with patch.object(predictor, "_predict_phenotype_uncached", return_value=expected):
+        assert predictor.predict_phenotype("GENEA") is expected
+    
+    monkeypatch.undo()
+    monkeypatch.setattr(literature_context, "_get_cache_dir", lambda: tmp_path)
+    with patch.object(predictor, "_predict_phenotype_uncached", return_value=expected):
+        predictor.predict_phenotype("GENEA")
+    with patch.object(literature_context.pickle, "loads", side_effect=ModuleNotFoundError("old_module")), \
+            patch.object(predictor, "_predict_phenotype_uncached", return_value=expected) as uncached:
+        assert predictor.predict_phenotype("GENEA") is expected
+        assert uncached.call_count == 1
+
+
 def run_all_tests():
     """Run all RAG system tests"""
     print("\n" + "="*60)